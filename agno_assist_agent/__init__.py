@@ -17,6 +17,7 @@ from agno_assist_agent.main import (
     initialize_agent,
     main,
     run_agent,
+    run_batch,
 )
 
 __all__ = [
@@ -27,4 +28,5 @@ __all__ = [
     "initialize_agent",
     "main",
     "run_agent",
+    "run_batch",
 ]
@@ -0,0 +1,314 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Usage accounting - tokens, tool calls, retrievals and latency per request.
+
+Every handler call produces one RequestUsage record. Records are aggregated
+per model and per caller in memory and flushed periodically to a local sink
+(SQLite or JSONL) so cost and latency regressions can be traced over time.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+# Keys in the Bindu session context identifying who sent the request
+CALLER_KEYS = ("caller_id", "callerId", "user_id", "userId", "client_id", "clientId")
+
+# Usage record of the request being handled, set by the handler
+current_usage: ContextVar["RequestUsage | None"] = ContextVar("current_usage", default=None)
+
+
+def resolve_caller(context: dict[str, Any] | None = None) -> str:
+    """Find who sent a request.
+
+    Args:
+        context: Optional Bindu session context
+
+    Returns:
+        Caller ID, or "anonymous"
+    """
+    for key in CALLER_KEYS:
+        if context and context.get(key):
+            return str(context[key])
+    return "anonymous"
+
+
+@dataclass
+class RequestUsage:
+    """Usage of a single handler call."""
+
+    caller: str
+    model: str
+    started_at: float = field(default_factory=time.time)
+    duration_s: float = 0.0
+    status: str = "ok"
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    reasoning_tokens: int = 0
+    tool_calls: int = 0
+    retrievals: int = 0
+    retrieval_cache_hits: int = 0
+    retrieved_documents: int = 0
+    cost_usd: float = 0.0
+
+    def observe_run(self, result: Any) -> None:
+        """Copy token usage, model and tool calls from an Agno RunOutput.
+
+        Args:
+            result: The RunOutput returned by agent.arun()
+        """
+        metrics = getattr(result, "metrics", None)
+        for name in ("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens", "reasoning_tokens"):
+            setattr(self, name, getattr(self, name) + int(getattr(metrics, name, 0) or 0))
+        self.model = getattr(result, "model", None) or self.model
+        self.tool_calls += len(getattr(result, "tools", None) or [])
+
+    def observe_retrieval(self, documents: int, cached: bool) -> None:
+        """Count a knowledge retrieval.
+
+        Args:
+            documents: Number of documents returned
+            cached: Whether the results came from the session cache
+        """
+        self.retrievals += 1
+        self.retrieved_documents += documents
+        self.retrieval_cache_hits += int(cached)
+
+
+@dataclass
+class UsageTotals:
+    """Aggregated usage of many requests."""
+
+    requests: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    reasoning_tokens: int = 0
+    tool_calls: int = 0
+    retrievals: int = 0
+    retrieval_cache_hits: int = 0
+    retrieved_documents: int = 0
+    cost_usd: float = 0.0
+    duration_s: float = 0.0
+
+    def add(self, usage: RequestUsage) -> None:
+        """Add one request to the totals."""
+        self.requests += 1
+        self.errors += int(usage.status != "ok")
+        for total in fields(self):
+            if total.name not in ("requests", "errors"):
+                setattr(self, total.name, getattr(self, total.name) + getattr(usage, total.name))
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the totals and mean latency as a dictionary."""
+        return {**asdict(self), "mean_duration_s": self.duration_s / self.requests if self.requests else 0.0}
+
+
+class JsonlUsageSink:
+    """Appends usage records to a JSON Lines file."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the sink.
+
+        Args:
+            path: The JSONL file
+        """
+        self.path = Path(path)
+
+    def write(self, records: list[RequestUsage]) -> None:
+        """Append records to the file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(asdict(record)) + "\n" for record in records)
+
+
+class SqliteUsageSink:
+    """Inserts usage records into a `request_usage` SQLite table."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the sink.
+
+        Args:
+            path: The SQLite database file
+        """
+        self.path = Path(path)
+        self.columns = [column.name for column in fields(RequestUsage)]
+
+    def write(self, records: list[RequestUsage]) -> None:
+        """Insert records in one transaction."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS request_usage ({', '.join(self.columns)})")
+            conn.executemany(
+                f"INSERT INTO request_usage ({', '.join(self.columns)}) VALUES ({', '.join('?' * len(self.columns))})",  # noqa: S608
+                [tuple(getattr(record, column) for column in self.columns) for record in records],
+            )
+        conn.close()
+
+
+def create_usage_sink(spec: str) -> JsonlUsageSink | SqliteUsageSink | None:
+    """Create a sink from a `<kind>:<path>` spec.
+
+    Args:
+        spec: "sqlite:<path>", "jsonl:<path>", or "" / "none" for memory only
+
+    Returns:
+        The sink, or None
+
+    Raises:
+        ValueError: If the sink kind is unknown
+    """
+    if not spec or spec == "none":
+        return None
+    kind, _, path = spec.partition(":")
+    if kind == "sqlite":
+        return SqliteUsageSink(path or "tmp/usage.db")
+    if kind == "jsonl":
+        return JsonlUsageSink(path or "tmp/usage.jsonl")
+    error_msg = f"Unknown usage sink '{kind}'. Use sqlite:<path>, jsonl:<path> or none."
+    raise ValueError(error_msg)
+
+
+class UsageAccountant:
+    """Aggregates request usage per model and per caller and flushes it to a sink."""
+
+    def __init__(
+        self,
+        sink: JsonlUsageSink | SqliteUsageSink | None = None,
+        flush_interval: float = 30.0,
+        prices: dict[str, dict[str, float]] | None = None,
+        max_callers: int = 1000,
+        max_pending: int = 10000,
+    ) -> None:
+        """Initialize the accountant.
+
+        Args:
+            sink: Where records are flushed (None keeps only the in-memory totals)
+            flush_interval: Seconds between background flushes
+            prices: USD per million tokens by model, e.g. {"model": {"input": 0.15, "output": 0.6}}
+            max_callers: Callers with their own in-memory totals; later callers are added to "other"
+            max_pending: Records kept for the sink while it fails; the oldest are dropped beyond this
+        """
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.prices = prices or {}
+        self.max_callers = max_callers
+        self.max_pending = max_pending
+        self.by_model: dict[str, UsageTotals] = {}
+        self.by_caller: dict[str, UsageTotals] = {}
+        self.flushed = 0
+        self.dropped = 0
+        self._pending: list[RequestUsage] = []
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(cls) -> "UsageAccountant":
+        """Create an accountant from USAGE_* environment variables.
+
+        Returns:
+            UsageAccountant instance
+        """
+        return cls(
+            sink=create_usage_sink(os.getenv("USAGE_SINK", "sqlite:tmp/usage.db")),
+            flush_interval=float(os.getenv("USAGE_FLUSH_INTERVAL", "30")),
+            prices=json.loads(os.getenv("USAGE_PRICES", "{}")),
+            max_callers=int(os.getenv("USAGE_MAX_CALLERS", "1000")),
+            max_pending=int(os.getenv("USAGE_MAX_PENDING", "10000")),
+        )
+
+    def finish(self, usage: RequestUsage, started: float) -> None:
+        """Complete a record, price it and add it to the totals and the flush queue.
+
+        Args:
+            usage: The request's record
+            started: time.perf_counter() at the start of the request
+        """
+        usage.duration_s = time.perf_counter() - started
+        price = self.prices.get(usage.model)
+        if price:
+            usage.cost_usd = (
+                usage.input_tokens * price.get("input", 0.0) + usage.output_tokens * price.get("output", 0.0)
+            ) / 1_000_000
+        self.by_model.setdefault(usage.model, UsageTotals()).add(usage)
+        caller = usage.caller
+        if caller not in self.by_caller and len(self.by_caller) >= self.max_callers:
+            caller = "other"  # the sink still gets the real caller
+        self.by_caller.setdefault(caller, UsageTotals()).add(usage)
+        if self.sink is not None:
+            self._pending.append(usage)
+            self._trim_pending()
+
+    def _trim_pending(self) -> None:
+        """Drop the oldest pending records beyond max_pending, counting them."""
+        excess = len(self._pending) - self.max_pending
+        if excess > 0:
+            del self._pending[:excess]
+            self.dropped += excess
+
+    async def flush(self) -> int:
+        """Write pending records to the sink in a worker thread.
+
+        Returns:
+            Number of records written
+        """
+        if self.sink is None or not self._pending:
+            return 0
+        records, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self.sink.write, records)
+        except Exception as e:
+            print(f"⚠️  Failed to flush usage records: {e}")
+            self._pending = records + self._pending
+            self._trim_pending()
+            return 0
+        self.flushed += len(records)
+        return len(records)
+
+    async def _flush_loop(self) -> None:
+        """Flush every flush_interval seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start periodic flushing (must be called from a running event loop)."""
+        if self.sink is not None and self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop periodic flushing and write what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        """Return usage totals per model and per caller.
+
+        Returns:
+            Dictionary of usage metrics
+        """
+        return {
+            "by_model": {model: totals.snapshot() for model, totals in self.by_model.items()},
+            "by_caller": {caller: totals.snapshot() for caller, totals in self.by_caller.items()},
+            "pending": len(self._pending),
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,298 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Precomputed answers - canonical questions answered once per version of the docs.
+
+After ingestion the agent answers a configurable list of canonical questions.
+The answers are stored with the questions' embeddings and the content hash of
+the documentation they were generated from. A first-turn question close enough
+to a canonical one is answered from the index; after the docs change the
+index no longer matches the knowledge base, so it serves nothing until the
+answers have been regenerated.
+
+Embeddings alone cannot tell "an example in TypeScript" or "does Agno not
+support" apart from the canonical question, so a match must also not add
+content words or a negation to it.
+"""
+
+import json
+import math
+import os
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Frequently asked questions, also shown as example queries on startup
+DEFAULT_CANONICAL_QUESTIONS = (
+    "What is Agno and how do I get started?",
+    "How do I create an agent with tools?",
+    "What vector databases does Agno support?",
+    "Show me an example of a knowledge base implementation",
+)
+
+
+# Words that do not change what a question asks for
+_QUESTION_FILLER_WORDS = frozenset([
+    "a",
+    "about",
+    "an",
+    "and",
+    "any",
+    "are",
+    "can",
+    "could",
+    "do",
+    "does",
+    "for",
+    "from",
+    "get",
+    "give",
+    "have",
+    "how",
+    "i",
+    "in",
+    "is",
+    "it",
+    "me",
+    "my",
+    "of",
+    "on",
+    "or",
+    "please",
+    "show",
+    "tell",
+    "the",
+    "there",
+    "to",
+    "use",
+    "using",
+    "what",
+    "when",
+    "where",
+    "which",
+    "who",
+    "why",
+    "with",
+    "would",
+    "you",
+    "your",
+])
+_NEGATIONS = frozenset({"no", "not", "never", "without", "cannot", "nor", "neither", "none"})
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Set while the answers themselves are generated, so they never come from the index
+bypass_answer_index: ContextVar[bool] = ContextVar("bypass_answer_index", default=False)
+
+
+def load_canonical_questions(path: str | Path | None) -> list[str]:
+    """Read canonical questions from a file with one question per line.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        path: The questions file, or None for the default questions
+
+    Returns:
+        Canonical questions in file order, without duplicates
+    """
+    if not path:
+        return list(DEFAULT_CANONICAL_QUESTIONS)
+    lines = (line.strip() for line in Path(path).read_text(encoding="utf-8").splitlines())
+    return list(dict.fromkeys(line for line in lines if line and not line.startswith("#")))
+
+
+def _content_words(text: str) -> tuple[set[str], bool]:
+    """Split a question into its content words (plurals folded) and whether it contains a negation."""
+    words, negated = set(), False
+    for word in _WORD.findall(text.lower()):
+        if word in _NEGATIONS or word.endswith("n't"):
+            negated = True
+            continue
+        word = word.removesuffix("'s")
+        if word in _QUESTION_FILLER_WORDS:
+            continue
+        words.add(word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word)
+    return words, negated
+
+
+def _asks_same(question: str, canonical: str) -> bool:
+    """Check that a question adds no content words or negation to a canonical question."""
+    words, negated = _content_words(question)
+    canonical_words, canonical_negated = _content_words(canonical)
+    return negated == canonical_negated and words <= canonical_words
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length (zero vectors stay zero)."""
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector] if norm else list(vector)
+
+
+@dataclass
+class CanonicalAnswer:
+    """A canonical question with its precomputed answer."""
+
+    question: str
+    answer: str
+    embedding: list[float]
+    model: str | None = None
+    generated_at: float = field(default_factory=time.time)
+
+
+class AnswerIndex:
+    """Precomputed answers for canonical questions, stored as one JSON file."""
+
+    def __init__(self, path: str | Path, questions: list[str], threshold: float = 0.85) -> None:
+        """Initialize an empty index (see load()).
+
+        Args:
+            path: The JSON file holding the index
+            questions: Canonical questions to precompute
+            threshold: Minimum cosine similarity for a question to be served from the index
+        """
+        self.path = Path(path)
+        self.questions = questions
+        self.threshold = threshold
+        self.digest: str | None = None
+        self.embedder_config: dict[str, Any] = {}
+        self.entries: list[CanonicalAnswer] = []
+        self.failed: list[str] = []
+        self._vectors: list[list[float]] = []
+        self.counts = {"hits": 0, "misses": 0, "generated": 0}
+
+    @classmethod
+    def from_env(cls) -> "AnswerIndex":
+        """Create an index from CANONICAL_* environment variables.
+
+        Returns:
+            AnswerIndex instance
+        """
+        return cls(
+            path=os.getenv("CANONICAL_ANSWERS_PATH", "tmp/canonical_answers.json"),
+            questions=load_canonical_questions(os.getenv("CANONICAL_QUESTIONS_FILE")),
+            threshold=float(os.getenv("CANONICAL_ANSWER_THRESHOLD", "0.85")),
+        )
+
+    def load(self) -> bool:
+        """Load the index written by an earlier run.
+
+        Returns:
+            True if an index was loaded
+        """
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            entries = [CanonicalAnswer(**entry) for entry in data["entries"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        self._set(data.get("digest"), data.get("embedder", {}), entries, data.get("failed", []))
+        return True
+
+    def _set(
+        self, digest: str | None, embedder_config: dict[str, Any], entries: list[CanonicalAnswer], failed: list[str]
+    ) -> None:
+        """Replace the index contents in memory."""
+        self.digest = digest
+        self.embedder_config = embedder_config
+        self.entries = entries
+        self.failed = failed
+        self._vectors = [_normalize(entry.embedding) for entry in entries]
+
+    def is_current(self, digest: str | None, embedder_config: dict[str, Any]) -> bool:
+        """Check whether every canonical question was attempted for this version of the docs.
+
+        Questions whose answer failed count as attempted, so they are retried
+        when the docs change rather than on every start.
+
+        Args:
+            digest: Content hash of the live knowledge base
+            embedder_config: Config of the embedder used for matching
+
+        Returns:
+            True if nothing needs to be regenerated
+        """
+        return (
+            digest is not None
+            and digest == self.digest
+            and embedder_config == self.embedder_config
+            and {entry.question for entry in self.entries} | set(self.failed) == set(self.questions)
+        )
+
+    def replace(
+        self,
+        digest: str,
+        embedder_config: dict[str, Any],
+        entries: list[CanonicalAnswer],
+        failed: list[str] | None = None,
+    ) -> None:
+        """Swap in freshly generated answers and write them to disk.
+
+        Args:
+            digest: Content hash of the docs the answers were generated from
+            embedder_config: Config of the embedder that produced the question embeddings
+            entries: The generated answers
+            failed: Canonical questions that could not be answered
+        """
+        failed = failed or []
+        self._set(digest, embedder_config, entries, failed)
+        self.counts["generated"] += len(entries)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        payload = {
+            "digest": digest,
+            "embedder": embedder_config,
+            "entries": [asdict(entry) for entry in entries],
+            "failed": failed,
+        }
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def lookup(
+        self, embedding: list[float], digest: str | None, embedder_config: dict[str, Any], question: str | None = None
+    ) -> tuple[CanonicalAnswer, float] | None:
+        """Find the canonical answer for a question.
+
+        Args:
+            embedding: Embedding of the incoming question
+            digest: Content hash of the live knowledge base
+            embedder_config: Config of the embedder that produced the embedding
+            question: Text of the incoming question; when given, a canonical question only
+                matches if the incoming one adds no content words or negation to it
+
+        Returns:
+            The best matching answer and its similarity, or None below the threshold
+            or when the index was generated from other docs or with another embedder
+        """
+        best: tuple[CanonicalAnswer, float] | None = None
+        if digest is not None and digest == self.digest and embedder_config == self.embedder_config:
+            query = _normalize(embedding)
+            for entry, vector in zip(self.entries, self._vectors, strict=True):
+                score = sum(a * b for a, b in zip(query, vector, strict=False))
+                if score < self.threshold or (best is not None and score <= best[1]):
+                    continue
+                if question is None or _asks_same(question, entry.question):
+                    best = (entry, score)
+        self.counts["hits" if best else "misses"] += 1
+        return best
+
+    def stats(self) -> dict[str, Any]:
+        """Return index size, version and hit counters.
+
+        Returns:
+            Dictionary of index metrics
+        """
+        return {
+            **self.counts,
+            "entries": len(self.entries),
+            "failed": len(self.failed),
+            "questions": len(self.questions),
+            "digest": self.digest,
+        }
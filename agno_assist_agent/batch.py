@@ -0,0 +1,135 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Batch question files - JSONL input, streamed JSONL output and resume checkpoints.
+
+Input lines are either {"id": ..., "messages": [...]} or {"id": ..., "question": "..."}.
+Output lines are written as answers complete: {"id": ..., "answer": ...} or
+{"id": ..., "error": ...}. The output file doubles as the checkpoint: a rerun
+skips every ID that already has an answer and retries the ones that failed,
+so the last line for an ID is authoritative.
+"""
+
+import json
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+# Knowledge references prefetched for the batch item being answered, set by run_batch
+batch_references: ContextVar[list[dict[str, Any]] | None] = ContextVar("batch_references", default=None)
+
+
+@dataclass
+class BatchItem:
+    """One conversation from a batch file."""
+
+    id: str
+    messages: list[dict[str, Any]]
+
+    @property
+    def question(self) -> str:
+        """Content of the last user message."""
+        for message in reversed(self.messages):
+            if message.get("role") == "user":
+                return str(message.get("content", ""))
+        return ""
+
+
+def read_batch_items(path: str | Path) -> Iterator[BatchItem]:
+    """Read conversations from a JSONL batch file.
+
+    Args:
+        path: The input file
+
+    Yields:
+        Batch items in file order; lines without an "id" get "line-<n>"
+
+    Raises:
+        ValueError: If a line is not a JSON object with "messages" or "question"
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                messages = record.get("messages") or [{"role": "user", "content": record["question"]}]
+            except (ValueError, KeyError, AttributeError) as e:
+                error_msg = f"{path}:{line_number}: expected a JSON object with 'messages' or 'question'"
+                raise ValueError(error_msg) from e
+            yield BatchItem(id=str(record.get("id", f"line-{line_number}")), messages=messages)
+
+
+def load_completed(path: str | Path) -> set[str]:
+    """Read the IDs that already have an answer in an output file.
+
+    A partially written last line (from an interrupted run) is ignored.
+
+    Args:
+        path: The output file
+
+    Returns:
+        IDs with a successful answer
+    """
+    completed: set[str] = set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if "error" in record:
+                    completed.discard(str(record.get("id")))
+                else:
+                    completed.add(str(record.get("id")))
+    except FileNotFoundError:
+        pass
+    return completed
+
+
+class BatchWriter:
+    """Appends result records to a JSONL file, one flushed line per record."""
+
+    def __init__(self, path: str | Path, append: bool = True) -> None:
+        """Initialize the writer.
+
+        Args:
+            path: The output file
+            append: Keep existing results (resume) instead of truncating the file
+        """
+        self.path = Path(path)
+        self.append = append
+        self._file: Any = None
+
+    def __enter__(self) -> "BatchWriter":
+        """Open the output file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a" if self.append else "w", encoding="utf-8")
+        # Terminate a line left incomplete by an interrupted run
+        if self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        """Close the output file."""
+        self._file.close()
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write and flush one record."""
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
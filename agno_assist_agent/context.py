@@ -0,0 +1,379 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Context budgeting - keeps history and retrieved chunks within a per-request token budget."""
+
+import os
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+_WORD_PATTERN = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+_SUMMARY_HEADER = "Summary of earlier conversation:\n"
+
+# Below this, a truncated chunk is more noise than signal
+_MIN_USEFUL_CHUNK_TOKENS = 64
+
+
+@cache
+def _get_encoder() -> Any:
+    """Get a tiktoken encoder when CONTEXT_TOKENIZER=tiktoken, None otherwise.
+
+    tiktoken downloads its vocabulary on first use, so it is opt-in to keep
+    offline pods from blocking on the network.
+    """
+    if os.getenv("CONTEXT_TOKENIZER", "estimate").lower() != "tiktoken":
+        return None
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in a text.
+
+    Uses tiktoken's cl100k_base encoding when enabled and otherwise the usual
+    ~4 characters per token estimate.
+
+    Args:
+        text: The text to measure
+
+    Returns:
+        Number of tokens
+    """
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return max(1, len(text) // 4)
+
+
+def _message_text(message: dict[str, Any]) -> str:
+    """Get the text content of a chat message."""
+    content = message.get("content", "")
+    return content if isinstance(content, str) else str(content)
+
+
+def count_message_tokens(messages: list[dict[str, Any]]) -> int:
+    """Count tokens in a list of chat messages, including ~4 tokens of framing per message.
+
+    Args:
+        messages: List of message dictionaries with 'role' and 'content'
+
+    Returns:
+        Number of tokens
+    """
+    return sum(count_tokens(_message_text(message)) + 4 for message in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text down to at most max_tokens, preferring a sentence boundary.
+
+    Args:
+        text: The text to truncate
+        max_tokens: Token limit
+
+    Returns:
+        The truncated text (unchanged if it already fits)
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    # Start from the character estimate and shrink until it fits
+    cut = text[: max_tokens * 4]
+    while cut and count_tokens(cut) > max_tokens:
+        cut = cut[: int(len(cut) * 0.9)]
+    sentences = _SENTENCE_END.split(cut)
+    if len(sentences) > 1:
+        cut = " ".join(sentences[:-1])
+    return cut.rstrip() + " …"
+
+
+def _shingles(text: str, size: int = 5) -> set[tuple[str, ...]]:
+    """Word n-gram shingles used to detect overlapping chunks."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def dedupe_chunks(chunks: list[str], threshold: float = 0.8) -> list[int]:
+    """Find chunks that do not substantially overlap an earlier (higher-ranked) chunk.
+
+    Overlap is the share of a chunk's word 5-gram shingles already present in a
+    kept chunk, so a chunk contained in another counts as a duplicate even when
+    the two differ in length.
+
+    Args:
+        chunks: Chunk texts, most relevant first
+        threshold: Overlap at or above which a chunk is dropped
+
+    Returns:
+        Indices of the chunks to keep, in order
+    """
+    kept: list[int] = []
+    kept_shingles: list[set[tuple[str, ...]]] = []
+    for index, chunk in enumerate(chunks):
+        shingles = _shingles(chunk)
+        if not shingles:
+            continue
+        duplicate = any(len(shingles & other) / min(len(shingles), len(other)) >= threshold for other in kept_shingles)
+        if not duplicate:
+            kept.append(index)
+            kept_shingles.append(shingles)
+    return kept
+
+
+def _relevance(query: str, chunk: str) -> float:
+    """Share of the query's words that appear in a chunk."""
+    query_words = set(_WORD_PATTERN.findall(query.lower()))
+    if not query_words:
+        return 0.0
+    return len(query_words & set(_WORD_PATTERN.findall(chunk.lower()))) / len(query_words)
+
+
+class TokenHistogram:
+    """Histogram of token counts with fixed power-of-two buckets."""
+
+    BOUNDS = (256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0
+
+    def observe(self, tokens: int) -> None:
+        """Record one observation.
+
+        Args:
+            tokens: Token count to record
+        """
+        self.buckets[bisect_left(self.BOUNDS, tokens)] += 1
+        self.count += 1
+        self.total += tokens
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the histogram as a dictionary of `le_<bound>` bucket counts plus count/sum/mean."""
+        labels = [f"le_{bound}" for bound in self.BOUNDS] + ["le_inf"]
+        return {
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+            "count": self.count,
+            "sum": self.total,
+            "mean": round(self.total / self.count, 1) if self.count else 0.0,
+        }
+
+
+@dataclass
+class ContextBudget:
+    """Per-request token limits for the prompt."""
+
+    max_tokens: int = 6000
+    retrieval_tokens: int = 2500
+    keep_recent_messages: int = 6
+    summary_tokens: int = 200
+    dedupe_threshold: float = 0.8
+
+    @classmethod
+    def from_env(cls) -> "ContextBudget":
+        """Create a budget from CONTEXT_* environment variables.
+
+        Returns:
+            ContextBudget instance
+        """
+        return cls(
+            max_tokens=int(os.getenv("CONTEXT_TOKEN_BUDGET", str(cls.max_tokens))),
+            retrieval_tokens=int(os.getenv("CONTEXT_RETRIEVAL_TOKENS", str(cls.retrieval_tokens))),
+            keep_recent_messages=int(os.getenv("CONTEXT_KEEP_RECENT_MESSAGES", str(cls.keep_recent_messages))),
+            summary_tokens=int(os.getenv("CONTEXT_SUMMARY_TOKENS", str(cls.summary_tokens))),
+            dedupe_threshold=float(os.getenv("CONTEXT_DEDUPE_THRESHOLD", str(cls.dedupe_threshold))),
+        )
+
+    @property
+    def history_tokens(self) -> int:
+        """Tokens left for conversation history once retrieval is reserved."""
+        return max(0, self.max_tokens - self.retrieval_tokens)
+
+
+class ContextBudgeter:
+    """Trim conversation history and retrieved chunks to a ContextBudget, recording token histograms."""
+
+    def __init__(self, budget: ContextBudget | None = None) -> None:
+        """Initialize the budgeter.
+
+        Args:
+            budget: Token limits (default: from environment)
+        """
+        self.budget = budget or ContextBudget.from_env()
+        self.histograms = {
+            "history_in": TokenHistogram(),
+            "history_out": TokenHistogram(),
+            "retrieval": TokenHistogram(),
+            "prompt": TokenHistogram(),
+        }
+
+    def summarize(self, dropped: list[dict[str, Any]], previous: list[str] | None = None) -> list[str]:
+        """Extend an extractive summary (first sentence of each turn) with dropped messages.
+
+        When the summary outgrows `summary_tokens`, its oldest lines are dropped first.
+
+        Args:
+            dropped: Messages removed from the history
+            previous: Summary lines from earlier trims, if any
+
+        Returns:
+            Summary lines (empty if summaries are disabled)
+        """
+        if self.budget.summary_tokens <= 0:
+            return []
+        lines = list(previous or [])
+        for message in dropped:
+            first_sentence = _SENTENCE_END.split(_message_text(message).strip(), maxsplit=1)[0]
+            lines.append(f"- {message.get('role', 'user')}: {first_sentence}")
+        while len(lines) > 1 and count_tokens(_SUMMARY_HEADER + "\n".join(lines)) > self.budget.summary_tokens:
+            lines.pop(0)
+        return lines
+
+    def summary_message(self, lines: list[str]) -> dict[str, str] | None:
+        """Build the system message carrying a summary of dropped turns.
+
+        Args:
+            lines: Summary lines from summarize()
+
+        Returns:
+            Message dictionary, or None if there is nothing to summarize
+        """
+        if not lines:
+            return None
+        return {
+            "role": "system",
+            "content": truncate_to_tokens(_SUMMARY_HEADER + "\n".join(lines), self.budget.summary_tokens),
+        }
+
+    def split_history(
+        self, turns: list[dict[str, Any]], reserved_tokens: int = 0
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Split conversation turns into the ones to drop and the ones that fit the history budget.
+
+        Only called once history is over budget: everything before the most recent
+        `keep_recent_messages` is dropped (to be summarized), and if the recent
+        window alone still exceeds the budget it is shrunk oldest-first. The latest
+        turn is always kept.
+
+        Args:
+            turns: Non-system messages, oldest first
+            reserved_tokens: Budget already used by system messages and the summary
+
+        Returns:
+            Tuple of (dropped, kept) messages
+        """
+        available = self.budget.history_tokens - reserved_tokens
+        start = max(0, len(turns) - max(1, self.budget.keep_recent_messages))
+        total = sum(count_tokens(_message_text(turn)) + 4 for turn in turns[start:])
+        while total > available and start < len(turns) - 1:
+            total -= count_tokens(_message_text(turns[start])) + 4
+            start += 1
+        return turns[:start], turns[start:]
+
+    def trim_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Fit conversation history into the history budget.
+
+        When over budget, system messages and the most recent `keep_recent_messages`
+        are kept and older turns are replaced by a short summary. If the recent
+        window alone is still over budget it is shrunk too, but the latest message
+        is always kept.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+
+        Returns:
+            The trimmed message list (the input list itself if nothing was trimmed)
+        """
+        tokens_in = count_message_tokens(messages)
+        self.histograms["history_in"].observe(tokens_in)
+        if tokens_in <= self.budget.history_tokens:
+            self.histograms["history_out"].observe(tokens_in)
+            return messages
+
+        system = [message for message in messages if message.get("role") == "system"]
+        turns = [message for message in messages if message.get("role") != "system"]
+        dropped, kept = self.split_history(turns, count_message_tokens(system) + self.budget.summary_tokens)
+        summary = self.summary_message(self.summarize(dropped))
+
+        trimmed = system + ([summary] if summary else []) + kept
+        self.histograms["history_out"].observe(count_message_tokens(trimmed))
+        return trimmed
+
+    def select_chunks(self, query: str, chunks: list[str], limit: int | None = None) -> list[tuple[int, str]]:
+        """Choose which retrieved chunks to send, within the retrieval budget.
+
+        Chunks are deduplicated, ranked by search order blended with query-term
+        overlap, and added until the budget is spent. A chunk that does not fit
+        is truncated if enough budget is left to make it useful.
+
+        Args:
+            query: The search query
+            chunks: Chunk texts in search-ranking order
+            limit: Maximum number of chunks to keep
+
+        Returns:
+            (index, text) pairs for the chunks to keep, most relevant first
+        """
+        candidates = dedupe_chunks(chunks, self.budget.dedupe_threshold)
+        scores = {index: 1.0 / (1 + rank) + _relevance(query, chunks[index]) for rank, index in enumerate(candidates)}
+        ranked = sorted(candidates, key=lambda index: -scores[index])
+
+        selected: list[tuple[int, str]] = []
+        remaining = self.budget.retrieval_tokens
+        for index in ranked[:limit]:
+            text = chunks[index]
+            tokens = count_tokens(text)
+            if tokens > remaining:
+                if remaining < _MIN_USEFUL_CHUNK_TOKENS:
+                    break
+                text = truncate_to_tokens(text, remaining)
+                tokens = count_tokens(text)
+            selected.append((index, text))
+            remaining -= tokens
+
+        self.histograms["retrieval"].observe(self.budget.retrieval_tokens - remaining)
+        return selected
+
+    def observe_prompt_tokens(self, tokens: int) -> None:
+        """Record the prompt size actually sent to the model.
+
+        Args:
+            tokens: Input tokens for the request
+        """
+        self.histograms["prompt"].observe(tokens)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the budget and a snapshot of every histogram.
+
+        Returns:
+            Dictionary with the budget settings and histogram snapshots
+        """
+        return {
+            "budget": {
+                "max_tokens": self.budget.max_tokens,
+                "retrieval_tokens": self.budget.retrieval_tokens,
+                "history_tokens": self.budget.history_tokens,
+            },
+            **{name: histogram.snapshot() for name, histogram in self.histograms.items()},
+        }
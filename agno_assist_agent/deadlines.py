@@ -0,0 +1,261 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Request deadlines - adaptive timeouts and hedged model calls.
+
+The handler gives every request a deadline (current_deadline) that the
+layers below share. Timeouts adapt to the latency observed for the primary
+model, and a request still running past the hedge percentile can race a
+duplicate against a secondary model; the first answer wins and the other
+call is cancelled.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+# Absolute time.monotonic() by which the current request must finish, set by the handler
+current_deadline: ContextVar[float | None] = ContextVar("current_deadline", default=None)
+
+# Keys in the Bindu session context carrying a client-side timeout in seconds
+TIMEOUT_KEYS = ("timeout", "timeout_s", "deadline_s")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Exception raised when a request runs past its deadline."""
+
+
+def remaining_time() -> float | None:
+    """Seconds left until the current request's deadline, or None without a deadline."""
+    deadline = current_deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+class LatencyTracker:
+    """Sliding window of observed call latencies."""
+
+    def __init__(self, window: int = 200) -> None:
+        """Initialize the tracker.
+
+        Args:
+            window: Number of most recent latencies kept
+        """
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        """Return the number of latencies in the window."""
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        """Record the latency of a successful call."""
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the nearest-rank latency percentile over the window, or None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+@dataclass
+class DeadlinePolicy:
+    """Timeout and hedging settings."""
+
+    default_timeout: float = 120.0
+    min_timeout: float = 10.0
+    timeout_multiplier: float = 4.0
+    min_samples: int = 20
+    hedge_model: str | None = None
+    hedge_percentile: float = 95.0
+
+    @classmethod
+    def from_env(cls) -> "DeadlinePolicy":
+        """Create a policy from REQUEST_TIMEOUT* and HEDGE_* environment variables.
+
+        Returns:
+            DeadlinePolicy instance
+        """
+        return cls(
+            default_timeout=float(os.getenv("REQUEST_TIMEOUT", "120")),
+            min_timeout=float(os.getenv("REQUEST_TIMEOUT_MIN", "10")),
+            timeout_multiplier=float(os.getenv("REQUEST_TIMEOUT_MULTIPLIER", "4")),
+            min_samples=int(os.getenv("REQUEST_TIMEOUT_MIN_SAMPLES", "20")),
+            hedge_model=os.getenv("HEDGE_MODEL") or None,
+            hedge_percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+        )
+
+
+class DeadlineManager:
+    """Derives request deadlines and hedge delays from observed primary-model latency."""
+
+    def __init__(self, policy: DeadlinePolicy | None = None, tracker: LatencyTracker | None = None) -> None:
+        """Initialize the manager.
+
+        Args:
+            policy: Timeout and hedging settings
+            tracker: Latency window of the primary model
+        """
+        self.policy = policy or DeadlinePolicy()
+        self.tracker = tracker or LatencyTracker()
+        self.counts = {"requests": 0, "hedged": 0, "hedge_wins": 0, "timeouts": 0}
+
+    def timeout(self) -> float:
+        """Timeout for a new request.
+
+        Until enough latencies are observed this is default_timeout; afterwards it
+        is the p99 latency times timeout_multiplier, clamped to
+        [min_timeout, default_timeout].
+
+        Returns:
+            Timeout in seconds
+        """
+        p99 = self.tracker.percentile(99)
+        if p99 is None or len(self.tracker) < self.policy.min_samples:
+            return self.policy.default_timeout
+        return min(self.policy.default_timeout, max(self.policy.min_timeout, p99 * self.policy.timeout_multiplier))
+
+    def deadline(self, context: dict[str, Any] | None = None) -> float:
+        """Return the absolute deadline for a new request, honouring a shorter client timeout.
+
+        Client timeouts that are not positive numbers are ignored.
+
+        Args:
+            context: Optional Bindu session context
+
+        Returns:
+            Deadline as a time.monotonic() value
+        """
+        timeout = self.timeout()
+        for key in TIMEOUT_KEYS:
+            if context and context.get(key):
+                try:
+                    client_timeout = float(context[key])
+                except (TypeError, ValueError):
+                    continue
+                if math.isfinite(client_timeout) and client_timeout > 0:
+                    timeout = min(timeout, client_timeout)
+                break
+        return time.monotonic() + timeout
+
+    def hedge_delay(self) -> float | None:
+        """Seconds after which a still-running call gets a hedged duplicate, or None to not hedge."""
+        if not self.policy.hedge_model or len(self.tracker) < self.policy.min_samples:
+            return None
+        return self.tracker.percentile(self.policy.hedge_percentile)
+
+    async def call(
+        self,
+        primary: Callable[[], Awaitable[Any]],
+        secondary: Callable[[], Awaitable[Any]] | None = None,
+        failed: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """Run a call within the current deadline, hedging it if it runs past the hedge delay.
+
+        A call that raises (or whose result `failed` rejects) does not win while
+        another call is still running; if all calls fail, the last failure is returned.
+        Primary calls that succeed are recorded in the latency window; primary calls
+        cut short by the deadline or a winning hedge are recorded at their elapsed time.
+
+        Args:
+            primary: Starts the call to the primary model
+            secondary: Starts the same call against the secondary model
+            failed: Optional check for results that report an error instead of raising
+
+        Returns:
+            The result of whichever call finished successfully first
+
+        Raises:
+            DeadlineExceeded: If no call finished before the deadline
+        """
+        self.counts["requests"] += 1
+        timeout = remaining_time()
+        hedge_delay = self.hedge_delay() if secondary is not None else None
+        if hedge_delay is not None and timeout is not None and hedge_delay >= timeout:
+            hedge_delay = None  # the deadline comes first; a hedge would be cancelled unstarted
+        started = time.monotonic()
+
+        primary_task = asyncio.ensure_future(primary())
+        tasks = {primary_task}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=_min_time(hedge_delay, timeout))
+            if not done and secondary is not None and hedge_delay is not None:
+                self.counts["hedged"] += 1
+                tasks.add(asyncio.ensure_future(secondary()))
+            winner = await _first_success(tasks, None if timeout is None else started + timeout, failed)
+        finally:
+            primary_pending = not primary_task.done()
+            for task in tasks:
+                task.cancel()
+
+        if primary_pending:
+            # Censored sample: a primary call that timed out or lost a hedge took at least
+            # this long. Without it the window would only hold fast calls and the timeout
+            # could never rise after the upstream slows down.
+            self.tracker.observe(time.monotonic() - started)
+        if winner is None:
+            self.counts["timeouts"] += 1
+            error_msg = f"Request exceeded its deadline of {timeout:.1f}s"
+            raise DeadlineExceeded(error_msg)
+        if winner is not primary_task:
+            self.counts["hedge_wins"] += 1
+        elif winner.exception() is None and not (failed and failed(winner.result())):
+            self.tracker.observe(time.monotonic() - started)
+        return winner.result()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hedging counters and the current latency percentiles.
+
+        Returns:
+            Dictionary of deadline metrics
+        """
+        return {
+            **self.counts,
+            "samples": len(self.tracker),
+            "p50_s": self.tracker.percentile(50),
+            "p95_s": self.tracker.percentile(95),
+            "p99_s": self.tracker.percentile(99),
+            "timeout_s": self.timeout(),
+            "hedge_delay_s": self.hedge_delay(),
+        }
+
+
+async def _first_success(
+    tasks: set[asyncio.Future], deadline: float | None, failed: Callable[[Any], bool] | None
+) -> asyncio.Future | None:
+    """Wait for the first task that succeeds, removing finished tasks from the set.
+
+    Returns:
+        The winning task, the last failed task if all failed, or None at the deadline
+    """
+    while tasks:
+        left = None if deadline is None else deadline - time.monotonic()
+        if left is not None and left <= 0:
+            return None
+        done, _ = await asyncio.wait(tasks, timeout=left, return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+            return None
+        for task in done:
+            tasks.discard(task)
+            unsuccessful = task.exception() is not None or (failed is not None and failed(task.result()))
+            if not unsuccessful or not tasks:
+                return task
+    return None
+
+
+def _min_time(*values: float | None) -> float | None:
+    """Smallest of the given timeouts, ignoring None."""
+    present = [value for value in values if value is not None]
+    return min(present) if present else None
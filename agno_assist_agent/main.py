@@ -12,86 +12,585 @@
 import argparse
 import asyncio
 import json
+import math
 import os
+import re
+import shutil
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import pairwise
 from pathlib import Path
 from textwrap import dedent
-from typing import Any
-
-from agno.agent import Agent
-from agno.knowledge.knowledge import Knowledge
-from agno.models.openrouter import OpenRouter
-from agno.tools.mem0 import Mem0Tools
-from agno.vectordb.lancedb import LanceDb, SearchType
-from bindu.penguin.bindufy import bindufy
+from typing import TYPE_CHECKING, Any
+
 from dotenv import load_dotenv
 
+from agno_assist_agent.accounting import RequestUsage, UsageAccountant, current_usage, resolve_caller
+from agno_assist_agent.answers import DEFAULT_CANONICAL_QUESTIONS, AnswerIndex, CanonicalAnswer, bypass_answer_index
+from agno_assist_agent.batch import BatchItem, BatchWriter, batch_references, load_completed, read_batch_items
+from agno_assist_agent.context import ContextBudgeter, count_message_tokens, count_tokens
+from agno_assist_agent.deadlines import DeadlineExceeded, DeadlineManager, DeadlinePolicy, current_deadline
+from agno_assist_agent.profiling import Profiler
+from agno_assist_agent.sessions import SessionManager, bindu_task_context, current_session, resolve_session_id
+from agno_assist_agent.snapshot import SnapshotError, load_snapshot, read_manifest, write_snapshot
+from agno_assist_agent.sources import SourceDocument, SourceFetcher
+
+# Agno, LanceDB and Bindu pull in pyarrow, pandas and friends. They are imported
+# inside the functions that need them so that `import agno_assist_agent` and
+# `--help` stay fast (see tests/test_import_time.py for the startup budget).
+if TYPE_CHECKING:
+    from agno.agent import Agent
+    from agno.knowledge.knowledge import Knowledge
+    from agno.models.openrouter import OpenRouter
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Global instances
-agent: Agent | None = None
-knowledge: Knowledge | None = None
+agent: "Agent | None" = None
+knowledge: "Knowledge | None" = None
 model_name: str | None = None
 mem0_api_key: str | None = None
+context_budgeter: ContextBudgeter | None = None
+session_manager: SessionManager | None = None
+usage_accountant: UsageAccountant | None = None
+deadline_manager: DeadlineManager | None = None
+# Agent on the secondary model (HEDGE_MODEL) that races slow primary calls
+hedge_agent: "Agent | None" = None
+# Answers batch items from prefetched references instead of searching itself
+batch_agent: "Agent | None" = None
 _initialized: bool = False
 _init_lock = asyncio.Lock()
 
+# Documentation source and the sha256 of the copy the knowledge base was built from
+source_fetcher: SourceFetcher | None = None
+knowledge_digest: str | None = None
+_refresh_task: asyncio.Task | None = None
+# Precomputed answers for canonical questions, regenerated when the docs change
+answer_index: AnswerIndex | None = None
+_precompute_task: asyncio.Task | None = None
+_matching_embedder: "BaseEmbedder | None" = None
+
+
+# Documentation indexed into the knowledge base
+AGNO_DOCS_NAME = "Agno Documentation"
+AGNO_DOCS_URL = "https://docs.agno.com/llms-full.txt"
+
 
 class APIKeyError(ValueError):
     """Exception raised when an API key is missing."""
 
 
-class LocalEmbedder:
-    """Local embedder compatible with Agno's Knowledge class.
+# Characters counted by the frequency-based local embedder
+_EMBEDDING_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789 .,!?-:;\"'()[]{}<>@#$%^&*+=/\\|~`"
 
-    This embedder creates simple frequency-based embeddings without requiring
-    any external API keys. It produces 1536-dimensional vectors to match
-    OpenAI's embedding dimensions.
+# Worker pool shared by all embedders, created on first use
+_embedding_executor: Executor | None = None
+
+
+def _charfreq_embed(text: str, dimensions: int) -> list[float]:
+    """Create a simple but deterministic embedding based on character frequencies.
+
+    Args:
+        text: The input text to embed
+        dimensions: The output dimension of the embedding
+
+    Returns:
+        A normalized vector of floats with length dimensions
     """
+    if not text or not isinstance(text, str):
+        return [0.0] * dimensions
+
+    text = text.lower()
+    embedding = []
+    # Expanded character set for better distribution
+    for char in _EMBEDDING_CHARS:
+        embedding.append(text.count(char) / max(1, len(text)))
+
+    # Repeat pattern to reach required dimensions if needed
+    if len(embedding) < dimensions:
+        # Repeat the pattern to fill to required dimensions
+        repeats = (dimensions // len(embedding)) + 1
+        embedding = (embedding * repeats)[:dimensions]
+    else:
+        embedding = embedding[:dimensions]
 
-    def __init__(self, dimensions: int = 1536) -> None:
-        """Initialize the local embedder with specified dimensions.
+    # Normalize the embedding
+    magnitude = sum(x * x for x in embedding) ** 0.5
+    if magnitude > 0:
+        embedding = [x / magnitude for x in embedding]
+
+    return embedding
+
+
+def _charfreq_embed_batch(texts: list[str], dimensions: int) -> list[list[float]]:
+    """Embed a batch of texts (module-level so it can run in a process pool).
+
+    Args:
+        texts: The input texts to embed
+        dimensions: The output dimension of the embeddings
+
+    Returns:
+        List of vector embeddings
+    """
+    return [_charfreq_embed(text, dimensions) for text in texts]
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+
+# Common English words carry little signal for retrieval; the hash embedder skips them
+_HASH_EMBEDDER_STOPWORDS = frozenset([
+    "a",
+    "an",
+    "and",
+    "are",
+    "as",
+    "at",
+    "be",
+    "but",
+    "by",
+    "can",
+    "do",
+    "does",
+    "for",
+    "from",
+    "how",
+    "i",
+    "if",
+    "in",
+    "is",
+    "it",
+    "of",
+    "on",
+    "or",
+    "so",
+    "that",
+    "the",
+    "this",
+    "to",
+    "was",
+    "what",
+    "when",
+    "where",
+    "which",
+    "who",
+    "why",
+    "will",
+    "with",
+    "you",
+    "your",
+])
+
+
+def _hash_embed(text: str, dimensions: int) -> list[float]:
+    """Create a hashed n-gram embedding (word unigrams/bigrams and character trigrams).
+
+    Features are mapped to buckets with a stable CRC32 hash and a sign bit, weighted
+    by sublinear term frequency and L2-normalized, so vectors do not depend on the
+    corpus and stay comparable between ingestion and query time.
+
+    Args:
+        text: The input text to embed
+        dimensions: The output dimension of the embedding
+
+    Returns:
+        A normalized vector of floats with length dimensions
+    """
+    embedding = [0.0] * dimensions
+    if not text or not isinstance(text, str):
+        return embedding
+
+    words = [word for word in _TOKEN_PATTERN.findall(text.lower()) if word not in _HASH_EMBEDDER_STOPWORDS]
+    counts: Counter[str] = Counter(words)
+    counts.update(f"{first} {second}" for first, second in pairwise(words))
+    for word in words:
+        padded = f"#{word}#"
+        counts.update(f"~{padded[i : i + 3]}" for i in range(len(padded) - 2))
+
+    for feature, count in counts.items():
+        bucket = zlib.crc32(feature.encode())
+        weight = (1.0 + math.log(count)) * (0.5 if feature[0] == "~" else 1.0)
+        embedding[bucket % dimensions] += -weight if bucket & 0x80000000 else weight
+
+    magnitude = math.sqrt(sum(x * x for x in embedding))
+    if magnitude > 0:
+        embedding = [x / magnitude for x in embedding]
+
+    return embedding
+
+
+def _hash_embed_batch(texts: list[str], dimensions: int) -> list[list[float]]:
+    """Embed a batch of texts with the hash embedder (process-pool safe).
+
+    Args:
+        texts: The input texts to embed
+        dimensions: The output dimension of the embeddings
+
+    Returns:
+        List of vector embeddings
+    """
+    return [_hash_embed(text, dimensions) for text in texts]
+
+
+# ONNX sessions and tokenizers, loaded once per process and keyed by (model_dir, threads)
+_onnx_models: dict[tuple[str, int], tuple[Any, Any]] = {}
+_onnx_models_lock = threading.Lock()
+
+
+def _load_onnx_model(model_dir: str, threads: int) -> tuple[Any, Any]:
+    """Load (or reuse) an ONNX Runtime session and tokenizer from a local directory.
+
+    Args:
+        model_dir: Directory containing model.onnx and tokenizer.json
+        threads: Intra-op thread count for ONNX Runtime
+
+    Returns:
+        Tuple of (InferenceSession, Tokenizer)
+
+    Raises:
+        ImportError: If onnxruntime or tokenizers is not installed
+        FileNotFoundError: If the model files are missing
+    """
+    key = (model_dir, threads)
+    with _onnx_models_lock:
+        if key in _onnx_models:
+            return _onnx_models[key]
+
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            error_msg = "The onnx embedder requires 'onnxruntime' and 'tokenizers': pip install onnxruntime tokenizers"
+            raise ImportError(error_msg) from e
+
+        model_path = Path(model_dir) / "model.onnx"
+        tokenizer_path = Path(model_dir) / "tokenizer.json"
+        for path in (model_path, tokenizer_path):
+            if not path.exists():
+                error_msg = f"ONNX embedder model file not found: {path} (set EMBEDDER_MODEL_PATH)"
+                raise FileNotFoundError(error_msg)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+        tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        tokenizer.enable_truncation(max_length=512)
+        tokenizer.enable_padding()
+
+        _onnx_models[key] = (session, tokenizer)
+        return session, tokenizer
+
+
+def _onnx_embed_batch(texts: list[str], model_dir: str, threads: int, max_batch: int) -> list[list[float]]:
+    """Embed a batch of texts with a local ONNX sentence-embedding model.
+
+    Texts are sorted by length and run in sub-batches of max_batch so that each
+    sub-batch is padded only to its own longest text. Token embeddings are
+    mean-pooled over the attention mask and L2-normalized.
+
+    Args:
+        texts: The input texts to embed
+        model_dir: Directory containing model.onnx and tokenizer.json
+        threads: Intra-op thread count for ONNX Runtime
+        max_batch: Maximum texts per inference call
+
+    Returns:
+        List of vector embeddings, in input order
+    """
+    import numpy as np
+
+    session, tokenizer = _load_onnx_model(model_dir, threads)
+    input_names = {model_input.name for model_input in session.get_inputs()}
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i] or ""))
+    results: list[list[float]] = [[] for _ in texts]
+
+    for start in range(0, len(order), max_batch):
+        indices = order[start : start + max_batch]
+        encodings = tokenizer.encode_batch([texts[i] or "" for i in indices])
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        feed = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in input_names:
+            feed["token_type_ids"] = np.zeros_like(input_ids)
+
+        output = session.run(None, {name: value for name, value in feed.items() if name in input_names})[0]
+        if output.ndim == 3:
+            mask = attention_mask[..., None].astype(output.dtype)
+            output = (output * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        output = output / np.clip(np.linalg.norm(output, axis=1, keepdims=True), 1e-12, None)
+
+        for i, vector in zip(indices, output.tolist(), strict=True):
+            results[i] = vector
+
+    return results
+
+
+def _get_embedding_executor() -> Executor:
+    """Get the shared embedding worker pool, creating it on first use.
+
+    The pool type is selected by EMBEDDING_EXECUTOR ("thread" or "process") and
+    its size by EMBEDDING_WORKERS (default: min(4, CPU count)).
+
+    Returns:
+        The shared executor
+    """
+    global _embedding_executor
+
+    if _embedding_executor is None:
+        workers = int(os.getenv("EMBEDDING_WORKERS", str(min(4, os.cpu_count() or 1))))
+        if os.getenv("EMBEDDING_EXECUTOR", "thread").lower() == "process":
+            _embedding_executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _embedding_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embedding")
+    return _embedding_executor
+
+
+def _shutdown_embedding_executor() -> None:
+    """Shut down the shared embedding worker pool if it was started."""
+    global _embedding_executor
+
+    if _embedding_executor is not None:
+        _embedding_executor.shutdown(wait=False, cancel_futures=True)
+        _embedding_executor = None
+
+
+class _EmbeddingBatcher:
+    """Coalesce concurrent single-text embedding requests into batched pool calls.
+
+    Requests arriving within `window_ms` of the first pending one are flushed
+    together; a full batch of `max_batch` texts is flushed immediately.
+    """
+
+    def __init__(self, embed_batch: Callable[[list[str]], list[list[float]]], window_ms: float, max_batch: int) -> None:
+        """Initialize the batcher.
 
         Args:
-            dimensions: The output dimension of the embeddings (default: 1536)
+            embed_batch: Picklable callable embedding a list of texts
+            window_ms: How long to wait for more requests before flushing
+            max_batch: Maximum number of texts per pool call
         """
-        self.dimensions = dimensions
-        self.enable_batch = True
-        print(f"🔧 Using local embedder (no API key required) - {dimensions} dims")
+        self.embed_batch = embed_batch
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
 
-    def _simple_embed(self, text: str) -> list[float]:
-        """Create a simple but deterministic embedding based on character frequencies.
+    def depth(self) -> dict[str, int]:
+        """Texts waiting for the next flush and batches running in the pool."""
+        return {"pending_texts": len(self._pending), "running_batches": len(self._tasks)}
+
+    async def submit(self, text: str) -> list[float]:
+        """Queue a text for the next batch and wait for its embedding.
 
         Args:
             text: The input text to embed
 
         Returns:
-            A normalized vector of floats with length self.dimensions
+            A vector embedding of the text
         """
-        if not text or not isinstance(text, str):
-            return [0.0] * self.dimensions
-
-        text = text.lower()
-        embedding = []
-        # Expanded character set for better distribution
-        chars = "abcdefghijklmnopqrstuvwxyz0123456789 .,!?-:;\"'()[]{}<>@#$%^&*+=/\\|~`"
-        for char in chars:
-            embedding.append(text.count(char) / max(1, len(text)))
-
-        # Repeat pattern to reach required dimensions if needed
-        if len(embedding) < self.dimensions:
-            # Repeat the pattern to fill to required dimensions
-            repeats = (self.dimensions // len(embedding)) + 1
-            embedding = (embedding * repeats)[: self.dimensions]
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Send all pending texts to the worker pool as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """Embed a batch in the worker pool and resolve the waiting futures.
+
+        Args:
+            batch: Pending (text, future) pairs
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            vectors = await loop.run_in_executor(
+                _get_embedding_executor(), self.embed_batch, [text for text, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
         else:
-            embedding = embedding[: self.dimensions]
+            for (_, future), vector in zip(batch, vectors, strict=True):
+                if not future.done():
+                    future.set_result(vector)
 
-        # Normalize the embedding
-        magnitude = sum(x * x for x in embedding) ** 0.5
-        if magnitude > 0:
-            embedding = [x / magnitude for x in embedding]
 
-        return embedding
+class LoopLagMonitor:
+    """Measure event-loop lag by timing how late a periodic sleep wakes up.
+
+    Any CPU work running on the loop (such as inline embedding) shows up as lag.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear collected samples."""
+        self.samples = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def start(self) -> None:
+        """Start sampling on the running event loop (no-op if already running)."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None and not self._task.get_loop().is_closed():
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self) -> None:
+        """Sample loop lag until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - started - self.interval) * 1000)
+            self.samples += 1
+            self.total_ms += lag_ms
+            self.max_ms = max(self.max_ms, lag_ms)
+            self.last_ms = lag_ms
+
+    def stats(self) -> dict[str, float]:
+        """Return a snapshot of the collected lag metrics.
+
+        Returns:
+            Dictionary with sample count and last/average/max lag in milliseconds
+        """
+        return {
+            "samples": self.samples,
+            "last_ms": round(self.last_ms, 3),
+            "avg_ms": round(self.total_ms / self.samples, 3) if self.samples else 0.0,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+loop_lag_monitor = LoopLagMonitor()
+
+# Opt-in runtime profiling (ENABLE_PROFILING, SIGUSR2 or the PROFILE_ADMIN_PORT route)
+profiler = Profiler.from_env()
+
+
+class _EmbeddingCache:
+    """Thread-safe bounded LRU cache of text embeddings."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached embeddings (0 disables caching)
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> list[float] | None:
+        """Return the cached embedding for a text, if any."""
+        with self._lock:
+            embedding = self._entries.get(text)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return embedding
+
+    def __len__(self) -> int:
+        """Return the number of cached embeddings."""
+        return len(self._entries)
+
+    def put(self, text: str, embedding: list[float]) -> None:
+        """Cache an embedding, evicting the least recently used entries when full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[text] = embedding
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+def _embedding_usage(text: str) -> dict[str, int]:
+    """Usage metadata for Agno: local embedders cost nothing, but report the (estimated) tokens processed."""
+    tokens = count_tokens(text)
+    return {"prompt_tokens": tokens, "total_tokens": tokens}
+
+
+class BaseEmbedder:
+    """Base class for local embedders compatible with Agno's Knowledge class.
+
+    Subclasses provide a picklable batch function; this class adds the LRU cache
+    for single texts and keeps the async methods off the event loop: they run in
+    the shared worker pool, and concurrent single-text queries are micro-batched.
+    """
+
+    name = "base"
+
+    def __init__(self, dimensions: int, embed_batch: Callable[[list[str]], list[list[float]]]) -> None:
+        """Initialize the embedder.
+
+        Args:
+            dimensions: The output dimension of the embeddings
+            embed_batch: Picklable callable embedding a list of texts
+        """
+        self.dimensions = dimensions
+        self.enable_batch = True
+        self.batch_size = int(os.getenv("EMBEDDING_MAX_BATCH", "64"))
+        self._embed_batch = embed_batch
+        self._batcher = _EmbeddingBatcher(
+            self._embed_batch,
+            window_ms=float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "2")),
+            max_batch=self.batch_size,
+        )
+        self._cache = _EmbeddingCache(int(os.getenv("EMBEDDING_CACHE_SIZE", "4096")))
+
+    def config(self) -> dict[str, Any]:
+        """Describe the embedder; vectors are only comparable when this matches.
+
+        Returns:
+            Dictionary with the backend name and dimensions
+        """
+        return {"backend": self.name, "dimensions": self.dimensions}
 
     def get_embedding(self, text: str) -> list[float]:
         """Get embedding for a single text (synchronous).
@@ -102,7 +601,11 @@ class LocalEmbedder:
         Returns:
             A vector embedding of the text
         """
-        return self._simple_embed(text)
+        embedding = self._cache.get(text)
+        if embedding is None:
+            embedding = self._embed_batch([text])[0]
+            self._cache.put(text, embedding)
+        return embedding
 
     def get_embeddings(self, texts: list[str]) -> list[list[float]]:
         """Get embeddings for multiple texts (synchronous).
@@ -113,7 +616,7 @@ class LocalEmbedder:
         Returns:
             List of vector embeddings
         """
-        return [self._simple_embed(text) for text in texts]
+        return self._embed_batch(texts)
 
     async def aget_embedding(self, text: str) -> list[float]:
         """Get embedding for a single text (asynchronous).
@@ -124,7 +627,11 @@ class LocalEmbedder:
         Returns:
             A vector embedding of the text
         """
-        return self.get_embedding(text)
+        embedding = self._cache.get(text)
+        if embedding is None:
+            embedding = await self._batcher.submit(text)
+            self._cache.put(text, embedding)
+        return embedding
 
     async def aget_embeddings(self, texts: list[str]) -> list[list[float]]:
         """Get embeddings for multiple texts (asynchronous).
@@ -135,10 +642,31 @@ class LocalEmbedder:
         Returns:
             List of vector embeddings
         """
-        return self.get_embeddings(texts)
+        loop = asyncio.get_running_loop()
+        executor = _get_embedding_executor()
+        chunks = [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(loop.run_in_executor(executor, self._embed_batch, chunk) for chunk in chunks))
+        return [vector for chunk in results for vector in chunk]
+
+    async def awarm_cache(self, texts: list[str]) -> int:
+        """Embed uncached texts in one batched pass and cache them for later lookups.
+
+        Args:
+            texts: Texts that will be embedded one by one later (e.g. batch questions)
+
+        Returns:
+            Number of texts that were embedded
+        """
+        missing = list(dict.fromkeys(text for text in texts if self._cache.get(text) is None))
+        for text, embedding in zip(missing, await self.aget_embeddings(missing), strict=True):
+            self._cache.put(text, embedding)
+        return len(missing)
 
     async def async_get_embedding_and_usage(self, text: str) -> tuple[list[float], dict]:
-        """Get embedding and usage info (required by Agno).
+        """Get embedding and usage info for one document (required by Agno).
+
+        Agno only calls this to embed documents, so the cache is neither read
+        nor filled: the LRU and its hit rate are kept for queries, which repeat.
 
         Args:
             text: The input text to embed
@@ -146,8 +674,143 @@ class LocalEmbedder:
         Returns:
             A tuple containing the embedding vector and usage metadata
         """
-        embedding = await self.aget_embedding(text)
-        return embedding, {"prompt_tokens": 0, "total_tokens": 0}
+        embedding = await self._batcher.submit(text)
+        return embedding, _embedding_usage(text)
+
+    async def async_get_embeddings_batch_and_usage(self, texts: list[str]) -> tuple[list[list[float]], list[dict]]:
+        """Embed documents in batched pool calls (used by Agno for ingestion, not cached).
+
+        Args:
+            texts: Document chunks to embed
+
+        Returns:
+            A tuple containing the embedding vectors and per-text usage metadata
+        """
+        return await self.aget_embeddings(texts), [_embedding_usage(text) for text in texts]
+
+
+class LocalEmbedder(BaseEmbedder):
+    """Character-frequency embedder (EMBEDDER=charfreq, the default).
+
+    This embedder creates simple frequency-based embeddings without requiring
+    any external API keys. It produces 1536-dimensional vectors to match
+    OpenAI's embedding dimensions.
+    """
+
+    name = "charfreq"
+
+    def __init__(self, dimensions: int = 1536) -> None:
+        """Initialize the local embedder with specified dimensions.
+
+        Args:
+            dimensions: The output dimension of the embeddings (default: 1536)
+        """
+        super().__init__(dimensions, partial(_charfreq_embed_batch, dimensions=dimensions))
+        print(f"🔧 Using local embedder (no API key required) - {dimensions} dims")
+
+    def _simple_embed(self, text: str) -> list[float]:
+        """Create a simple but deterministic embedding based on character frequencies.
+
+        Args:
+            text: The input text to embed
+
+        Returns:
+            A normalized vector of floats with length self.dimensions
+        """
+        return _charfreq_embed(text, self.dimensions)
+
+
+class HashEmbedder(BaseEmbedder):
+    """Hashed word and character n-gram embedder (EMBEDDER=hash).
+
+    Pure Python and dependency-free, but matches on words rather than letters,
+    which gives much better recall than the character-frequency embedder.
+    """
+
+    name = "hash"
+
+    def __init__(self, dimensions: int = 1536) -> None:
+        """Initialize the hash embedder with specified dimensions.
+
+        Args:
+            dimensions: The output dimension of the embeddings (default: 1536)
+        """
+        super().__init__(dimensions, partial(_hash_embed_batch, dimensions=dimensions))
+        print(f"🔧 Using hashed n-gram embedder (no API key required) - {dimensions} dims")
+
+
+class OnnxEmbedder(BaseEmbedder):
+    """Sentence-embedding model run locally with ONNX Runtime on CPU (EMBEDDER=onnx).
+
+    Loads model.onnx and tokenizer.json from EMBEDDER_MODEL_PATH and never touches
+    the network. EMBEDDER_THREADS sets ONNX Runtime's intra-op thread count.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str | None = None, threads: int | None = None) -> None:
+        """Initialize the ONNX embedder and load the model to find its dimensions.
+
+        Args:
+            model_dir: Directory containing model.onnx and tokenizer.json
+            threads: Intra-op thread count for ONNX Runtime
+        """
+        self.model_dir = str(Path(model_dir or os.getenv("EMBEDDER_MODEL_PATH", "models/embedder")).resolve())
+        self.threads = threads or int(os.getenv("EMBEDDER_THREADS", "1"))
+        max_batch = int(os.getenv("EMBEDDING_MAX_BATCH", "64"))
+
+        session, _ = _load_onnx_model(self.model_dir, self.threads)
+        dimensions = session.get_outputs()[0].shape[-1]
+        super().__init__(
+            dimensions,
+            partial(_onnx_embed_batch, model_dir=self.model_dir, threads=self.threads, max_batch=max_batch),
+        )
+        print(f"🔧 Using ONNX embedder from {self.model_dir} - {dimensions} dims, {self.threads} thread(s)")
+
+    def config(self) -> dict[str, Any]:
+        """Describe the embedder, including which model produced the vectors.
+
+        Returns:
+            Dictionary with the backend name, dimensions and model directory name
+        """
+        return {**super().config(), "model": Path(self.model_dir).name}
+
+
+EMBEDDERS: dict[str, type[BaseEmbedder]] = {
+    LocalEmbedder.name: LocalEmbedder,
+    HashEmbedder.name: HashEmbedder,
+    OnnxEmbedder.name: OnnxEmbedder,
+}
+
+
+def _create_embedder() -> BaseEmbedder:
+    """Create the embedder selected by the EMBEDDER environment variable.
+
+    Returns:
+        Embedder instance (default: charfreq)
+
+    Raises:
+        ValueError: If EMBEDDER names an unknown backend
+    """
+    backend = os.getenv("EMBEDDER", LocalEmbedder.name).lower()
+    if backend not in EMBEDDERS:
+        error_msg = f"Unknown EMBEDDER '{backend}'. Choose one of: {', '.join(EMBEDDERS)}"
+        raise ValueError(error_msg)
+    return EMBEDDERS[backend]()
+
+
+def _knowledge_table_name(embedder: BaseEmbedder) -> str:
+    """Get the LanceDB table for an embedder, so vectors from different backends never mix.
+
+    Args:
+        embedder: The embedder used for the knowledge base
+
+    Returns:
+        Table name
+    """
+    if embedder.name == LocalEmbedder.name:
+        return "agno_assist_knowledge"
+    return f"agno_assist_knowledge_{embedder.name}"
 
 
 def load_config() -> dict:
@@ -224,12 +887,13 @@ def _get_api_keys() -> tuple[str | None, str | None, str]:
     return openrouter_api_key, mem0_api_key, model_name
 
 
-def _create_llm_model(openrouter_api_key: str, model_name: str) -> OpenRouter:
+def _create_llm_model(openrouter_api_key: str, model_name: str, timeout: float | None = None) -> "OpenRouter":
     """Create and return the OpenRouter model.
 
     Args:
         openrouter_api_key: The OpenRouter API key
         model_name: The model identifier
+        timeout: Optional HTTP timeout per model call in seconds
 
     Returns:
         Configured OpenRouter model instance
@@ -244,18 +908,227 @@ def _create_llm_model(openrouter_api_key: str, model_name: str) -> OpenRouter:
         )
         raise APIKeyError(error_msg)
 
+    from agno.models.openrouter import OpenRouter
+
     return OpenRouter(
         id=model_name,
         api_key=openrouter_api_key,
+        base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+        timeout=timeout,
+    )
+
+
+def _snapshot_path(vector_db_path: str) -> str | None:
+    """Get the knowledge snapshot directory, or None if snapshots are disabled.
+
+    Args:
+        vector_db_path: The LanceDB directory
+
+    Returns:
+        Snapshot directory (env: KNOWLEDGE_SNAPSHOT_PATH, default: <VECTOR_DB_PATH>_snapshot)
+    """
+    if os.getenv("ENABLE_KNOWLEDGE_SNAPSHOT", "true").lower() not in ("true", "1", "yes"):
+        return None
+    return os.getenv("KNOWLEDGE_SNAPSHOT_PATH", f"{vector_db_path.rstrip('/')}_snapshot")
+
+
+def _create_knowledge(uri: str, embedder: BaseEmbedder) -> "Knowledge":
+    """Create a knowledge base with hybrid search over a LanceDB directory.
+
+    Args:
+        uri: LanceDB directory
+        embedder: Embedder for documents and queries
+
+    Returns:
+        Knowledge instance
+    """
+    from agno.knowledge.knowledge import Knowledge
+    from agno.vectordb.lancedb import LanceDb, SearchType
+
+    return Knowledge(
+        vector_db=LanceDb(
+            uri=uri,
+            table_name=_knowledge_table_name(embedder),
+            search_type=SearchType.hybrid,
+            embedder=embedder,  # type: ignore[arg-type]
+        ),
     )
 
 
-async def _setup_knowledge_base() -> Knowledge | None:
+def _restore_knowledge_snapshot(snapshot_path: str, embedder: BaseEmbedder) -> "Knowledge | None":
+    """Open the knowledge base straight from a verified snapshot.
+
+    Args:
+        snapshot_path: Snapshot directory
+        embedder: Embedder that will query the snapshot
+
+    Returns:
+        Knowledge instance, or None if there is no valid snapshot
+    """
+    started = time.perf_counter()
+    try:
+        data_dir = load_snapshot(snapshot_path, _knowledge_table_name(embedder), embedder.config())
+    except SnapshotError as e:
+        print(f"📦 No usable knowledge snapshot: {e}")
+        return None
+
+    knowledge_instance = _create_knowledge(str(data_dir), embedder)
+    # The snapshot already holds the full-text index; rebuilding it would modify the snapshot
+    knowledge_instance.vector_db.fts_index_exists = True  # type: ignore[union-attr]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"⚡ Restored knowledge base from snapshot {data_dir.parent.name} in {elapsed_ms:.0f} ms")
+    return knowledge_instance
+
+
+def _snapshot_source_digest(snapshot_path: str) -> str | None:
+    """Get the sha256 of the documentation a snapshot was built from.
+
+    Args:
+        snapshot_path: Snapshot directory
+
+    Returns:
+        The source digest, or None if the snapshot does not record one
+    """
+    try:
+        _, manifest = read_manifest(snapshot_path)
+    except SnapshotError:
+        return None
+    return next(
+        (item.get("sha256") for item in manifest.get("contents", []) if item.get("name") == AGNO_DOCS_NAME), None
+    )
+
+
+async def _save_knowledge_snapshot(
+    knowledge_instance: "Knowledge",
+    vector_db_path: str,
+    snapshot_path: str,
+    embedder: BaseEmbedder,
+    document: SourceDocument,
+) -> bool:
+    """Build the full-text index and write a snapshot of a freshly ingested knowledge base.
+
+    Runs in a worker thread since it copies and checksums the whole table.
+
+    Args:
+        knowledge_instance: The ingested knowledge base
+        vector_db_path: The LanceDB directory it was ingested into
+        snapshot_path: Snapshot directory
+        embedder: Embedder used for ingestion
+        document: The documentation that was ingested
+
+    Returns:
+        True if the snapshot was written
+    """
+    vector_db = knowledge_instance.vector_db
+
+    def build_and_write() -> Path:
+        if vector_db.table is not None and not vector_db.fts_index_exists:  # type: ignore[union-attr]
+            vector_db.table.create_fts_index("payload", use_tantivy=vector_db.use_tantivy, replace=True)  # type: ignore[union-attr]
+            vector_db.fts_index_exists = True  # type: ignore[union-attr]
+        contents = [{"name": AGNO_DOCS_NAME, "url": document.url, "sha256": document.sha256}]
+        return write_snapshot(
+            vector_db_path, _knowledge_table_name(embedder), snapshot_path, embedder.config(), contents
+        )
+
+    try:
+        version_dir = await asyncio.to_thread(build_and_write)
+    except Exception as e:
+        print(f"⚠️  Failed to write knowledge snapshot: {e}")
+        return False
+    else:
+        print(f"💾 Saved knowledge snapshot {version_dir.name}")
+        return True
+
+
+def _build_path(vector_db_path: str, digest: str) -> str:
+    """Directory a refreshed knowledge base is built in, next to VECTOR_DB_PATH.
+
+    Refreshes never write to the table being served: they build into a
+    directory per documentation version and are swapped in once complete.
+    """
+    return str(Path(f"{vector_db_path.rstrip('/')}_builds") / digest[:12])
+
+
+def _source_marker(uri: str, embedder: BaseEmbedder) -> Path:
+    """File recording the sha256 of the documentation ingested into a LanceDB directory."""
+    return Path(uri) / f"{_knowledge_table_name(embedder)}.source"
+
+
+def _ingested_digest(uri: str, embedder: BaseEmbedder) -> str | None:
+    """Get the sha256 of the documentation a complete ingestion wrote to a LanceDB directory, if any."""
+    try:
+        return _source_marker(uri, embedder).read_text().strip() or None
+    except OSError:
+        return None
+
+
+async def _build_knowledge(document: SourceDocument, embedder: BaseEmbedder, target: str | None = None) -> "Knowledge":
+    """Ingest the documentation into a LanceDB directory and snapshot it.
+
+    When snapshots are enabled, the returned knowledge base serves from the new
+    snapshot. Otherwise it serves from the directory it was ingested into.
+
+    Args:
+        document: The documentation to ingest
+        embedder: Embedder for documents and queries
+        target: Directory to build in from scratch (refreshes); defaults to VECTOR_DB_PATH,
+            which must not be serving requests yet
+
+    Returns:
+        Knowledge instance
+    """
+    vector_db_path = os.getenv("VECTOR_DB_PATH", "tmp/lancedb")
+    snapshot_path = _snapshot_path(vector_db_path)
+    build_path = target or vector_db_path
+    if target is not None:
+        # Leftovers of an interrupted build of the same version
+        await asyncio.to_thread(shutil.rmtree, target, ignore_errors=True)
+    elif _ingested_digest(build_path, embedder) != document.sha256:
+        # Nothing serves from VECTOR_DB_PATH during startup; drop rows of other documentation versions.
+        # Open a fresh handle after dropping; the dropping one keeps pointing at the old table.
+        stale_db = _create_knowledge(build_path, embedder).vector_db
+        if await stale_db.async_exists():  # type: ignore[union-attr]
+            await stale_db.async_drop()  # type: ignore[union-attr]
+    knowledge_instance = _create_knowledge(build_path, embedder)
+
+    print("📚 Loading Agno documentation into vector database...")
+    with profiler.trace_memory("ingestion"):
+        await knowledge_instance.add_content_async(
+            name=AGNO_DOCS_NAME, text_content=document.text, metadata={"source_url": document.url}
+        )
+    _source_marker(build_path, embedder).write_text(document.sha256)
+    print("✅ Documentation loaded successfully")
+
+    if snapshot_path and await _save_knowledge_snapshot(
+        knowledge_instance, build_path, snapshot_path, embedder, document
+    ):
+        return _restore_knowledge_snapshot(snapshot_path, embedder) or knowledge_instance
+    return knowledge_instance
+
+
+async def _prune_builds(vector_db_path: str, keep: set[str]) -> None:
+    """Remove refresh build directories that no knowledge base in `keep` serves from."""
+    builds_dir = Path(f"{vector_db_path.rstrip('/')}_builds")
+    if not builds_dir.is_dir():
+        return
+    for build in builds_dir.iterdir():
+        if str(build) not in keep:
+            await asyncio.to_thread(shutil.rmtree, build, ignore_errors=True)
+
+
+async def _setup_knowledge_base() -> "Knowledge | None":
     """Set up the vector database knowledge base for documentation.
 
+    Restores from a valid snapshot when one exists; otherwise ingests the
+    documentation (from the local mirror if there is one, so a slow or down
+    docs site does not block startup) and writes a snapshot for the next start.
+    Changes to the documentation are picked up by refresh_knowledge().
+
     Returns:
         Knowledge instance if successful, None otherwise
     """
+    global source_fetcher, knowledge_digest
+
     enable_vector_db = os.getenv("ENABLE_VECTOR_DB", "true").lower() in ("true", "1", "yes")
 
     if not enable_vector_db:
@@ -263,20 +1136,26 @@ async def _setup_knowledge_base() -> Knowledge | None:
         return None
 
     vector_db_path = os.getenv("VECTOR_DB_PATH", "tmp/lancedb")
+    snapshot_path = _snapshot_path(vector_db_path)
+    source_fetcher = SourceFetcher.from_env(os.getenv("KNOWLEDGE_SOURCE_URL", AGNO_DOCS_URL))
 
     try:
         # Create knowledge base with hybrid search using local embeddings
-        knowledge_instance = Knowledge(
-            vector_db=LanceDb(
-                uri=vector_db_path,
-                table_name="agno_assist_knowledge",
-                search_type=SearchType.hybrid,
-                embedder=LocalEmbedder(),  # type: ignore[arg-type]
-            ),
-        )
-
-        print("📚 Loading Agno documentation into vector database...")
-        await knowledge_instance.add_content_async(name="Agno Documentation", url="https://docs.agno.com/llms-full.txt")
+        embedder = _create_embedder()
+
+        if snapshot_path and (restored := _restore_knowledge_snapshot(snapshot_path, embedder)):
+            knowledge_digest = _snapshot_source_digest(snapshot_path)
+            return restored
+
+        document = await source_fetcher.load()
+        if document.from_mirror:
+            print(f"📦 Using mirrored documentation from {source_fetcher.body_path}")
+        build_path = _build_path(vector_db_path, document.sha256)
+        if _ingested_digest(build_path, embedder) == document.sha256:
+            # Built by a refresh in an earlier run and never snapshotted
+            knowledge_instance = _create_knowledge(build_path, embedder)
+        else:
+            knowledge_instance = await _build_knowledge(document, embedder)
 
     except Exception as e:
         print(f"⚠️  Failed to initialize vector database: {e}")
@@ -284,10 +1163,272 @@ async def _setup_knowledge_base() -> Knowledge | None:
         return None
 
     else:
-        print("✅ Documentation loaded successfully")
+        knowledge_digest = document.sha256
         return knowledge_instance
 
 
+async def refresh_knowledge() -> bool:
+    """Revalidate the documentation and rebuild the knowledge base if it changed.
+
+    The new version is built in its own directory and replaces the live one
+    once it is complete; requests keep using the previous one until then.
+
+    Returns:
+        True if the knowledge base was rebuilt
+    """
+    global knowledge, knowledge_digest
+
+    if source_fetcher is None:
+        return False
+    document = await source_fetcher.refresh()
+    if document is None or document.sha256 == knowledge_digest:
+        return False
+
+    print("🔄 Agno documentation changed, rebuilding knowledge base...")
+    try:
+        embedder = knowledge.vector_db.embedder if knowledge else _create_embedder()  # type: ignore[union-attr]
+        vector_db_path = os.getenv("VECTOR_DB_PATH", "tmp/lancedb")
+        rebuilt = await _build_knowledge(document, embedder, _build_path(vector_db_path, document.sha256))  # type: ignore[arg-type]
+    except Exception as e:
+        print(f"⚠️  Failed to rebuild knowledge base: {e}")
+        return False
+
+    previous = knowledge
+    knowledge, knowledge_digest = rebuilt, document.sha256
+    for live_agent in (agent, hedge_agent, batch_agent):
+        if live_agent is not None:
+            live_agent.knowledge = rebuilt
+            live_agent.knowledge_retriever = _retrieve_knowledge
+    _ensure_answer_index()
+    _start_answer_precompute()
+    # Keep the previous version for searches still running against it
+    await _prune_builds(
+        vector_db_path, {str(getattr(kb.vector_db, "uri", "")) for kb in (rebuilt, previous) if kb is not None}
+    )
+    return True
+
+
+async def _refresh_knowledge_loop(interval: float, retry_interval: float) -> None:
+    """Refresh the knowledge base now and then every interval seconds.
+
+    While there is no knowledge base yet (no mirror and the docs site down at
+    startup), retries start after retry_interval seconds and back off up to interval.
+    """
+    retry = retry_interval
+    while True:
+        try:
+            await refresh_knowledge()
+        except Exception as e:
+            print(f"⚠️  Knowledge refresh failed: {e}")
+        if knowledge is None:
+            await asyncio.sleep(min(retry, interval))
+            retry *= 2
+        else:
+            retry = retry_interval
+            await asyncio.sleep(interval)
+
+
+def _start_knowledge_refresh() -> None:
+    """Start the background documentation refresh.
+
+    Env: KNOWLEDGE_REFRESH_INTERVAL (0 disables) and KNOWLEDGE_RETRY_INTERVAL
+    (first retry while there is no knowledge base).
+    """
+    global _refresh_task
+
+    interval = float(os.getenv("KNOWLEDGE_REFRESH_INTERVAL", "3600"))
+    if source_fetcher is None or interval <= 0 or _refresh_task is not None:
+        return
+    retry_interval = float(os.getenv("KNOWLEDGE_RETRY_INTERVAL", "10"))
+    _refresh_task = asyncio.create_task(_refresh_knowledge_loop(interval, retry_interval))
+
+
+async def _search_knowledge(kb: "Knowledge", query: str, max_results: int, filters: Any = None) -> list:
+    """Search a knowledge base without blocking the event loop.
+
+    Agno's LanceDb.async_search runs the synchronous search on the loop, which
+    embeds the query with the synchronous get_embedding. The query is embedded
+    through the worker pool first, so that call is served from the cache, and
+    the search itself runs in a thread.
+
+    Args:
+        kb: The knowledge base to search
+        query: The search query
+        max_results: Maximum number of documents to return
+        filters: Optional knowledge filters
+
+    Returns:
+        Matching documents
+    """
+    embedder = getattr(kb.vector_db, "embedder", None)
+    if isinstance(embedder, BaseEmbedder):
+        await embedder.aget_embedding(query)
+    return await asyncio.to_thread(kb.search, query=query, max_results=max_results, filters=filters)
+
+
+async def _retrieve_knowledge(
+    query: str, num_documents: int | None = None, filters: Any = None, **kwargs: Any
+) -> list[dict[str, Any]] | None:
+    """Search the knowledge base and fit the results into the retrieval token budget.
+
+    Used as the agent's knowledge_retriever: fetches extra candidates so that
+    overlapping chunks can be dropped, then keeps the most relevant ones.
+    Results are cached in the current session for follow-up turns.
+
+    Args:
+        query: The search query
+        num_documents: Maximum number of documents to return
+        filters: Optional knowledge filters passed through to the search
+        **kwargs: Additional arguments from Agno (ignored)
+
+    Returns:
+        List of document dictionaries, or None if there is no knowledge base
+    """
+    if knowledge is None:
+        return None
+
+    limit = num_documents or knowledge.max_results
+    session = current_session.get()
+    usage = current_usage.get()
+    cache_key = f"{knowledge_digest}:{limit}:{filters}:{query}"
+    if session is not None and (cached := session.get_retrieval(cache_key)) is not None:
+        if usage is not None:
+            usage.observe_retrieval(len(cached), cached=True)
+        return cached
+
+    documents = await _search_knowledge(knowledge, query, limit * 2, filters)
+    budgeter = context_budgeter or ContextBudgeter()
+    selected = budgeter.select_chunks(query, [document.content for document in documents], limit=limit)
+    results = [{**documents[index].to_dict(), "content": text} for index, text in selected]
+
+    if session is not None and session_manager is not None:
+        session.put_retrieval(cache_key, results, session_manager.max_retrievals)
+    if usage is not None:
+        usage.observe_retrieval(len(results), cached=False)
+    return results
+
+
+def _answer_embedder() -> BaseEmbedder:
+    """Embedder used to match questions against the canonical ones.
+
+    The knowledge base's embedder, unless it is the character-frequency one:
+    letter histograms of any two English questions are nearly identical, so
+    canonical questions are matched on hashed word n-grams instead.
+    """
+    global _matching_embedder
+
+    embedder = getattr(getattr(knowledge, "vector_db", None), "embedder", None)
+    if isinstance(embedder, BaseEmbedder) and embedder.name != LocalEmbedder.name:
+        return embedder
+    if _matching_embedder is None:
+        _matching_embedder = HashEmbedder()
+    return _matching_embedder
+
+
+async def _generate_answers(questions: list[str], embeddings: list[list[float]]) -> list[CanonicalAnswer]:
+    """Run the agent on each canonical question, skipping the ones that fail."""
+    entries = []
+    token = bypass_answer_index.set(True)
+    try:
+        for question, embedding in zip(questions, embeddings, strict=True):
+            context = {"context_id": f"canonical-{zlib.crc32(question.encode()):08x}", "caller_id": "precompute"}
+            try:
+                result = await _handle([{"role": "user", "content": question}], context)
+            except Exception as e:
+                print(f"⚠️  Failed to precompute an answer for '{question}': {e}")
+                continue
+            if _run_failed(result):
+                print(f"⚠️  Failed to precompute an answer for '{question}': {result.content}")
+                continue
+            entries.append(CanonicalAnswer(question, str(result.content), embedding, getattr(result, "model", None)))
+    finally:
+        bypass_answer_index.reset(token)
+    return entries
+
+
+async def precompute_answers() -> int:
+    """Answer the canonical questions for the current docs unless the index already has them.
+
+    Returns:
+        Number of answers generated
+    """
+    if answer_index is None or knowledge_digest is None:
+        return 0
+    embedder = _answer_embedder()
+    digest = knowledge_digest
+    if answer_index.is_current(digest, embedder.config()):
+        return 0
+
+    questions = answer_index.questions
+    print(f"🧮 Precomputing answers for {len(questions)} canonical question(s)...")
+    embeddings = await embedder.aget_embeddings(questions)
+    entries = await _generate_answers(questions, embeddings)
+    if digest != knowledge_digest:
+        return 0  # the docs changed meanwhile; the refresh started another run
+    answered = {entry.question for entry in entries}
+    answer_index.replace(digest, embedder.config(), entries, [q for q in questions if q not in answered])
+    print(f"✅ Precomputed {len(entries)} canonical answer(s)")
+    return len(entries)
+
+
+async def _precompute_answers_safely() -> None:
+    """Run precompute_answers in the background, reporting failures."""
+    try:
+        await precompute_answers()
+    except Exception as e:
+        print(f"⚠️  Precomputing canonical answers failed: {e}")
+
+
+def _ensure_answer_index() -> None:
+    """Create the canonical answer index once there is a knowledge base (env: ENABLE_CANONICAL_ANSWERS)."""
+    global answer_index
+
+    if answer_index is not None or knowledge is None:
+        return
+    if os.getenv("ENABLE_CANONICAL_ANSWERS", "true").lower() in ("true", "1", "yes"):
+        answer_index = AnswerIndex.from_env()
+        answer_index.load()
+
+
+def _start_answer_precompute() -> None:
+    """(Re)start answer precomputation in the background, replacing a run for older docs."""
+    global _precompute_task
+
+    if answer_index is None or knowledge_digest is None:
+        return
+    if _precompute_task is not None:
+        _precompute_task.cancel()
+    _precompute_task = asyncio.create_task(_precompute_answers_safely())
+
+
+async def _answer_from_index(messages: list[dict[str, str]]) -> Any:
+    """Serve the first turn of a conversation from the precomputed answers.
+
+    Args:
+        messages: List of message dictionaries with 'role' and 'content'
+
+    Returns:
+        A completed RunOutput, or None if the question is not a canonical one
+    """
+    if answer_index is None or not answer_index.entries or bypass_answer_index.get():
+        return None
+    turns = [message for message in messages if message.get("role") != "system"]
+    if len(turns) != 1 or turns[0].get("role") != "user":
+        return None  # follow-ups depend on the conversation so far
+
+    embedder = _answer_embedder()
+    question = str(turns[0].get("content", ""))
+    embedding = await embedder.aget_embedding(question)
+    match = answer_index.lookup(embedding, knowledge_digest, embedder.config(), question)
+    if match is None:
+        return None
+
+    from agno.run.agent import RunOutput
+    from agno.run.base import RunStatus
+
+    return RunOutput(content=match[0].answer, model=match[0].model, status=RunStatus.completed)
+
+
 def _setup_tools(mem0_api_key: str) -> list:
     """Set up all tools for the Agno Assist agent.
 
@@ -310,6 +1451,8 @@ def _setup_tools(mem0_api_key: str) -> list:
         raise APIKeyError(error_msg)
 
     try:
+        from agno.tools.mem0 import Mem0Tools
+
         mem0_tools = Mem0Tools(api_key=mem0_api_key)
         tools.append(mem0_tools)
         print("🧠 Mem0 memory system enabled for conversation context")
@@ -320,42 +1463,27 @@ def _setup_tools(mem0_api_key: str) -> list:
     return tools
 
 
-async def initialize_agent() -> None:
-    """Initialize the Agno Assist agent.
+def _create_agent(model: "OpenRouter", tools: list, search_knowledge: bool = True) -> "Agent":
+    """Create the documentation assistant agent on a model.
 
-    Sets up the knowledge base, LLM model, and tools, then creates the agent.
+    Args:
+        model: The LLM model
+        tools: Tools available to the agent
+        search_knowledge: Give the agent the knowledge search tool (off when references are supplied)
 
-    Raises:
-        APIKeyError: If required API keys are missing
+    Returns:
+        Agent instance
     """
-    global agent, knowledge
-
-    openrouter_api_key, mem0_api_key, model_name = _get_api_keys()
+    from agno.agent import Agent
 
-    if not openrouter_api_key:
-        error_msg = (
-            "OpenRouter API key is required. Set OPENROUTER_API_KEY environment variable.\n"
-            "Get an API key from: https://openrouter.ai/keys"
-        )
-        raise APIKeyError(error_msg)
-
-    if not mem0_api_key:
-        error_msg = (
-            "Mem0 API key is required. Set MEM0_API_KEY environment variable.\n"
-            "Get an API key from: https://app.mem0.ai/dashboard/api-keys"
-        )
-        raise APIKeyError(error_msg)
-
-    knowledge = await _setup_knowledge_base()
-
-    model = _create_llm_model(openrouter_api_key, model_name)
-    tools = _setup_tools(mem0_api_key)
-
-    agent = Agent(
+    return Agent(
         name="Agno Documentation Assistant",
         model=model,
         tools=tools,
         knowledge=knowledge,
+        knowledge_retriever=_retrieve_knowledge if knowledge else None,
+        search_knowledge=search_knowledge,
+        tool_hooks=[session_manager.memory_cache_hook] if session_manager is not None else None,
         description=dedent("""\
             You are Agno Assist, a helpful AI assistant specialized in the Agno framework documentation.
 
@@ -397,12 +1525,67 @@ async def initialize_agent() -> None:
         markdown=True,
     )
 
+
+async def initialize_agent() -> None:
+    """Initialize the Agno Assist agent.
+
+    Sets up the knowledge base, LLM model, and tools, then creates the agent.
+
+    Raises:
+        APIKeyError: If required API keys are missing
+    """
+    global agent, hedge_agent, knowledge, model_name, context_budgeter, session_manager, usage_accountant
+    global deadline_manager, answer_index
+
+    openrouter_api_key, mem0_api_key, model_name = _get_api_keys()
+
+    if not openrouter_api_key:
+        error_msg = (
+            "OpenRouter API key is required. Set OPENROUTER_API_KEY environment variable.\n"
+            "Get an API key from: https://openrouter.ai/keys"
+        )
+        raise APIKeyError(error_msg)
+
+    if not mem0_api_key:
+        error_msg = (
+            "Mem0 API key is required. Set MEM0_API_KEY environment variable.\n"
+            "Get an API key from: https://app.mem0.ai/dashboard/api-keys"
+        )
+        raise APIKeyError(error_msg)
+
+    knowledge = await _setup_knowledge_base()
+    context_budgeter = ContextBudgeter()
+    session_manager = SessionManager.from_env()
+    usage_accountant = UsageAccountant.from_env()
+    usage_accountant.start()
+
+    tools = _setup_tools(mem0_api_key)
+
+    deadline_manager = DeadlineManager(DeadlinePolicy.from_env())
+    policy = deadline_manager.policy
+    agent = _create_agent(_create_llm_model(openrouter_api_key, model_name, policy.default_timeout), tools)
+    if policy.hedge_model:
+        hedge_agent = _create_agent(
+            _create_llm_model(openrouter_api_key, policy.hedge_model, policy.default_timeout), tools
+        )
+
+    _ensure_answer_index()
+    _start_answer_precompute()
+    _start_knowledge_refresh()
+
     print(f"✅ Agno Assist agent initialized using {model_name}")
+    if hedge_agent:
+        print(f"🏁 Slow requests are hedged with {policy.hedge_model}")
     if knowledge:
         print("📚 Vector database enabled for documentation search (using local embeddings)")
     print("🧠 Conversation memory enabled via Mem0")
 
 
+def _run_failed(result: Any) -> bool:
+    """Check whether an Agno RunOutput reports an error (Agno returns model errors instead of raising)."""
+    return str(getattr(result, "status", "")).lower().endswith("error")
+
+
 async def run_agent(messages: list[dict[str, str]]) -> Any:
     """Run the agent with the given messages.
 
@@ -421,33 +1604,282 @@ async def run_agent(messages: list[dict[str, str]]) -> Any:
         error_msg = "Agent not initialized"
         raise RuntimeError(error_msg)
 
-    result = await agent.arun(messages)  # type: ignore[arg-type]
+    if (precomputed := await _answer_from_index(messages)) is not None:
+        if (usage := current_usage.get()) is not None:
+            usage.observe_run(precomputed)
+        return precomputed
+
+    session = current_session.get()
+    if context_budgeter and session is not None:
+        messages = session.build_prompt(messages, context_budgeter)
+    elif context_budgeter:
+        messages = context_budgeter.trim_messages(messages)
+
+    # Batch items come with their references already retrieved; hedging is left to interactive requests
+    primary, hedge = agent, hedge_agent
+    if (references := batch_references.get()) is not None and batch_agent is not None:
+        primary, hedge = batch_agent, None
+        messages = _with_references(messages, references)
+
+    if deadline_manager is not None:
+        secondary = partial(hedge.arun, messages) if hedge is not None else None
+        result = await deadline_manager.call(partial(primary.arun, messages), secondary, failed=_run_failed)
+    else:
+        result = await primary.arun(messages)  # type: ignore[arg-type]
+
+    if (usage := current_usage.get()) is not None:
+        usage.observe_run(result)
+
+    if context_budgeter:
+        metrics = getattr(result, "metrics", None)
+        input_tokens = getattr(metrics, "input_tokens", 0) or count_message_tokens(messages)
+        context_budgeter.observe_prompt_tokens(input_tokens)
     return result
 
 
-async def handler(messages: list[dict[str, str]]) -> Any:
-    """Handle incoming agent messages with lazy initialization.
+def _with_references(messages: list[dict[str, str]], references: list[dict[str, Any]]) -> list[dict[str, str]]:
+    """Append knowledge references to the last user message, formatted like Agno's own references."""
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].get("role") == "user" and references:
+            message = dict(messages[index])
+            message["content"] = (
+                f"{message.get('content', '')}\n\nUse the following references from the knowledge base if it helps:\n"
+                f"<references>\n{json.dumps(references, indent=2, default=str)}\n</references>"
+            )
+            return [*messages[:index], message, *messages[index + 1 :]]
+    return messages
+
+
+def _ensure_batch_agent() -> None:
+    """Create the agent answering batch items from prefetched references (it has no knowledge search tool)."""
+    global batch_agent
+
+    if batch_agent is None and agent is not None and knowledge is not None:
+        batch_agent = _create_agent(agent.model, list(agent.tools or []), search_knowledge=False)  # type: ignore[arg-type]
+
+
+async def _prefetch_batch(items: list[BatchItem], concurrency: int) -> dict[str, list[dict[str, Any]]]:
+    """Embed all questions in one pass and retrieve their references.
 
     Args:
-        messages: List of message dictionaries from the client
+        items: Batch items about to be answered
+        concurrency: Maximum concurrent knowledge searches
 
     Returns:
-        Agent response
+        References per item ID; items whose retrieval failed are left out
     """
+    if knowledge is None:
+        return {}
+    questions = [item.question for item in items if item.question]
+    embedder = getattr(knowledge.vector_db, "embedder", None)
+    if isinstance(embedder, BaseEmbedder):
+        await embedder.awarm_cache(questions)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    references: dict[str, list[dict[str, Any]]] = {}
+
+    async def prefetch(item: BatchItem) -> None:
+        try:
+            async with semaphore:
+                references[item.id] = await _retrieve_knowledge(item.question) or []
+        except Exception as e:
+            print(f"⚠️  Retrieval prefetch failed for {item.id}: {e}")
+
+    await asyncio.gather(*(prefetch(item) for item in items if item.question))
+    return references
+
+
+async def run_batch(
+    input_path: str | Path,
+    output_path: str | Path,
+    concurrency: int | None = None,
+    chunk_size: int | None = None,
+    resume: bool = True,
+) -> dict[str, int]:
+    """Answer every conversation in a JSONL file and stream the answers to a JSONL file.
+
+    Questions are processed in chunks: each chunk gets one embedding pass and
+    one round of knowledge searches up front, then its agent runs execute with
+    bounded concurrency. The retrieved references are put into the prompt of
+    an agent without the search tool, so every item is searched exactly once. Answers are written as they complete, so an
+    interrupted run resumes where it stopped (see agno_assist_agent.batch).
+
+    Args:
+        input_path: JSONL file of conversations
+        output_path: JSONL file receiving the answers (also the resume checkpoint)
+        concurrency: Maximum concurrent agent runs (env: BATCH_CONCURRENCY, default: 8)
+        chunk_size: Questions prefetched together (env: BATCH_CHUNK_SIZE, default: 256)
+        resume: Skip conversations already answered in output_path
+
+    Returns:
+        Counts of answered, failed and skipped conversations
+    """
+    concurrency = concurrency or int(os.getenv("BATCH_CONCURRENCY", "8"))
+    chunk_size = chunk_size or int(os.getenv("BATCH_CHUNK_SIZE", "256"))
+    await _ensure_initialized()
+    _ensure_batch_agent()
+
+    completed = load_completed(output_path) if resume else set()
+    counts = {"answered": 0, "failed": 0, "skipped": 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def answer(item: BatchItem, references: list[dict[str, Any]] | None, writer: BatchWriter) -> None:
+        started = time.perf_counter()
+        async with semaphore:
+            token = batch_references.set(references)
+            try:
+                # No context ID: batch items need no session and must not evict interactive ones
+                result = await _handle(item.messages, {"caller_id": "batch"})
+            except Exception as e:
+                record = {"id": item.id, "error": f"{type(e).__name__}: {e}"}
+            else:
+                content = getattr(result, "content", result)
+                if _run_failed(result):
+                    record = {"id": item.id, "error": str(content)}
+                else:
+                    record = {"id": item.id, "answer": content, "model": getattr(result, "model", None)}
+            finally:
+                batch_references.reset(token)
+        record["duration_s"] = round(time.perf_counter() - started, 3)
+        writer.write(record)
+        counts["failed" if "error" in record else "answered"] += 1
+
+    async def answer_chunk(chunk: list[BatchItem], writer: BatchWriter) -> None:
+        references = await _prefetch_batch(chunk, concurrency)
+        await asyncio.gather(*(answer(item, references.get(item.id), writer) for item in chunk))
+
+    with BatchWriter(output_path, append=resume) as writer:
+        chunk: list[BatchItem] = []
+        for item in read_batch_items(input_path):
+            if item.id in completed:
+                counts["skipped"] += 1
+                continue
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                await answer_chunk(chunk, writer)
+                chunk = []
+        if chunk:
+            await answer_chunk(chunk, writer)
+
+    print(f"📦 Batch finished: {counts['answered']} answered, {counts['failed']} failed, {counts['skipped']} skipped")
+    return counts
+
+
+def _queue_depths() -> dict[str, Any]:
+    """Depths of the in-process queues, reported in profiling runtime stats."""
+    depths: dict[str, Any] = {}
+    if isinstance(_embedding_executor, ThreadPoolExecutor):
+        depths["embedding_executor"] = _embedding_executor._work_queue.qsize()
+    embedder = getattr(getattr(knowledge, "vector_db", None), "embedder", None)
+    if isinstance(embedder, BaseEmbedder):
+        depths["embedding_batcher"] = embedder._batcher.depth()
+    if usage_accountant is not None:
+        depths["usage_pending"] = usage_accountant.stats()["pending"]
+    if session_manager is not None:
+        depths["sessions"] = len(session_manager)
+    return depths
+
+
+def _stats_gauge(component: str) -> Callable[[], Any]:
+    """Gauge reporting stats() of a component created by initialize_agent (None while it is not set up)."""
+    return lambda: instance.stats() if (instance := globals()[component]) is not None else None
+
+
+# Profiling gauges exposing the request-path metrics (GET /profiling and runtime-*.json)
+_STATS_GAUGES = {
+    "prompt_tokens": "context_budgeter",
+    "usage": "usage_accountant",
+    "deadlines": "deadline_manager",
+    "sessions": "session_manager",
+    "canonical_answers": "answer_index",
+}
+
+
+def _attach_profiler() -> None:
+    """Point the profiler at the serving loop and start it when ENABLE_PROFILING is set."""
+    profiler.attach_loop(asyncio.get_running_loop())
+    profiler.register_gauge("queues", _queue_depths)
+    profiler.register_gauge("loop_lag", loop_lag_monitor.stats)
+    for name, component in _STATS_GAUGES.items():
+        profiler.register_gauge(name, _stats_gauge(component))
+    if os.getenv("ENABLE_PROFILING", "false").lower() in ("true", "1", "yes"):
+        profiler.start()
+
+
+async def _ensure_initialized() -> None:
+    """Initialize the agent on first use (once, even with concurrent callers)."""
     global _initialized
 
     async with _init_lock:
         if not _initialized:
+            # Before initialization, so that a profile started from the environment covers ingestion
+            _attach_profiler()
             print("🔧 Initializing Agno Assist Agent...")
             await initialize_agent()
             _initialized = True
+            if os.getenv("ENABLE_LOOP_LAG_MONITOR", "true").lower() in ("true", "1", "yes"):
+                loop_lag_monitor.start()
 
-    return await run_agent(messages)
+
+async def handler(messages: list[dict[str, str]]) -> Any:
+    """Handle incoming agent messages with lazy initialization.
+
+    Bindu only accepts a `messages` parameter; the conversation's context ID and
+    the client's message metadata (caller, timeout) come from the Bindu task
+    being run.
+
+    Args:
+        messages: List of message dictionaries from the client
+
+    Returns:
+        Agent response
+    """
+    context = bindu_task_context()
+    await _ensure_initialized()
+    return await _handle(messages, context)
+
+
+async def _handle(messages: list[dict[str, str]], context: dict[str, Any] | None = None) -> Any:
+    """Run one request with its session, usage record and deadline (agent already initialized)."""
+    # Everything that can fail on client input runs before the session is taken
+    deadline = deadline_manager.deadline(context) if deadline_manager is not None else None
+    session_id = resolve_session_id(context)
+    session = session_manager.get(session_id) if session_manager is not None and session_id is not None else None
+    usage = RequestUsage(resolve_caller(context), model_name or "unknown") if usage_accountant is not None else None
+    token = current_session.set(session)
+    usage_token = current_usage.set(usage)
+    deadline_token = current_deadline.set(deadline)
+    started = time.perf_counter()
+    try:
+        return await run_agent(messages)
+    except Exception as e:
+        if usage is not None:
+            usage.status = "timeout" if isinstance(e, DeadlineExceeded) else "error"
+        raise
+    finally:
+        current_deadline.reset(deadline_token)
+        current_usage.reset(usage_token)
+        current_session.reset(token)
+        if session_manager is not None and session is not None:
+            session_manager.release(session)
+        if usage_accountant is not None and usage is not None:
+            usage_accountant.finish(usage, started)
 
 
 async def cleanup() -> None:
     """Clean up any resources."""
+    global _refresh_task, _precompute_task
+
     print("🧹 Cleaning up Agno Assist Agent resources...")
+    loop_lag_monitor.stop()
+    profiler.stop()
+    for task in (_refresh_task, _precompute_task):
+        if task is not None:
+            task.cancel()
+    _refresh_task = _precompute_task = None
+    if usage_accountant is not None:
+        await usage_accountant.stop()
+    _shutdown_embedding_executor()
     # LanceDB and SQLite connections are file-based and will close automatically
 
 
@@ -484,7 +1916,8 @@ def _display_configuration_info() -> None:
     if os.getenv("MEM0_API_KEY"):
         config_info.append("🧠 Memory: Conversation context enabled")
     if os.getenv("ENABLE_VECTOR_DB", "true").lower() in ("true", "1", "yes"):
-        config_info.append("📚 Vector DB: Documentation search enabled (local embeddings)")
+        embedder = os.getenv("EMBEDDER", LocalEmbedder.name)
+        config_info.append(f"📚 Vector DB: Documentation search enabled (local {embedder} embeddings)")
     else:
         config_info.append("📚 Vector DB: Disabled")
 
@@ -493,13 +1926,35 @@ def _display_configuration_info() -> None:
 
     print("=" * 60)
     print("Example queries:")
-    print("• 'What is Agno and how do I get started?'")
-    print("• 'How do I create an agent with tools?'")
-    print("• 'What vector databases does Agno support?'")
-    print("• 'Show me an example of a knowledge base implementation'")
+    for question in DEFAULT_CANONICAL_QUESTIONS:
+        print(f"• '{question}'")
     print("=" * 60)
 
 
+def _setup_profiling_controls() -> None:
+    """Let operators toggle profiling at runtime with SIGUSR2 or the admin route."""
+    import signal
+
+    if hasattr(signal, "SIGUSR2"):
+        profiler.install_signal_handler(signal.SIGUSR2)
+        print(f"🔬 Send SIGUSR2 to process {os.getpid()} to toggle profiling")
+    admin_port = os.getenv("PROFILE_ADMIN_PORT")
+    if admin_port:
+        profiler.serve_admin(
+            host=os.getenv("PROFILE_ADMIN_HOST", "127.0.0.1"),
+            port=int(admin_port),
+            token=os.getenv("PROFILE_ADMIN_TOKEN") or None,
+        )
+
+
+async def _run_batch_cli(input_path: str, output_path: str, concurrency: int | None, resume: bool) -> dict[str, int]:
+    """Run a batch and release resources in the same event loop."""
+    try:
+        return await run_batch(input_path, output_path, concurrency=concurrency, resume=resume)
+    finally:
+        await cleanup()
+
+
 def main() -> None:
     """Run the main entry point for the Agno Assist Agent."""
     parser = argparse.ArgumentParser(description="Agno Assist Agent - Documentation assistant using RAG")
@@ -533,15 +1988,51 @@ def main() -> None:
         default=os.getenv("VECTOR_DB_PATH", "tmp/lancedb"),
         help="Custom path for LanceDB (env: VECTOR_DB_PATH)",
     )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="INPUT.jsonl",
+        help="Answer the conversations in a JSONL file instead of starting the server",
+    )
+    parser.add_argument(
+        "--batch-output",
+        type=str,
+        metavar="OUTPUT.jsonl",
+        help="Where batch answers are written (default: <input>.answers.jsonl)",
+    )
+    parser.add_argument(
+        "--batch-concurrency",
+        type=int,
+        default=None,
+        help="Maximum concurrent agent runs in batch mode (env: BATCH_CONCURRENCY, default: 8)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Overwrite the batch output instead of skipping already answered conversations",
+    )
 
     args = parser.parse_args()
 
     _setup_environment_variables(args)
     _display_configuration_info()
 
+    if args.batch:
+        output_path = args.batch_output or str(Path(args.batch).with_suffix(".answers.jsonl"))
+        counts = asyncio.run(_run_batch_cli(args.batch, output_path, args.batch_concurrency, not args.no_resume))
+        print(f"📝 Answers written to {output_path}")
+        if counts["failed"]:
+            import sys
+
+            sys.exit(1)
+        return
+
     config = load_config()
+    _setup_profiling_controls()
 
     try:
+        from bindu.penguin.bindufy import bindufy
+
         print("\n🚀 Starting Agno Assist Agent server...")
         print(f"🌐 Access at: {config.get('deployment', {}).get('url', 'http://127.0.0.1:3773')}")
         bindufy(config, handler)
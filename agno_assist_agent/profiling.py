@@ -0,0 +1,425 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Runtime profiling - opt-in, toggled by a signal or a local admin route.
+
+While enabled, the profiler collects:
+
+- sampled stacks of every thread that is not parked in a wait primitive
+  (written as collapsed stacks, `cpu-*.folded`, which speedscope,
+  flamegraph.pl and similar viewers load directly)
+- event-loop blocks longer than a threshold, with the loop thread's stack
+  captured while it is blocked (`slow-callbacks-*.txt`)
+- tracemalloc snapshots around ingestion (`<label>-*-before/after.tracemalloc`,
+  loadable with tracemalloc.Snapshot.load, plus a `-top.txt` diff)
+- task counts and registered queue depths (`runtime-*.json`)
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+# Innermost frames of threads blocked in C waiting for work: lock waits, queue gets,
+# select() in an idle event loop or server, idle executor workers
+_IDLE_FRAMES = {
+    "threading.py": {"wait", "_wait_for_tstate_lock"},
+    "queue.py": {"get"},
+    "selectors.py": {"select"},
+    "socket.py": {"accept"},
+    os.path.join("concurrent", "futures", "thread.py"): {"_worker"},
+}
+
+
+def _is_idle(frame: FrameType) -> bool:
+    """Check whether a thread's innermost frame is a stdlib wait primitive."""
+    code = frame.f_code
+    return any(
+        code.co_name in functions and code.co_filename.endswith(os.sep + module)
+        for module, functions in _IDLE_FRAMES.items()
+    )
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Viewer-friendly name of a frame: function (file:line)."""
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _collapse(frame: FrameType | None) -> list[str]:
+    """Frames of a stack from the outermost to the innermost."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return labels[::-1]
+
+
+class StackSampler:
+    """Samples the stacks of all threads at a fixed interval.
+
+    Threads parked in a wait primitive (idle loops, executor workers, lock
+    waits) are skipped, so the profile shows where threads spend CPU time
+    rather than where they sleep. Waits outside these stdlib frames, such as
+    time.sleep or a blocking socket read, are still counted.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self.counts.clear()
+        self.samples = 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Sample the stacks of busy threads until stopped."""
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own and not _is_idle(frame):
+                    stack = [names.get(thread_id, str(thread_id)), *_collapse(frame)]
+                    self.counts[";".join(stack)] += 1
+            self.samples += 1
+
+    def write_folded(self, path: Path) -> None:
+        """Write samples as collapsed stacks ("frame;frame;frame count" per line)."""
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in self.counts.most_common()))
+
+
+class SlowCallbackDetector:
+    """Detects event-loop blocks and captures the loop thread's stack while it is blocked.
+
+    A watchdog thread posts a no-op callback to the loop; if it has not run
+    within the threshold, the loop is busy and the loop thread's current stack
+    is recorded.
+    """
+
+    def __init__(self, threshold_ms: float = 100.0) -> None:
+        """Initialize the detector.
+
+        Args:
+            threshold_ms: Loop blocks longer than this are recorded
+        """
+        self.threshold = threshold_ms / 1000
+        self.events: list[dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        """Start watching a loop.
+
+        Args:
+            loop: The event loop serving requests
+            loop_thread_id: threading.get_ident() of the thread running the loop
+        """
+        self.events = []
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(loop, loop_thread_id), name="profiler-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        """Watchdog loop."""
+        while not self._stop.is_set() and not loop.is_closed():
+            ran = threading.Event()
+            posted = time.monotonic()
+            try:
+                loop.call_soon_threadsafe(ran.set)
+            except RuntimeError:
+                return  # loop closed
+            if not ran.wait(self.threshold):
+                frame = sys._current_frames().get(loop_thread_id)
+                stack = traceback.format_stack(frame) if frame is not None else []
+                while not ran.wait(0.05) and not self._stop.is_set():
+                    pass
+                self.events.append({
+                    "at": time.time(),
+                    "blocked_ms": round((time.monotonic() - posted) * 1000, 1),
+                    "stack": stack,
+                })
+            self._stop.wait(self.threshold / 2)
+
+    def write_report(self, path: Path) -> None:
+        """Write blocked intervals and their stacks, longest first."""
+        lines = []
+        for event in sorted(self.events, key=lambda event: event["blocked_ms"], reverse=True):
+            started = time.strftime("%H:%M:%S", time.localtime(event["at"]))
+            lines.append(f"=== loop blocked {event['blocked_ms']} ms (ended {started}) ===\n")
+            lines.extend(event["stack"])
+            lines.append("\n")
+        path.write_text("".join(lines) or "No event-loop blocks above the threshold.\n")
+
+
+class Profiler:
+    """Runtime profiling switch combining the sampler, slow-callback detector and memory snapshots."""
+
+    def __init__(
+        self, output_dir: str | Path = "tmp/profiles", sample_interval_ms: float = 10.0, slow_callback_ms: float = 100.0
+    ) -> None:
+        """Initialize the profiler (nothing runs until start()).
+
+        Args:
+            output_dir: Directory receiving profile files
+            sample_interval_ms: Stack sampling interval
+            slow_callback_ms: Event-loop block threshold
+        """
+        self.output_dir = Path(output_dir)
+        self.sampler = StackSampler(sample_interval_ms / 1000)
+        self.slow_callbacks = SlowCallbackDetector(slow_callback_ms)
+        self.gauges: dict[str, Callable[[], Any]] = {}
+        self.enabled = False
+        self._started_at = 0.0
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        """Create a profiler from PROFILE_* environment variables.
+
+        Returns:
+            Profiler instance
+        """
+        return cls(
+            output_dir=os.getenv("PROFILE_DIR", "tmp/profiles"),
+            sample_interval_ms=float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "10")),
+            slow_callback_ms=float(os.getenv("PROFILE_SLOW_CALLBACK_MS", "100")),
+        )
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Remember the event loop to watch; call from the loop's thread."""
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+
+    def register_gauge(self, name: str, gauge: Callable[[], Any]) -> None:
+        """Register a callable reporting a queue depth or other value for runtime stats."""
+        self.gauges[name] = gauge
+
+    def start(self) -> None:
+        """Start profiling (no-op if already running)."""
+        with self._lock:
+            if self.enabled:
+                return
+            self.enabled = True
+            self._started_at = time.time()
+            self.sampler.start()
+            if self._loop is not None and self._loop_thread_id is not None and not self._loop.is_closed():
+                self.slow_callbacks.start(self._loop, self._loop_thread_id)
+        print(f"🔬 Profiling started (output: {self.output_dir})")
+
+    def stop(self) -> list[Path]:
+        """Stop profiling and write the collected profiles.
+
+        Returns:
+            Paths of the written files
+        """
+        with self._lock:
+            if not self.enabled:
+                return []
+            self.enabled = False
+            self.sampler.stop()
+            self.slow_callbacks.stop()
+
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(self._started_at))
+            paths = [
+                self.output_dir / f"cpu-{stamp}.folded",
+                self.output_dir / f"slow-callbacks-{stamp}.txt",
+                self.output_dir / f"runtime-{stamp}.json",
+            ]
+            self.sampler.write_folded(paths[0])
+            self.slow_callbacks.write_report(paths[1])
+            paths[2].write_text(json.dumps(self.runtime_stats(), indent=2, default=str))
+        print(f"🔬 Profiling stopped, wrote {', '.join(path.name for path in paths)}")
+        return paths
+
+    def toggle(self) -> bool:
+        """Start profiling if it is stopped, otherwise stop it.
+
+        Returns:
+            Whether profiling is now enabled
+        """
+        if self.enabled:
+            self.stop()
+        else:
+            self.start()
+        return self.enabled
+
+    @contextmanager
+    def trace_memory(self, label: str) -> Iterator[None]:
+        """Take tracemalloc snapshots around a block while profiling is enabled.
+
+        Args:
+            label: Name used for the snapshot files (e.g. "ingestion")
+        """
+        if not self.enabled:
+            yield
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(25)
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            stamp = time.strftime("%Y%m%dT%H%M%S")
+            before.dump(str(self.output_dir / f"{label}-{stamp}-before.tracemalloc"))
+            after.dump(str(self.output_dir / f"{label}-{stamp}-after.tracemalloc"))
+            top = after.compare_to(before, "lineno")[:25]
+            (self.output_dir / f"{label}-{stamp}-top.txt").write_text("".join(f"{stat}\n" for stat in top))
+
+    def runtime_stats(self) -> dict[str, Any]:
+        """Count asyncio tasks by coroutine and read the registered gauges.
+
+        Returns:
+            Dictionary with task counts and gauge values
+        """
+        tasks: Counter[str] = Counter()
+        if self._loop is not None and not self._loop.is_closed():
+            for task in asyncio.all_tasks(self._loop):
+                coro = task.get_coro()
+                tasks[getattr(coro, "__qualname__", type(coro).__name__)] += 1
+
+        gauges = {}
+        for name, gauge in self.gauges.items():
+            try:
+                gauges[name] = gauge()
+            except Exception as e:
+                gauges[name] = f"error: {e}"
+        return {
+            "profiling": self.enabled,
+            "tasks_total": sum(tasks.values()),
+            "tasks": dict(tasks.most_common()),
+            "threads": threading.active_count(),
+            "gauges": gauges,
+            "slow_callbacks": len(self.slow_callbacks.events),
+        }
+
+    def install_signal_handler(self, signum: int) -> None:
+        """Toggle profiling when the process receives a signal (call from the main thread).
+
+        The toggle runs in a short-lived thread: stopping writes files, and the
+        interrupted main thread may be holding the profiler lock.
+
+        Args:
+            signum: The signal, e.g. signal.SIGUSR2 where the platform has it
+        """
+        signal.signal(signum, lambda *_: threading.Thread(target=self.toggle, daemon=True).start())
+
+    def admin_action(self, method: str, path: str) -> tuple[int, dict[str, Any]]:
+        """Route an admin request.
+
+        Routes: GET /profiling (status and runtime stats) and
+        POST /profiling/start, /profiling/stop, /profiling/toggle.
+
+        Args:
+            method: HTTP method
+            path: Request path
+
+        Returns:
+            HTTP status and JSON payload
+        """
+        route = (method, path.rstrip("/"))
+        if route == ("GET", "/profiling"):
+            return 200, self.runtime_stats()
+        if route == ("POST", "/profiling/start"):
+            self.start()
+            return 200, {"profiling": True}
+        if route == ("POST", "/profiling/stop"):
+            return 200, {"profiling": False, "files": [str(path) for path in self.stop()]}
+        if route == ("POST", "/profiling/toggle"):
+            return 200, {"profiling": self.toggle()}
+        return 404, {"error": "not found"}
+
+    def serve_admin(self, host: str = "127.0.0.1", port: int = 0, token: str | None = None) -> "ThreadingHTTPServer":
+        """Serve the admin route (see admin_action) in a daemon thread.
+
+        Args:
+            host: Interface to bind (keep it local)
+            port: Port to bind (0 picks a free one)
+            token: Optional bearer token required on every request
+
+        Returns:
+            The running server
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        profiler = self
+
+        class AdminHandler(BaseHTTPRequestHandler):
+            def _handle(self) -> None:
+                if token and self.headers.get("Authorization") != f"Bearer {token}":
+                    status, payload = 401, {"error": "unauthorized"}
+                else:
+                    status, payload = profiler.admin_action(self.command, self.path)
+                body = json.dumps(payload, default=str).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), AdminHandler)
+        threading.Thread(target=server.serve_forever, name="profiler-admin", daemon=True).start()
+        print(f"🔬 Profiling admin route at http://{host}:{server.server_address[1]}/profiling")
+        return server
@@ -0,0 +1,331 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Per-session state - history window, cached retrievals and memory lookups in a bounded LRU."""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from agno_assist_agent.context import ContextBudgeter, count_message_tokens
+
+# Mem0 tool calls that only read memories (cached) and that change them (invalidate the cache)
+MEMORY_READ_TOOLS = frozenset({"search_memory", "get_all_memories"})
+MEMORY_WRITE_TOOLS = frozenset({"add_memory", "delete_all_memories"})
+
+# Session serving the current request, set by the handler
+current_session: ContextVar["SessionState | None"] = ContextVar("current_session", default=None)
+
+
+def _hash_messages(hasher: Any, messages: list[dict[str, Any]]) -> Any:
+    """Feed messages into a hashlib hasher and return it."""
+    for message in messages:
+        hasher.update(f"{message.get('role')}\0{message.get('content')}\0".encode())
+    return hasher
+
+
+def _size_of(value: Any) -> int:
+    """Rough size in bytes of cached JSON-like data (strings dominate)."""
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sum(_size_of(key) + _size_of(item) for key, item in value.items()) + 64
+    if isinstance(value, list | tuple):
+        return sum(_size_of(item) for item in value) + 56
+    return sys.getsizeof(value)
+
+
+def bindu_task_context(max_depth: int = 32) -> dict[str, Any]:
+    """Find the Bindu task the current handler call is running for.
+
+    Bindu passes the agent function nothing but the message history. The task it
+    belongs to is a local of the worker coroutine awaiting the handler
+    (ManifestWorker.run_task, or the message/stream generator), so it is looked
+    up on the awaiting call stack.
+
+    Args:
+        max_depth: Number of calling frames searched
+
+    Returns:
+        Metadata of the task's latest user message plus its "context_id", or an
+        empty dict outside a Bindu task
+    """
+    frame = sys._getframe(1)
+    for _ in range(max_depth):
+        if frame is None:
+            break
+        task = frame.f_locals.get("task")
+        if isinstance(task, dict) and task.get("context_id"):
+            user_messages = [message for message in task.get("history") or [] if message.get("role") == "user"]
+            metadata = (user_messages[-1].get("metadata") if user_messages else None) or {}
+            return {**metadata, "context_id": str(task["context_id"])}
+        frame = frame.f_back
+    return {}
+
+
+def resolve_session_id(context: dict[str, Any] | None = None) -> str | None:
+    """Find the session a request belongs to.
+
+    Only a Bindu context/session ID identifies a conversation. Without one,
+    requests get no session: conversations that merely start alike must not
+    share a history window or cached memory lookups.
+
+    Args:
+        context: Optional Bindu session context
+
+    Returns:
+        Session ID, or None if the request carries no context ID
+    """
+    for key in ("context_id", "contextId", "session_id", "sessionId"):
+        if context and context.get(key):
+            return str(context[key])
+    return None
+
+
+@dataclass
+class SessionState:
+    """Lightweight state kept for one conversation."""
+
+    session_id: str
+    summary: list[str] = field(default_factory=list)
+    window: list[dict[str, Any]] = field(default_factory=list)
+    seen: int = 0
+    seen_digest: str = ""
+    history_tokens: int = 0
+    retrievals: OrderedDict[str, list[dict[str, Any]]] = field(default_factory=OrderedDict)
+    memory_lookups: dict[str, tuple[float, Any]] = field(default_factory=dict)
+    last_used: float = field(default_factory=time.monotonic)
+    size_bytes: int = 0
+
+    def reset(self) -> None:
+        """Forget the history window, e.g. when the client sent a different conversation."""
+        self.summary = []
+        self.window = []
+        self.seen = 0
+        self.seen_digest = ""
+        self.history_tokens = 0
+
+    def build_prompt(self, messages: list[dict[str, Any]], budgeter: ContextBudgeter) -> list[dict[str, Any]]:
+        """Fold the incoming messages into the session window and return the messages to send.
+
+        Clients re-send the full history on every turn. When it extends what this
+        session has already seen, only the new turns are processed: the window and
+        summary from earlier turns are reused instead of re-trimming everything.
+
+        Args:
+            messages: Full message history from the client
+            budgeter: Budgeter providing the history limits
+
+        Returns:
+            System messages, a summary of dropped turns (if any) and the kept window
+        """
+        system = [message for message in messages if message.get("role") == "system"]
+        turns = [message for message in messages if message.get("role") != "system"]
+
+        # One pass over the history verifies the seen prefix and extends the digest
+        hasher = hashlib.sha256()
+        if self.seen:
+            _hash_messages(hasher, turns[: self.seen])
+            if len(turns) < self.seen or hasher.hexdigest() != self.seen_digest:
+                self.reset()
+                hasher = hashlib.sha256()
+        new_turns = turns[self.seen :]
+        _hash_messages(hasher, new_turns)
+        self.window.extend(new_turns)
+        self.history_tokens += count_message_tokens(new_turns)
+        budgeter.histograms["history_in"].observe(count_message_tokens(system) + self.history_tokens)
+
+        reserved = count_message_tokens(system) + (budgeter.budget.summary_tokens if self.summary else 0)
+        if count_message_tokens(self.window) > budgeter.budget.history_tokens - reserved:
+            dropped, self.window = budgeter.split_history(
+                self.window, count_message_tokens(system) + budgeter.budget.summary_tokens
+            )
+            self.summary = budgeter.summarize(dropped, self.summary)
+
+        self.seen = len(turns)
+        self.seen_digest = hasher.hexdigest()
+        summary = budgeter.summary_message(self.summary)
+        prompt = system + ([summary] if summary else []) + self.window
+        budgeter.histograms["history_out"].observe(count_message_tokens(prompt))
+        return prompt
+
+    def get_retrieval(self, query: str) -> list[dict[str, Any]] | None:
+        """Return cached retrieval results for a query, if any."""
+        results = self.retrievals.get(query)
+        if results is not None:
+            self.retrievals.move_to_end(query)
+        return results
+
+    def put_retrieval(self, query: str, results: list[dict[str, Any]], max_entries: int) -> None:
+        """Cache retrieval results for a query, keeping at most max_entries queries."""
+        self.retrievals[query] = results
+        self.retrievals.move_to_end(query)
+        while len(self.retrievals) > max_entries:
+            self.retrievals.popitem(last=False)
+
+    def recompute_size(self) -> int:
+        """Recalculate and return the approximate memory held by this session."""
+        self.size_bytes = (
+            _size_of(self.window)
+            + _size_of(self.summary)
+            + _size_of(list(self.retrievals.items()))
+            + _size_of([value for _, value in self.memory_lookups.values()])
+        )
+        return self.size_bytes
+
+
+class SessionManager:
+    """Bounded LRU of SessionState with idle eviction and a total memory cap.
+
+    The model, knowledge base and tools stay shared across sessions; only the
+    lightweight per-conversation state lives here.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        idle_ttl: float = 1800.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_retrievals: int = 16,
+        memory_ttl: float = 60.0,
+    ) -> None:
+        """Initialize the session manager.
+
+        Args:
+            max_sessions: Maximum number of sessions kept
+            idle_ttl: Seconds after which an unused session is evicted
+            max_bytes: Approximate memory cap across all sessions
+            max_retrievals: Cached retrieval queries per session
+            memory_ttl: Seconds a cached memory lookup stays valid
+        """
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self.max_retrievals = max_retrievals
+        self.memory_ttl = memory_ttl
+        self.evictions = 0
+        self._sessions: OrderedDict[str, SessionState] = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "SessionManager":
+        """Create a session manager from SESSION_* environment variables.
+
+        Returns:
+            SessionManager instance
+        """
+        return cls(
+            max_sessions=int(os.getenv("SESSION_MAX_COUNT", "1000")),
+            idle_ttl=float(os.getenv("SESSION_IDLE_TTL", "1800")),
+            max_bytes=int(float(os.getenv("SESSION_MAX_MB", "64")) * 1024 * 1024),
+            max_retrievals=int(os.getenv("SESSION_MAX_RETRIEVALS", "16")),
+            memory_ttl=float(os.getenv("SESSION_MEMORY_TTL", "60")),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of live sessions."""
+        return len(self._sessions)
+
+    @property
+    def total_bytes(self) -> int:
+        """Approximate memory held by all sessions."""
+        return sum(session.size_bytes for session in self._sessions.values())
+
+    def get(self, session_id: str) -> SessionState:
+        """Get (or create) a session and mark it as most recently used.
+
+        Args:
+            session_id: Session ID from resolve_session_id()
+
+        Returns:
+            The session state
+        """
+        self.evict_idle()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = SessionState(session_id)
+        self._sessions.move_to_end(session_id)
+        session.last_used = time.monotonic()
+        self._enforce_limits(keep=session_id)
+        return session
+
+    def release(self, session: SessionState) -> None:
+        """Update a session's size after a request and enforce the memory cap.
+
+        Args:
+            session: The session used by the finished request
+        """
+        session.recompute_size()
+        self._enforce_limits(keep=session.session_id)
+
+    def evict_idle(self) -> None:
+        """Drop sessions unused for longer than idle_ttl."""
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used >= cutoff:
+                break
+            del self._sessions[session_id]
+            self.evictions += 1
+
+    def _enforce_limits(self, keep: str) -> None:
+        """Evict least recently used sessions until count and memory limits hold."""
+        total = self.total_bytes
+        while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions or total > self.max_bytes):
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                break
+            total -= self._sessions.pop(session_id).size_bytes
+            self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return session counts and memory usage.
+
+        Returns:
+            Dictionary of session manager metrics
+        """
+        return {"sessions": len(self._sessions), "bytes": self.total_bytes, "evictions": self.evictions}
+
+    async def memory_cache_hook(self, function_name: str, function_call: Any, arguments: dict[str, Any]) -> Any:
+        """Agno tool hook caching Mem0 memory lookups in the current session.
+
+        Read-only lookups are served from the session for memory_ttl seconds;
+        any memory write clears the session's cached lookups.
+
+        Args:
+            function_name: Name of the tool being called
+            function_call: The next function in the hook chain
+            arguments: Tool call arguments
+
+        Returns:
+            The tool result
+        """
+        session = current_session.get()
+        key = f"{function_name}:{json.dumps(arguments, sort_keys=True, default=str)}"
+        if session is not None and function_name in MEMORY_READ_TOOLS:
+            cached = session.memory_lookups.get(key)
+            if cached and time.monotonic() - cached[0] < self.memory_ttl:
+                return cached[1]
+
+        result = function_call(**arguments)
+        if inspect.isawaitable(result):
+            result = await result
+
+        if session is not None:
+            if function_name in MEMORY_READ_TOOLS:
+                session.memory_lookups[key] = (time.monotonic(), result)
+            elif function_name in MEMORY_WRITE_TOOLS:
+                session.memory_lookups.clear()
+        return result
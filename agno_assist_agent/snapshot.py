@@ -0,0 +1,201 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Knowledge base snapshots - versioned, checksummed bundles of an ingested LanceDB table.
+
+Layout of a snapshot root:
+
+    CURRENT                       name of the active version
+    <version>/manifest.json       format version, embedder config, content manifest, file checksums
+    <version>/data/<table>.lance  LanceDB table including its full-text index
+
+A pod with a valid snapshot serves LanceDB straight from `<version>/data`
+instead of downloading and embedding the documentation again.
+"""
+
+import hashlib
+import json
+import mmap
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+CURRENT_NAME = "CURRENT"
+
+# Tantivy creates lock files even when only reading; they are not part of the data
+LOCK_SUFFIX = ".lock"
+
+# Older versions kept next to CURRENT so in-flight readers of a replaced snapshot keep working
+_KEEP_VERSIONS = 2
+
+
+class SnapshotError(RuntimeError):
+    """Exception raised when a snapshot is missing, stale or corrupt."""
+
+
+def _file_sha256(path: Path) -> str:
+    """Checksum a file through a read-only memory map."""
+    with open(path, "rb") as f:
+        if path.stat().st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+def _checksum_files(data_dir: Path) -> dict[str, dict[str, Any]]:
+    """Checksum every file under data_dir, keyed by relative path (lock files are skipped)."""
+    return {
+        path.relative_to(data_dir).as_posix(): {"size": path.stat().st_size, "sha256": _file_sha256(path)}
+        for path in sorted(data_dir.rglob("*"))
+        if path.is_file() and path.suffix != LOCK_SUFFIX
+    }
+
+
+def _bundle_checksum(files: dict[str, dict[str, Any]]) -> str:
+    """Single checksum over all file checksums."""
+    hasher = hashlib.sha256()
+    for name, info in sorted(files.items()):
+        hasher.update(f"{name}\0{info['sha256']}\0".encode())
+    return hasher.hexdigest()
+
+
+def write_snapshot(
+    db_path: str | Path,
+    table_name: str,
+    snapshot_root: str | Path,
+    embedder_config: dict[str, Any],
+    contents: list[dict[str, Any]],
+) -> Path:
+    """Bundle an ingested LanceDB table as a new snapshot version and make it current.
+
+    The version is written to a temporary directory and renamed into place, and
+    CURRENT is replaced atomically, so readers never see a partial snapshot.
+
+    Args:
+        db_path: LanceDB directory containing `<table_name>.lance`
+        table_name: The knowledge table to bundle
+        snapshot_root: Directory holding snapshot versions
+        embedder_config: Embedder description; restores require an exact match
+        contents: Manifest of the ingested content (name, url, hashes, ...)
+
+    Returns:
+        Path of the new snapshot version
+
+    Raises:
+        SnapshotError: If the table does not exist
+    """
+    table_dir = Path(db_path) / f"{table_name}.lance"
+    if not table_dir.is_dir():
+        error_msg = f"LanceDB table not found: {table_dir}"
+        raise SnapshotError(error_msg)
+
+    root = Path(snapshot_root)
+    root.mkdir(parents=True, exist_ok=True)
+    staging = root / f".staging-{time.time_ns()}"
+    shutil.copytree(table_dir, staging / "data" / table_dir.name, ignore=shutil.ignore_patterns(f"*{LOCK_SUFFIX}"))
+
+    files = _checksum_files(staging / "data")
+    checksum = _bundle_checksum(files)
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "created_at": time.time(),
+        "table_name": table_name,
+        "embedder": embedder_config,
+        "contents": contents,
+        "files": files,
+        "checksum": checksum,
+    }
+    (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{checksum[:12]}"
+    version_dir = root / version
+    if version_dir.exists():
+        shutil.rmtree(version_dir)
+    staging.rename(version_dir)
+
+    current_tmp = root / f".{CURRENT_NAME}.tmp"
+    current_tmp.write_text(version)
+    current_tmp.replace(root / CURRENT_NAME)
+
+    _prune_versions(root, keep=version)
+    return version_dir
+
+
+def _prune_versions(root: Path, keep: str) -> None:
+    """Remove all but the newest snapshot versions (always keeping `keep`)."""
+    versions = sorted(
+        (path for path in root.iterdir() if path.is_dir() and not path.name.startswith(".")),
+        key=lambda path: path.name,
+        reverse=True,
+    )
+    for path in versions[_KEEP_VERSIONS:]:
+        if path.name != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def read_manifest(snapshot_root: str | Path) -> tuple[Path, dict[str, Any]]:
+    """Read the manifest of the current snapshot version.
+
+    Args:
+        snapshot_root: Directory holding snapshot versions
+
+    Returns:
+        Tuple of (version directory, manifest)
+
+    Raises:
+        SnapshotError: If there is no readable current snapshot
+    """
+    root = Path(snapshot_root)
+    try:
+        version_dir = root / (root / CURRENT_NAME).read_text().strip()
+        manifest = json.loads((version_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError) as e:
+        error_msg = f"No readable snapshot in {root}: {e}"
+        raise SnapshotError(error_msg) from e
+    return version_dir, manifest
+
+
+def load_snapshot(snapshot_root: str | Path, table_name: str, embedder_config: dict[str, Any]) -> Path:
+    """Validate the current snapshot and return the LanceDB directory to serve from.
+
+    Every file is checksummed through a memory map and compared with the manifest.
+
+    Args:
+        snapshot_root: Directory holding snapshot versions
+        table_name: The knowledge table expected in the snapshot
+        embedder_config: Config of the embedder that will query the table
+
+    Returns:
+        LanceDB directory (use as the LanceDb uri)
+
+    Raises:
+        SnapshotError: If the snapshot is missing, was built differently, or fails verification
+    """
+    version_dir, manifest = read_manifest(snapshot_root)
+
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        error_msg = f"Snapshot format {manifest.get('format_version')} != {SNAPSHOT_FORMAT_VERSION}"
+        raise SnapshotError(error_msg)
+    if manifest.get("table_name") != table_name:
+        error_msg = f"Snapshot is for table {manifest.get('table_name')}, not {table_name}"
+        raise SnapshotError(error_msg)
+    if manifest.get("embedder") != embedder_config:
+        error_msg = f"Snapshot was built with embedder {manifest.get('embedder')}, not {embedder_config}"
+        raise SnapshotError(error_msg)
+
+    data_dir = version_dir / "data"
+    files = _checksum_files(data_dir) if data_dir.is_dir() else {}
+    if files != manifest.get("files") or _bundle_checksum(files) != manifest.get("checksum"):
+        error_msg = f"Snapshot {version_dir.name} failed checksum verification"
+        raise SnapshotError(error_msg)
+
+    return data_dir
@@ -0,0 +1,236 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Source fetching - documentation downloads backed by an on-disk mirror.
+
+Every successful download is kept as the last good copy in the mirror
+directory, together with its validators:
+
+    <name>-<urlhash>.txt     raw body of the last good response
+    <name>-<urlhash>.json    url, ETag, Last-Modified, sha256, fetch time
+
+Refreshes use conditional GETs (If-None-Match / If-Modified-Since), so an
+unchanged document costs a 304. Transfers are compressed (gzip, and brotli
+when the `brotli` package is installed), and every request has a timeout
+and a bounded number of retries with exponential backoff.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+# Responses worth retrying; anything else is a definite answer
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class SourceFetchError(RuntimeError):
+    """Exception raised when a source cannot be fetched and has no mirror."""
+
+
+@dataclass
+class SourceDocument:
+    """A fetched (or mirrored) source document."""
+
+    url: str
+    content: bytes
+    sha256: str
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+    from_mirror: bool = False
+
+    @property
+    def text(self) -> str:
+        """Document body decoded as UTF-8."""
+        return self.content.decode("utf-8", errors="replace")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file through a temporary file and rename, so readers never see partial data."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+class SourceFetcher:
+    """Fetches one URL with conditional GET, retries and an on-disk mirror."""
+
+    def __init__(
+        self,
+        url: str,
+        mirror_dir: str | Path,
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+    ) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            url: The document URL
+            mirror_dir: Directory holding the last good copy
+            timeout: Connect/read timeout per attempt in seconds
+            retries: Extra attempts after a failed one
+            backoff: Delay before the first retry, doubled for every further retry
+        """
+        self.url = url
+        self.mirror_dir = Path(mirror_dir)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        name = Path(urlparse(url).path).stem or "source"
+        stem = f"{name}-{hashlib.sha256(url.encode()).hexdigest()[:12]}"
+        self.body_path = self.mirror_dir / f"{stem}.txt"
+        self.meta_path = self.mirror_dir / f"{stem}.json"
+
+    @classmethod
+    def from_env(cls, url: str) -> "SourceFetcher":
+        """Create a fetcher configured from SOURCE_* environment variables.
+
+        Args:
+            url: The document URL
+
+        Returns:
+            SourceFetcher instance
+        """
+        return cls(
+            url,
+            mirror_dir=os.getenv("SOURCE_MIRROR_PATH", "tmp/sources"),
+            timeout=float(os.getenv("SOURCE_TIMEOUT", "10")),
+            retries=int(os.getenv("SOURCE_RETRIES", "3")),
+            backoff=float(os.getenv("SOURCE_RETRY_BACKOFF", "0.5")),
+        )
+
+    def read_mirror(self) -> SourceDocument | None:
+        """Read the last good copy, or None if there is none or it is damaged.
+
+        Returns:
+            The mirrored document
+        """
+        try:
+            meta = json.loads(self.meta_path.read_text())
+            content = self.body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != self.url or hashlib.sha256(content).hexdigest() != meta.get("sha256"):
+            return None
+        return SourceDocument(
+            url=self.url,
+            content=content,
+            sha256=meta["sha256"],
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            fetched_at=meta.get("fetched_at", 0.0),
+            from_mirror=True,
+        )
+
+    def _write_mirror(self, document: SourceDocument) -> None:
+        """Store a document as the last good copy (body first, so the metadata never points ahead)."""
+        self.mirror_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.body_path, document.content)
+        meta = {
+            "url": document.url,
+            "sha256": document.sha256,
+            "etag": document.etag,
+            "last_modified": document.last_modified,
+            "fetched_at": document.fetched_at,
+        }
+        _write_atomic(self.meta_path, json.dumps(meta, indent=2).encode())
+
+    def _request(self, headers: dict[str, str]) -> Any:
+        """GET the URL, retrying timeouts, connection errors and retryable statuses."""
+        import requests
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = requests.get(self.url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+            time.sleep(self.backoff * 2**attempt)
+        return None  # unreachable, the last attempt returns or raises
+
+    def fetch(self) -> SourceDocument:
+        """Download the document, revalidating the mirrored copy if there is one.
+
+        Returns:
+            The current document (from the mirror when the server answered 304)
+
+        Raises:
+            SourceFetchError: If the download fails after all retries
+        """
+        import requests
+        from requests.utils import DEFAULT_ACCEPT_ENCODING
+
+        mirrored = self.read_mirror()
+        headers = {"Accept-Encoding": DEFAULT_ACCEPT_ENCODING}
+        if mirrored and mirrored.etag:
+            headers["If-None-Match"] = mirrored.etag
+        if mirrored and mirrored.last_modified:
+            headers["If-Modified-Since"] = mirrored.last_modified
+
+        try:
+            response = self._request(headers)
+            if mirrored and response.status_code == 304:
+                mirrored.fetched_at = time.time()
+                self._write_mirror(mirrored)
+                return mirrored
+            response.raise_for_status()
+        except requests.RequestException as e:
+            error_msg = f"Failed to fetch {self.url}: {e}"
+            raise SourceFetchError(error_msg) from e
+
+        content = response.content
+        document = SourceDocument(
+            url=self.url,
+            content=content,
+            sha256=hashlib.sha256(content).hexdigest(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=time.time(),
+        )
+        self._write_mirror(document)
+        return document
+
+    async def load(self) -> SourceDocument:
+        """Get the document for startup without waiting on the network when possible.
+
+        Serves the mirrored copy immediately if there is one (a background
+        refresh should pick up changes); otherwise downloads it.
+
+        Returns:
+            The document
+
+        Raises:
+            SourceFetchError: If there is no mirror and the download fails
+        """
+        mirrored = await asyncio.to_thread(self.read_mirror)
+        if mirrored is not None:
+            return mirrored
+        return await asyncio.to_thread(self.fetch)
+
+    async def refresh(self) -> SourceDocument | None:
+        """Revalidate the document in a worker thread.
+
+        Returns:
+            The current document, or None if the source is unreachable
+        """
+        try:
+            return await asyncio.to_thread(self.fetch)
+        except SourceFetchError as e:
+            print(f"⚠️  {e}")
+            return None
@@ -0,0 +1,125 @@
+"""Recall and throughput benchmark for the local embedder backends.
+
+Usage:
+    python benchmarks/embedders.py [--backends charfreq,hash,onnx] [--docs 2000]
+
+The onnx backend is included when EMBEDDER_MODEL_PATH points at a local model
+directory (model.onnx + tokenizer.json) and onnxruntime/tokenizers are installed.
+"""
+
+import argparse
+import asyncio
+import time
+
+from agno_assist_agent.main import EMBEDDERS, BaseEmbedder, _shutdown_embedding_executor
+
+# (document, [queries that should retrieve it])
+CORPUS: list[tuple[str, list[str]]] = [
+    (
+        "Agno is a Python framework for building multi-agent systems with memory, knowledge and tools.",
+        ["What is Agno?", "Which language is the Agno framework written for?"],
+    ),
+    (
+        "Install Agno with pip install -U agno and set your model provider API key to get started.",
+        ["How do I install Agno?", "Getting started with the agno package"],
+    ),
+    (
+        "Give an agent tools by passing a list of toolkits, for example tools=[DuckDuckGoTools()].",
+        ["How do I create an agent with tools?", "Add a toolkit to my agent"],
+    ),
+    (
+        "Agno supports vector databases including LanceDB, PgVector, Qdrant, Pinecone and ChromaDB.",
+        ["What vector databases does Agno support?", "Can I use Qdrant or Pinecone for storage?"],
+    ),
+    (
+        "A Knowledge base loads documents, chunks them, embeds each chunk and stores it in a vector database.",
+        ["Show me an example of a knowledge base implementation", "How are documents chunked and embedded?"],
+    ),
+    (
+        "Hybrid search combines vector similarity with keyword full-text search and reranks the results.",
+        ["What is hybrid search?", "Combine keyword and semantic search"],
+    ),
+    (
+        "Teams let several agents collaborate; the team leader routes or coordinates tasks between members.",
+        ["How do multiple agents work together?", "What does a team leader do?"],
+    ),
+    (
+        "Workflows are deterministic Python programs that chain agents and steps with caching between runs.",
+        ["How do I build a deterministic pipeline of steps?", "What are workflows in Agno?"],
+    ),
+    (
+        "Agent memory stores user facts across sessions; session storage persists chat history in a database.",
+        ["How does an agent remember users between sessions?", "Where is chat history persisted?"],
+    ),
+    (
+        "Structured outputs are enabled by setting output_schema to a Pydantic model on the agent.",
+        ["How do I get a Pydantic model as the response?", "Return structured JSON output"],
+    ),
+    (
+        "Stream responses with agent.print_response(stream=True) or iterate over agent.run(stream=True).",
+        ["How can I stream the answer token by token?", "Enable streaming responses"],
+    ),
+    (
+        "Reasoning agents think step by step before answering; enable it with reasoning=True.",
+        ["How do I make the agent reason before it answers?", "Step by step thinking"],
+    ),
+]
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b, strict=True))
+
+
+def recall_at_k(embedder: BaseEmbedder, k: int) -> float:
+    """Fraction of queries whose source document ranks in the top k."""
+    documents = [document for document, _ in CORPUS]
+    document_vectors = embedder.get_embeddings(documents)
+    hits = total = 0
+    for expected, (_, queries) in enumerate(CORPUS):
+        for query in queries:
+            query_vector = embedder.get_embedding(query)
+            ranked = sorted(range(len(documents)), key=lambda i: -_cosine(query_vector, document_vectors[i]))
+            hits += expected in ranked[:k]
+            total += 1
+    return hits / total
+
+
+async def throughput(embedder: BaseEmbedder, num_docs: int) -> tuple[float, float]:
+    """Return (ingested docs/s, concurrent queries/s) through the async, pooled path."""
+    documents = [f"{CORPUS[i % len(CORPUS)][0]} #{i}" for i in range(num_docs)]
+    started = time.perf_counter()
+    await embedder.aget_embeddings(documents)
+    docs_per_second = num_docs / (time.perf_counter() - started)
+
+    queries = [f"{query} #{i}" for i in range(num_docs // 10) for query in CORPUS[i % len(CORPUS)][1]]
+    started = time.perf_counter()
+    await asyncio.gather(*(embedder.aget_embedding(query) for query in queries))
+    queries_per_second = len(queries) / (time.perf_counter() - started)
+    return docs_per_second, queries_per_second
+
+
+def main() -> None:
+    """Run the benchmark for each requested backend and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default=",".join(EMBEDDERS), help="Comma-separated embedder backends")
+    parser.add_argument("--docs", type=int, default=2000, help="Documents for the throughput run")
+    args = parser.parse_args()
+
+    rows = []
+    for backend in args.backends.split(","):
+        try:
+            embedder = EMBEDDERS[backend]()
+        except (ImportError, FileNotFoundError) as e:
+            print(f"⏭️  Skipping {backend}: {e}")
+            continue
+        docs_per_second, queries_per_second = asyncio.run(throughput(embedder, args.docs))
+        rows.append((backend, recall_at_k(embedder, 1), recall_at_k(embedder, 3), docs_per_second, queries_per_second))
+    _shutdown_embedding_executor()
+
+    print(f"\n{'backend':<10}{'recall@1':>10}{'recall@3':>10}{'docs/s':>12}{'queries/s':>12}")
+    for backend, recall_1, recall_3, docs_per_second, queries_per_second in rows:
+        print(f"{backend:<10}{recall_1:>10.2f}{recall_3:>10.2f}{docs_per_second:>12.0f}{queries_per_second:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Shared fixtures: offline agent and knowledge stubs, and calls through Bindu's worker."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+
+class StubAgent:
+    """Offline agent answering with the docs version and the question, recording every run."""
+
+    def __init__(self):
+        """Start at docs version "v1" with no delay, failures or recorded runs."""
+        self.version = "v1"
+        self.delay = 0.0
+        self.fail_on = set()
+        self.questions = []
+        self.prefetched = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def arun(self, messages):
+        """Answer the last message, failing for questions in fail_on."""
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            question, _, references = messages[-1]["content"].partition("\n\n")
+            self.questions.append(question)
+            self.prefetched.append(f"docs about {question}" in references)
+            if question in self.fail_on:
+                error_msg = "model failed"
+                raise RuntimeError(error_msg)
+            return SimpleNamespace(content=f"{self.version}: {question}", model="stub/model", status="completed")
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def stub_agent():
+    """Return an offline agent recording questions, concurrency and whether references were in the prompt."""
+    return StubAgent()
+
+
+@pytest.fixture
+def stub_knowledge():
+    """Return a factory for offline knowledge bases whose search embeds the query and returns one document."""
+
+    def create(embedder):
+        def search(query, max_results, filters=None):
+            embedder.get_embedding(query)
+            return [SimpleNamespace(content=f"docs about {query}", to_dict=lambda: {"name": "docs"})]
+
+        stub = MagicMock(max_results=3)
+        stub.vector_db.embedder = embedder
+        stub.search = MagicMock(side_effect=search)
+        return stub
+
+    return create
+
+
+@pytest.fixture
+def bindu_call():
+    """Call the handler the way Bindu's worker does, with the task holding the context ID and metadata."""
+
+    async def run_task(handler, messages, context_id, **metadata):
+        # bindu_task_context() finds this local, like ManifestWorker.run_task's `task`
+        task = {"context_id": context_id, "history": [{"role": "user", "metadata": metadata}]}  # noqa: F841
+        return await handler(messages)
+
+    return run_task
+
+
+@pytest.fixture
+def bindu_worker():
+    """Run the handler through Bindu's real ManifestWorker, skipping the test without Bindu."""
+    manifest_module = pytest.importorskip("bindu.penguin.manifest")
+    from bindu.server.storage.memory_storage import InMemoryStorage
+    from bindu.server.workers.manifest_worker import ManifestWorker
+
+    from agno_assist_agent.main import handler
+
+    manifest_module.validate_agent_function(handler)
+    manifest = manifest_module.create_manifest(
+        handler,
+        id=uuid4(),
+        did_extension=MagicMock(),
+        name="agno-assist",
+        description=None,
+        skills=None,
+        capabilities=None,
+        agent_trust=None,
+        version="1.0.0",
+        url="http://localhost:3773",
+        enable_system_message=False,
+    )
+    storage = InMemoryStorage()
+    worker = ManifestWorker(scheduler=MagicMock(), storage=storage, manifest=manifest)
+
+    async def run(text, context_id, **metadata):
+        message = {
+            "message_id": uuid4(),
+            "context_id": context_id,
+            "task_id": uuid4(),
+            "kind": "message",
+            "role": "user",
+            "parts": [{"kind": "text", "text": text}],
+            "metadata": metadata,
+        }
+        task = await storage.submit_task(context_id, message)
+        await worker.run_task({"task_id": task["id"], "context_id": context_id, "message": message})
+        return await storage.load_task(task["id"])
+
+    return run
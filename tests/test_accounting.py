@@ -0,0 +1,162 @@
+import json
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from agno_assist_agent.accounting import (
+    JsonlUsageSink,
+    RequestUsage,
+    SqliteUsageSink,
+    UsageAccountant,
+    create_usage_sink,
+    resolve_caller,
+)
+from agno_assist_agent.main import handler
+
+
+def _run_output(model="openai/gpt-4o", input_tokens=1000, output_tokens=200, tools=2):
+    metrics = SimpleNamespace(
+        input_tokens=input_tokens, output_tokens=output_tokens, cache_read_tokens=300, cache_write_tokens=0
+    )
+    return SimpleNamespace(model=model, metrics=metrics, tools=[object()] * tools)
+
+
+def test_resolve_caller():
+    """Test caller lookup in the Bindu context."""
+    assert resolve_caller({"user_id": "u-1"}) == "u-1"
+    assert resolve_caller({"context_id": "ctx"}) == "anonymous"
+    assert resolve_caller() == "anonymous"
+
+
+def test_accountant_aggregates_per_model_and_caller():
+    """Test that finished requests are priced and aggregated per model and per caller."""
+    accountant = UsageAccountant(prices={"openai/gpt-4o": {"input": 2.5, "output": 10.0}})
+    for caller, model in (("alice", "openai/gpt-4o"), ("alice", "other/model"), ("bob", "openai/gpt-4o")):
+        usage = RequestUsage(caller, "configured")
+        usage.observe_run(_run_output(model=model))
+        usage.observe_retrieval(3, cached=False)
+        accountant.finish(usage, started=0.0)
+
+    stats = accountant.stats()
+    gpt = stats["by_model"]["openai/gpt-4o"]
+    assert gpt["requests"] == 2
+    assert gpt["input_tokens"] == 2000
+    assert gpt["cache_read_tokens"] == 600
+    assert gpt["tool_calls"] == 4
+    assert gpt["cost_usd"] == pytest.approx(2 * (1000 * 2.5 + 200 * 10.0) / 1_000_000)
+    assert stats["by_model"]["other/model"]["cost_usd"] == 0.0
+    assert stats["by_caller"]["alice"]["requests"] == 2
+    assert stats["by_caller"]["bob"]["retrieved_documents"] == 3
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_jsonl_and_sqlite(tmp_path):
+    """Test that pending records are written to both sink kinds."""
+    for sink in (JsonlUsageSink(tmp_path / "usage.jsonl"), SqliteUsageSink(tmp_path / "usage.db")):
+        accountant = UsageAccountant(sink=sink)
+        accountant.finish(RequestUsage("alice", "m1", input_tokens=5), started=0.0)
+        accountant.finish(RequestUsage("bob", "m1", status="error"), started=0.0)
+
+        assert await accountant.flush() == 2
+        assert await accountant.flush() == 0
+
+    lines = [json.loads(line) for line in (tmp_path / "usage.jsonl").read_text().splitlines()]
+    assert [line["caller"] for line in lines] == ["alice", "bob"]
+    with sqlite3.connect(tmp_path / "usage.db") as conn:
+        rows = conn.execute("SELECT caller, input_tokens, status FROM request_usage").fetchall()
+    assert rows == [("alice", 5, "ok"), ("bob", 0, "error")]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_records():
+    """Test that records stay pending when the sink fails."""
+    sink = MagicMock()
+    sink.write.side_effect = OSError("disk full")
+    accountant = UsageAccountant(sink=sink)
+    accountant.finish(RequestUsage("alice", "m1"), started=0.0)
+
+    assert await accountant.flush() == 0
+    assert accountant.stats()["pending"] == 1
+
+
+def test_caller_totals_are_capped():
+    """Test that callers beyond max_callers are aggregated as "other" instead of growing the totals."""
+    accountant = UsageAccountant(max_callers=2)
+    for caller in ("alice", "bob", "carol", "dave", "alice"):
+        accountant.finish(RequestUsage(caller, "m1"), started=0.0)
+
+    by_caller = accountant.stats()["by_caller"]
+    assert sorted(by_caller) == ["alice", "bob", "other"]
+    assert by_caller["alice"]["requests"] == 2
+    assert by_caller["other"]["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pending_records_bounded_while_sink_fails():
+    """Test that a failing sink keeps only the newest max_pending records and counts the dropped ones."""
+    sink = MagicMock()
+    sink.write.side_effect = OSError("disk full")
+    accountant = UsageAccountant(sink=sink, max_pending=3)
+    for i in range(5):
+        accountant.finish(RequestUsage(f"caller-{i}", "m1"), started=0.0)
+        await accountant.flush()
+
+    stats = accountant.stats()
+    assert stats["pending"] == 3
+    assert stats["dropped"] == 2
+    assert [usage.caller for usage in accountant._pending] == ["caller-2", "caller-3", "caller-4"]
+
+
+def test_create_usage_sink():
+    """Test sink specs."""
+    assert create_usage_sink("none") is None
+    assert isinstance(create_usage_sink("jsonl:/tmp/u.jsonl"), JsonlUsageSink)
+    assert isinstance(create_usage_sink("sqlite:"), SqliteUsageSink)
+    with pytest.raises(ValueError, match="Unknown usage sink"):
+        create_usage_sink("kafka:topic")
+
+
+@pytest.mark.asyncio
+async def test_handler_records_usage(bindu_call):
+    """Test that every handler call, successful or not, is accounted."""
+    accountant = UsageAccountant()
+    mock_agent = MagicMock()
+    mock_agent.arun = AsyncMock(side_effect=[_run_output(), RuntimeError("upstream down")])
+
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.agent", mock_agent),
+        patch("agno_assist_agent.main.usage_accountant", accountant),
+    ):
+        await bindu_call(handler, [{"role": "user", "content": "Hi"}], "ctx-1", user_id="alice")
+        with pytest.raises(RuntimeError):
+            await bindu_call(handler, [{"role": "user", "content": "Hi again"}], "ctx-1", user_id="alice")
+
+    alice = accountant.stats()["by_caller"]["alice"]
+    assert alice["requests"] == 2
+    assert alice["errors"] == 1
+    assert alice["output_tokens"] == 200
+    assert alice["duration_s"] > 0
+
+
+@pytest.mark.asyncio
+async def test_bindu_worker_requests_counted_per_caller(bindu_worker):
+    """Test the real Bindu path: the caller comes from the client's message metadata."""
+    accountant = UsageAccountant()
+    mock_agent = MagicMock()
+    mock_agent.arun = AsyncMock(return_value=_run_output())
+
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.agent", mock_agent),
+        patch("agno_assist_agent.main.usage_accountant", accountant),
+    ):
+        await bindu_worker("What is Agno?", uuid4(), caller_id="alice")
+        await bindu_worker("What is Agno?", uuid4())
+
+    by_caller = accountant.stats()["by_caller"]
+    assert by_caller["alice"]["requests"] == 1
+    assert by_caller["anonymous"]["requests"] == 1
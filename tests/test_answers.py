@@ -0,0 +1,181 @@
+import asyncio
+import importlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agno_assist_agent.answers import (
+    DEFAULT_CANONICAL_QUESTIONS,
+    AnswerIndex,
+    CanonicalAnswer,
+    load_canonical_questions,
+)
+from agno_assist_agent.main import HashEmbedder, handler, precompute_answers, refresh_knowledge
+from agno_assist_agent.sources import SourceDocument
+
+CONFIG = {"backend": "hash", "dimensions": 64}
+
+
+def _ask(question):
+    return handler([{"role": "user", "content": question}])
+
+
+def test_lookup_threshold_and_version(tmp_path):
+    """Test that only close questions for the same docs and embedder are served, and the index persists."""
+    embedder = HashEmbedder(dimensions=64)
+    questions = ["What is Agno and how do I get started?", "What vector databases does Agno support?"]
+    index = AnswerIndex(tmp_path / "answers.json", questions, threshold=0.85)
+    index.replace(
+        "digest-1",
+        CONFIG,
+        [CanonicalAnswer(q, f"answer {i}", embedder.get_embedding(q)) for i, q in enumerate(questions)],
+    )
+
+    match = index.lookup(embedder.get_embedding("what is agno and how do I get started"), "digest-1", CONFIG)
+    assert match is not None
+    assert match[0].answer == "answer 0"
+    assert index.lookup(embedder.get_embedding("How do I deploy to AWS?"), "digest-1", CONFIG) is None
+    assert index.lookup(embedder.get_embedding(questions[1]), "digest-2", CONFIG) is None
+    assert index.lookup(embedder.get_embedding(questions[1]), "digest-1", {"backend": "onnx"}) is None
+    assert index.counts["hits"] == 1
+
+    reloaded = AnswerIndex(tmp_path / "answers.json", questions)
+    assert reloaded.load()
+    assert reloaded.is_current("digest-1", CONFIG)
+    assert not reloaded.is_current("digest-2", CONFIG)
+    assert not AnswerIndex(tmp_path / "answers.json", [*questions, "New question?"]).is_current("digest-1", CONFIG)
+    assert not AnswerIndex(tmp_path / "missing.json", questions).load()
+
+
+@pytest.mark.parametrize(
+    ("question", "canonical"),
+    [
+        ("Show me an example of a knowledge base implementation in TypeScript", DEFAULT_CANONICAL_QUESTIONS[3]),
+        ("What vector databases does Agno not support?", DEFAULT_CANONICAL_QUESTIONS[2]),
+        ("Which vector databases doesn't Agno support?", DEFAULT_CANONICAL_QUESTIONS[2]),
+        ("How do I create an agent without tools?", DEFAULT_CANONICAL_QUESTIONS[1]),
+    ],
+)
+def test_near_misses_not_served(tmp_path, question, canonical):
+    """Test that questions adding a content word or negation to a canonical one are not served its answer."""
+    embedder = HashEmbedder(dimensions=64)
+    index = AnswerIndex(tmp_path / "answers.json", [canonical], threshold=0.0)
+    index.replace("digest-1", CONFIG, [CanonicalAnswer(canonical, "answer", embedder.get_embedding(canonical))])
+    embedding = embedder.get_embedding(question)
+
+    assert index.lookup(embedding, "digest-1", CONFIG) is not None
+    assert index.lookup(embedding, "digest-1", CONFIG, question) is None
+    rephrased = canonical.lower().rstrip("?").replace("what vector", "which vector")
+    assert index.lookup(embedder.get_embedding(rephrased), "digest-1", CONFIG, rephrased) is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_questions_not_regenerated_on_restart(tmp_path, stub_agent, stub_knowledge):
+    """Test that a question whose answer fails does not make every start recompute the whole index."""
+    pytest.importorskip("agno")
+    embedder = HashEmbedder(dimensions=64)
+    questions = list(DEFAULT_CANONICAL_QUESTIONS)
+    failing = questions[1]
+
+    stub_agent.fail_on = {failing}
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.agent", stub_agent),
+        patch("agno_assist_agent.main.knowledge", stub_knowledge(embedder)),
+        patch("agno_assist_agent.main.knowledge_digest", "digest-1"),
+        patch("agno_assist_agent.main.answer_index", AnswerIndex(tmp_path / "answers.json", questions)),
+    ):
+        assert await precompute_answers() == len(questions) - 1
+
+        restarted = AnswerIndex(tmp_path / "answers.json", questions)
+        assert restarted.load()
+        assert restarted.failed == [failing]
+        with patch("agno_assist_agent.main.answer_index", restarted):
+            stub_agent.questions.clear()
+            assert await precompute_answers() == 0
+            assert stub_agent.questions == []
+
+        assert not restarted.is_current("digest-2", CONFIG)
+
+
+def test_load_canonical_questions(tmp_path):
+    """Test the questions file format and the default questions."""
+    path = tmp_path / "questions.txt"
+    path.write_text("# Top questions\nWhat is Agno?\n\nHow do I add memory?\nWhat is Agno?\n")
+
+    assert load_canonical_questions(path) == ["What is Agno?", "How do I add memory?"]
+    assert load_canonical_questions(None) == list(DEFAULT_CANONICAL_QUESTIONS)
+
+
+@pytest.mark.asyncio
+async def test_canonical_questions_served_from_index(tmp_path, stub_agent, stub_knowledge):
+    """Test precomputation and that matching first turns skip the agent while follow-ups do not."""
+    pytest.importorskip("agno")
+    embedder = HashEmbedder(dimensions=64)
+    index = AnswerIndex(tmp_path / "answers.json", list(DEFAULT_CANONICAL_QUESTIONS))
+
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.agent", stub_agent),
+        patch("agno_assist_agent.main.knowledge", stub_knowledge(embedder)),
+        patch("agno_assist_agent.main.knowledge_digest", "digest-1"),
+        patch("agno_assist_agent.main.answer_index", index),
+    ):
+        assert await precompute_answers() == len(DEFAULT_CANONICAL_QUESTIONS)
+        assert await precompute_answers() == 0
+        stub_agent.questions.clear()
+
+        result = await _ask("What vector databases does Agno support")
+        assert result.content == "v1: What vector databases does Agno support?"
+        assert stub_agent.questions == []
+
+        follow_up = [
+            {"role": "user", "content": "How do I create an agent?"},
+            {"role": "assistant", "content": "Use Agent(...)."},
+            {"role": "user", "content": "How do I create an agent with tools?"},
+        ]
+        await handler(follow_up)
+        await _ask("How do I stream responses?")
+        assert stub_agent.questions == ["How do I create an agent with tools?", "How do I stream responses?"]
+
+
+@pytest.mark.asyncio
+async def test_answers_regenerated_when_docs_change(tmp_path, stub_agent, stub_knowledge):
+    """Test that a docs refresh stops serving old answers and regenerates them for the new content."""
+    pytest.importorskip("agno")
+    main_module = importlib.import_module("agno_assist_agent.main")
+    embedder = HashEmbedder(dimensions=64)
+    index = AnswerIndex(tmp_path / "answers.json", ["What is Agno and how do I get started?"])
+    fetcher = MagicMock()
+    fetcher.refresh = AsyncMock(return_value=SourceDocument(url="http://docs", content=b"new docs", sha256="digest-2"))
+    regenerated = asyncio.Event()
+
+    stub_arun = stub_agent.arun
+
+    async def arun(messages):
+        result = await stub_arun(messages)
+        if stub_agent.version == "v2":
+            regenerated.set()
+        return result
+
+    stub_agent.arun = arun
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.agent", stub_agent),
+        patch("agno_assist_agent.main.knowledge", stub_knowledge(embedder)),
+        patch("agno_assist_agent.main.knowledge_digest", "digest-1"),
+        patch("agno_assist_agent.main.answer_index", index),
+        patch("agno_assist_agent.main.source_fetcher", fetcher),
+        patch("agno_assist_agent.main._build_knowledge", AsyncMock(return_value=stub_knowledge(embedder))),
+    ):
+        await precompute_answers()
+        assert (await _ask("What is Agno and how do I get started?")).content.startswith("v1:")
+
+        stub_agent.version = "v2"
+        assert await refresh_knowledge()
+        assert index.lookup(embedder.get_embedding("What is Agno?"), main_module.knowledge_digest, CONFIG) is None
+        await asyncio.wait_for(regenerated.wait(), timeout=2)
+        await main_module._precompute_task
+
+        assert index.digest == "digest-2"
+        assert (await _ask("What is Agno and how do I get started?")).content.startswith("v2:")
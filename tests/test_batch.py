@@ -0,0 +1,134 @@
+import importlib
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agno_assist_agent.batch import BatchWriter, load_completed, read_batch_items
+from agno_assist_agent.main import (
+    HashEmbedder,
+    _create_agent,
+    _create_llm_model,
+    _ensure_batch_agent,
+    main,
+    run_batch,
+)
+from agno_assist_agent.sessions import SessionManager
+
+
+def _write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_read_batch_items_accepts_messages_and_questions(tmp_path):
+    """Test both input shapes, default IDs and a clear error for bad lines."""
+    path = _write_jsonl(
+        tmp_path / "in.jsonl",
+        [{"id": "a", "messages": [{"role": "user", "content": "Hi"}]}, {"question": "What is Agno?"}],
+    )
+
+    items = list(read_batch_items(path))
+    assert [item.id for item in items] == ["a", "line-2"]
+    assert items[1].question == "What is Agno?"
+
+    path.write_text('{"id": "x"}\n')
+    with pytest.raises(ValueError, match=":1:"):
+        list(read_batch_items(path))
+
+
+def test_checkpoint_skips_answers_and_retries_errors(tmp_path):
+    """Test that answered IDs count as done, failed ones do not, and a torn last line is tolerated."""
+    path = tmp_path / "out.jsonl"
+    path.write_text('{"id": "1", "answer": "a"}\n{"id": "2", "error": "boom"}\n{"id": "3", "ans')
+
+    assert load_completed(path) == {"1"}
+    with BatchWriter(path) as writer:
+        writer.write({"id": "3", "answer": "c"})
+    assert load_completed(path) == {"1", "3"}
+
+
+@pytest.mark.asyncio
+async def test_run_batch_shares_embedding_pass_and_bounds_concurrency(tmp_path, stub_agent, stub_knowledge):
+    """Test that questions are embedded in one pass, searched once each and agent runs bounded."""
+    questions = [f"How do I use feature {i}?" for i in range(10)]
+    input_path = _write_jsonl(tmp_path / "in.jsonl", [{"id": i, "question": q} for i, q in enumerate(questions)])
+    embedder = HashEmbedder(dimensions=64)
+    stub_agent.delay = 0.01
+    sessions = SessionManager()
+    stub_agent.fail_on = {questions[3]}
+    knowledge = stub_knowledge(embedder)
+
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.agent", stub_agent),
+        patch("agno_assist_agent.main.batch_agent", stub_agent),
+        patch("agno_assist_agent.main.knowledge", knowledge),
+        patch("agno_assist_agent.main.session_manager", sessions),
+        patch.object(embedder, "_embed_batch", wraps=embedder._embed_batch) as embed_batch,
+    ):
+        counts = await run_batch(input_path, tmp_path / "out.jsonl", concurrency=3)
+    assert len(sessions) == 0
+
+    assert counts == {"answered": 9, "failed": 1, "skipped": 0}
+    assert embed_batch.call_count == 1
+    assert len(embed_batch.call_args.args[0]) == 10
+    assert stub_agent.max_in_flight == 3
+    assert all(stub_agent.prefetched)
+    assert knowledge.search.call_count == 10
+    records = {record["id"]: record for record in _read_jsonl(tmp_path / "out.jsonl")}
+    assert records["0"]["answer"] == f"v1: {questions[0]}"
+    assert "model failed" in records["3"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_run_batch_resumes_after_interruption(tmp_path, stub_agent):
+    """Test that a rerun only answers what is missing or failed."""
+    input_path = _write_jsonl(tmp_path / "in.jsonl", [{"id": i, "question": f"Question {i}"} for i in range(4)])
+    output_path = _write_jsonl(tmp_path / "out.jsonl", [{"id": "0", "answer": "done"}, {"id": "1", "error": "timeout"}])
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.agent", stub_agent),
+        patch("agno_assist_agent.main.knowledge", None),
+    ):
+        counts = await run_batch(input_path, output_path, chunk_size=2)
+
+    assert counts == {"answered": 3, "failed": 0, "skipped": 1}
+    assert load_completed(output_path) == {"0", "1", "2", "3"}
+
+
+def test_batch_agent_answers_without_search_tool(stub_knowledge):
+    """Test that the batch agent shares the agent's model and tools but cannot search on its own."""
+    pytest.importorskip("agno")
+    main_module = importlib.import_module("agno_assist_agent.main")
+    with patch("agno_assist_agent.main.knowledge", stub_knowledge(HashEmbedder(dimensions=64))):
+        live_agent = _create_agent(_create_llm_model("stub-key", "stub/model"), [])
+        with (
+            patch("agno_assist_agent.main.agent", live_agent),
+            patch("agno_assist_agent.main.batch_agent", None),
+        ):
+            _ensure_batch_agent()
+            batch = main_module.batch_agent
+
+    assert live_agent.search_knowledge is True
+    assert batch.search_knowledge is False
+    assert batch.model.id == "stub/model"
+
+
+def test_cli_batch_mode(tmp_path):
+    """Test that --batch runs the batch instead of starting the server."""
+    input_path = _write_jsonl(tmp_path / "faq.jsonl", [{"question": "What is Agno?"}])
+    argv = ["agno-assist", "--batch", str(input_path), "--batch-concurrency", "4"]
+
+    with (
+        patch("sys.argv", argv),
+        patch("agno_assist_agent.main.run_batch", new_callable=AsyncMock, return_value={"failed": 0}) as mock_batch,
+        patch("agno_assist_agent.main.cleanup", new_callable=AsyncMock),
+    ):
+        main()
+
+    mock_batch.assert_called_once_with(str(input_path), str(tmp_path / "faq.answers.jsonl"), concurrency=4, resume=True)
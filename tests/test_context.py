@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agno_assist_agent.context import (
+    ContextBudget,
+    ContextBudgeter,
+    TokenHistogram,
+    count_message_tokens,
+    count_tokens,
+    dedupe_chunks,
+    truncate_to_tokens,
+)
+from agno_assist_agent.main import _retrieve_knowledge, run_agent
+
+
+def _long_text(words: int, topic: str = "agent") -> str:
+    return " ".join(f"{topic}{i}" for i in range(words)) + "."
+
+
+def test_count_and_truncate_tokens():
+    """Test the token estimate and that truncation respects the limit."""
+    text = "Agno agents use tools. " * 50
+
+    assert count_tokens("") == 0
+    assert count_tokens(text) == len(text) // 4
+    truncated = truncate_to_tokens(text, 20)
+    assert count_tokens(truncated) <= 21
+    assert truncated.endswith("…")
+    assert truncate_to_tokens("short", 20) == "short"
+
+
+def test_dedupe_drops_overlapping_chunks():
+    """Test that a chunk contained in a higher-ranked chunk is dropped."""
+    base = "Agno supports LanceDB PgVector Qdrant Pinecone and ChromaDB as vector databases for knowledge"
+    chunks = [base + " with hybrid search.", base, "Teams let several agents collaborate on one task together."]
+
+    assert dedupe_chunks(chunks) == [0, 2]
+
+
+def test_select_chunks_respects_budget_and_relevance():
+    """Test that chunks are ranked by relevance and cut to the retrieval budget."""
+    budgeter = ContextBudgeter(ContextBudget(retrieval_tokens=300))
+    chunks = [_long_text(100, "misc"), "How to install agno with pip install agno.", _long_text(400, "filler")]
+
+    selected = budgeter.select_chunks("install agno", chunks)
+
+    assert selected[0] == (1, chunks[1])
+    assert sum(count_tokens(text) for _, text in selected) <= 300
+    assert budgeter.histograms["retrieval"].count == 1
+
+
+def test_trim_messages_keeps_recent_turns_and_summarizes_the_rest():
+    """Test that old turns are dropped and summarized when history is over budget."""
+    budgeter = ContextBudgeter(ContextBudget(max_tokens=1500, retrieval_tokens=500, keep_recent_messages=2))
+    messages = [{"role": "system", "content": "You are helpful."}]
+    for turn in range(10):
+        messages.append({"role": "user", "content": f"Question {turn}. " + _long_text(60)})
+        messages.append({"role": "assistant", "content": f"Answer {turn}. " + _long_text(60)})
+    messages.append({"role": "user", "content": "Latest question?"})
+
+    trimmed = budgeter.trim_messages(messages)
+
+    assert trimmed[0] == messages[0]
+    assert trimmed[1]["role"] == "system"
+    assert trimmed[1]["content"].startswith("Summary of earlier conversation")
+    assert trimmed[-2:] == messages[-2:]
+    assert count_message_tokens(trimmed) <= budgeter.budget.history_tokens
+
+
+def test_trim_messages_leaves_short_history_untouched():
+    """Test that history within budget is passed through unchanged."""
+    budgeter = ContextBudgeter()
+    messages = [{"role": "user", "content": "Hello"}]
+
+    assert budgeter.trim_messages(messages) is messages
+
+
+def test_token_histogram_buckets():
+    """Test histogram bucket assignment."""
+    histogram = TokenHistogram()
+    for tokens in (100, 256, 257, 50_000):
+        histogram.observe(tokens)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"]["le_256"] == 2
+    assert snapshot["buckets"]["le_512"] == 1
+    assert snapshot["buckets"]["le_inf"] == 1
+    assert snapshot["count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_retrieve_knowledge_dedupes_search_results():
+    """Test that the knowledge retriever drops duplicate chunks from search results."""
+    text = "Create an agent with tools by passing a list of toolkits to the Agent class constructor."
+    documents = [SimpleNamespace(content=c, to_dict=lambda c=c: {"name": "docs", "content": c}) for c in (text, text)]
+    mock_knowledge = MagicMock(max_results=5)
+    mock_knowledge.search = MagicMock(return_value=documents)
+
+    with patch("agno_assist_agent.main.knowledge", mock_knowledge):
+        results = await _retrieve_knowledge(query="agent tools", num_documents=3)
+
+    mock_knowledge.search.assert_called_once_with(query="agent tools", max_results=6, filters=None)
+    assert results == [{"name": "docs", "content": text}]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_trims_history_and_records_prompt_tokens():
+    """Test that run_agent sends trimmed history and records prompt tokens."""
+    budgeter = ContextBudgeter(ContextBudget(max_tokens=600, retrieval_tokens=300, keep_recent_messages=1))
+    messages = [{"role": "user", "content": _long_text(300)}, {"role": "user", "content": "Latest?"}]
+    mock_agent = MagicMock()
+    mock_agent.arun = AsyncMock(return_value=SimpleNamespace(metrics=SimpleNamespace(input_tokens=123)))
+
+    with (
+        patch("agno_assist_agent.main.agent", mock_agent),
+        patch("agno_assist_agent.main.context_budgeter", budgeter),
+    ):
+        await run_agent(messages)
+
+    sent = mock_agent.arun.call_args.args[0]
+    assert sent[-1] == messages[-1]
+    assert messages[0] not in sent
+    assert budgeter.histograms["prompt"].total == 123
@@ -0,0 +1,286 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agno_assist_agent.accounting import UsageAccountant
+from agno_assist_agent.deadlines import (
+    DeadlineExceeded,
+    DeadlineManager,
+    DeadlinePolicy,
+    LatencyTracker,
+    current_deadline,
+)
+from agno_assist_agent.main import _create_agent, _create_llm_model, handler
+from agno_assist_agent.sessions import SessionManager
+
+
+def _primed(policy: DeadlinePolicy, latency: float = 0.1, samples: int = 20) -> DeadlineManager:
+    manager = DeadlineManager(policy)
+    for _ in range(samples):
+        manager.tracker.observe(latency)
+    return manager
+
+
+async def _answer(value, delay):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_latency_percentiles():
+    """Test nearest-rank percentiles over the sliding window."""
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 201):
+        tracker.observe(ms / 1000)
+
+    assert len(tracker) == 100
+    assert tracker.percentile(50) == pytest.approx(0.150)
+    assert tracker.percentile(95) == pytest.approx(0.195)
+    assert LatencyTracker().percentile(95) is None
+
+
+def test_adaptive_timeout_and_client_deadline():
+    """Test that timeouts follow observed latency within bounds and honour a shorter client timeout."""
+    policy = DeadlinePolicy(default_timeout=120, min_timeout=2, timeout_multiplier=4, min_samples=20)
+
+    assert DeadlineManager(policy).timeout() == 120
+    assert _primed(policy, latency=3.0).timeout() == 12.0
+    assert _primed(policy, latency=0.1).timeout() == 2
+    assert _primed(policy, latency=60).timeout() == 120
+
+    manager = _primed(policy, latency=3.0)
+    assert manager.deadline({"timeout": 5}) - time.monotonic() == pytest.approx(5, abs=0.1)
+    for bad in ("soon", "nan", -1, [5]):
+        assert manager.deadline({"timeout": bad}) - time.monotonic() == pytest.approx(12, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_call_hedges_slow_primary_and_cancels_loser():
+    """Test that a call still pending past the hedge delay is raced against the secondary."""
+    manager = _primed(DeadlinePolicy(hedge_model="fast/model"), latency=0.05)
+    primary = asyncio.ensure_future(_answer("primary", 5))
+
+    started = time.perf_counter()
+    result = await manager.call(lambda: primary, lambda: _answer("secondary", 0.01))
+
+    assert result == "secondary"
+    assert time.perf_counter() - started < 1
+    await asyncio.sleep(0)
+    assert primary.cancelled()
+    assert manager.counts["hedged"] == manager.counts["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_call_does_not_hedge_fast_primary_or_without_samples():
+    """Test that fast calls and cold trackers do not fire hedges."""
+    warm = _primed(DeadlinePolicy(hedge_model="fast/model"), latency=0.5)
+    cold = DeadlineManager(DeadlinePolicy(hedge_model="fast/model"))
+
+    assert await warm.call(lambda: _answer("primary", 0.01), lambda: _answer("secondary", 0)) == "primary"
+    assert await cold.call(lambda: _answer("primary", 0.2), lambda: _answer("secondary", 0)) == "primary"
+    assert warm.counts["hedged"] == cold.counts["hedged"] == 0
+    assert len(warm.tracker) == 21
+
+
+@pytest.mark.asyncio
+async def test_call_waits_for_other_call_when_one_fails():
+    """Test that a failed call does not win while the other one is still running."""
+    manager = _primed(DeadlinePolicy(hedge_model="fast/model"), latency=0.01)
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        return "error"
+
+    result = await manager.call(failing, lambda: _answer("secondary", 0.1), failed=lambda r: r == "error")
+    assert result == "secondary"
+
+    assert await manager.call(lambda: _answer("error", 0), failed=lambda r: r == "error") == "error"
+
+
+@pytest.mark.asyncio
+async def test_call_raises_past_deadline():
+    """Test that the deadline set by the handler bounds the call."""
+    manager = DeadlineManager()
+    primary = asyncio.ensure_future(_answer("primary", 5))
+    token = current_deadline.set(time.monotonic() + 0.1)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await manager.call(lambda: primary)
+    finally:
+        current_deadline.reset(token)
+    await asyncio.sleep(0)
+    assert primary.cancelled()
+    assert manager.counts["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_call_does_not_hedge_past_deadline():
+    """Test that no hedge is started when the deadline comes before the hedge delay."""
+    manager = _primed(DeadlinePolicy(hedge_model="fast/model"), latency=1.0)
+    secondary_calls = []
+
+    async def secondary():
+        secondary_calls.append(1)
+        return "secondary"
+
+    token = current_deadline.set(time.monotonic() + 0.1)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await manager.call(lambda: _answer("primary", 5), secondary)
+    finally:
+        current_deadline.reset(token)
+    assert manager.counts["hedged"] == 0
+    assert manager.counts["timeouts"] == 1
+    assert secondary_calls == []
+
+
+@pytest.mark.asyncio
+async def test_handler_releases_session_on_bad_client_timeout(bindu_call):
+    """Test that a non-numeric client timeout is ignored instead of failing with the session taken."""
+    sessions = SessionManager()
+    accountant = UsageAccountant()
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.deadline_manager", DeadlineManager()),
+        patch("agno_assist_agent.main.session_manager", sessions),
+        patch("agno_assist_agent.main.usage_accountant", accountant),
+        patch("agno_assist_agent.main.run_agent", AsyncMock(return_value="answer")),
+        patch.object(sessions, "release", wraps=sessions.release) as release,
+    ):
+        assert await bindu_call(handler, [{"role": "user", "content": "Hi"}], "ctx-1", timeout="soon") == "answer"
+
+    release.assert_called_once()
+    assert accountant.stats()["by_caller"]["anonymous"]["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_adapts_upwards_after_latency_shift():
+    """Test that timed-out calls raise the adaptive timeout instead of timing out forever."""
+    policy = DeadlinePolicy(default_timeout=2, min_timeout=0.05, timeout_multiplier=2, min_samples=5)
+    manager = _primed(policy, latency=0.05, samples=5)
+    assert manager.timeout() == pytest.approx(0.1)
+
+    outcomes = []
+    for _ in range(10):
+        token = current_deadline.set(manager.deadline())
+        try:
+            outcomes.append(await manager.call(lambda: _answer("ok", 0.15)))
+        except DeadlineExceeded:
+            outcomes.append("timeout")
+        finally:
+            current_deadline.reset(token)
+
+    assert outcomes[0] == "timeout"
+    assert outcomes[-5:] == ["ok"] * 5
+    assert manager.timeout() > 0.15
+    assert len(manager.tracker) > 5
+
+
+@pytest.mark.asyncio
+async def test_hedged_away_primary_is_recorded():
+    """Test that a primary cut short by a winning hedge still counts towards its latency."""
+    manager = _primed(DeadlinePolicy(hedge_model="fast/model"), latency=0.05)
+
+    await manager.call(lambda: _answer("primary", 5), lambda: _answer("secondary", 0.01))
+
+    assert len(manager.tracker) == 21
+    assert manager.tracker.percentile(100) >= 0.05
+
+
+class _StubLLMServer(ThreadingHTTPServer):
+    """OpenAI-compatible chat completions endpoint with per-model injected latency."""
+
+    def __init__(self, latency: dict[str, float]) -> None:
+        super().__init__(("127.0.0.1", 0), _StubLLMHandler)
+        self.latency = latency
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class _StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        model = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["model"]
+        time.sleep(self.server.latency.get(model, 0))
+        body = json.dumps({
+            "id": "stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": f"answer from {model}"},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 12, "completion_tokens": 4, "total_tokens": 16},
+        }).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # the hedged loser's connection was closed by the client
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def llm_server():
+    server = _StubLLMServer({"slow/model": 3.0, "fast/model": 0.05})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_handler_hedges_against_stub_server(llm_server):
+    """Test the full handler path: a slow primary model is hedged and the fast answer is returned."""
+    pytest.importorskip("agno")
+    manager = _primed(DeadlinePolicy(hedge_model="fast/model"), latency=0.1)
+    with patch.dict("os.environ", {"OPENROUTER_BASE_URL": llm_server.base_url}):
+        primary = _create_agent(_create_llm_model("stub-key", "slow/model"), [])
+        secondary = _create_agent(_create_llm_model("stub-key", "fast/model"), [])
+
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.agent", primary),
+        patch("agno_assist_agent.main.hedge_agent", secondary),
+        patch("agno_assist_agent.main.deadline_manager", manager),
+    ):
+        started = time.perf_counter()
+        result = await handler([{"role": "user", "content": "What is Agno?"}])
+        elapsed = time.perf_counter() - started
+
+    assert result.content == "answer from fast/model"
+    assert elapsed < 2
+    assert manager.counts["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_handler_times_out_against_stub_server(llm_server, bindu_call):
+    """Test that a client timeout in the context is enforced end to end."""
+    pytest.importorskip("agno")
+    with patch.dict("os.environ", {"OPENROUTER_BASE_URL": llm_server.base_url}):
+        primary = _create_agent(_create_llm_model("stub-key", "slow/model"), [])
+
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.agent", primary),
+        patch("agno_assist_agent.main.deadline_manager", DeadlineManager()),
+        pytest.raises(DeadlineExceeded),
+    ):
+        await bindu_call(handler, [{"role": "user", "content": "What is Agno?"}], "ctx-1", timeout=0.3)
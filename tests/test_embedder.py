@@ -0,0 +1,242 @@
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from agno_assist_agent.main import (
+    HashEmbedder,
+    LocalEmbedder,
+    LoopLagMonitor,
+    OnnxEmbedder,
+    _create_embedder,
+    _create_knowledge,
+    _hash_embed,
+    _hash_embed_batch,
+    _knowledge_table_name,
+    _retrieve_knowledge,
+    _shutdown_embedding_executor,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_executor():
+    """Give each test its own embedding worker pool."""
+    yield
+    _shutdown_embedding_executor()
+
+
+@pytest.mark.asyncio
+async def test_async_embedding_matches_sync_embedding():
+    """Test that offloaded embeddings are identical to the synchronous ones."""
+    embedder = LocalEmbedder(dimensions=64)
+    texts = ["How do I create an agent?", "What vector databases does Agno support?", ""]
+
+    assert await embedder.aget_embedding(texts[0]) == embedder.get_embedding(texts[0])
+    assert await embedder.aget_embeddings(texts) == embedder.get_embeddings(texts)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_are_micro_batched():
+    """Test that queries arriving together are embedded in a single pool call."""
+    embedder = LocalEmbedder(dimensions=64)
+    batches = []
+
+    def record_batch(texts):
+        batches.append(list(texts))
+        return [[float(len(text))] * 64 for text in texts]
+
+    embedder._batcher.embed_batch = record_batch
+    vectors = await asyncio.gather(*(embedder.aget_embedding("q" * n) for n in range(1, 6)))
+
+    assert batches == [["q", "qq", "qqq", "qqqq", "qqqqq"]]
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_propagate_to_callers():
+    """Test that a failing pool call raises in every waiting caller."""
+    embedder = LocalEmbedder(dimensions=8)
+    embedder._batcher.embed_batch = lambda texts: (_ for _ in ()).throw(ValueError("boom"))
+
+    results = await asyncio.gather(embedder.aget_embedding("a"), embedder.aget_embedding("b"), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_ingestion_batch_does_not_block_event_loop():
+    """Test that embedding a large batch keeps loop lag low."""
+    embedder = LocalEmbedder(dimensions=8)
+
+    def slow_batch(texts):
+        time.sleep(0.2)
+        return [[0.0] * 8 for _ in texts]
+
+    embedder._embed_batch = slow_batch
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.start()
+    await embedder.aget_embeddings(["doc"] * 10)
+    monitor.stop()
+
+    stats = monitor.stats()
+    assert stats["samples"] > 5
+    assert stats["max_ms"] < 100
+
+
+@pytest.mark.asyncio
+async def test_knowledge_retrieval_does_not_block_event_loop(tmp_path):
+    """Test that a live retrieval with a slow query embedder keeps loop lag low."""
+    pytest.importorskip("agno")
+    embedder = HashEmbedder(dimensions=64)
+    knowledge = _create_knowledge(str(tmp_path / "db"), embedder)
+    await knowledge.add_content_async(
+        name="docs", text_content="Agents call tools to act. Knowledge bases store documents for retrieval."
+    )
+
+    def slow_batch(texts):
+        time.sleep(0.3)
+        return _hash_embed_batch(texts, 64)
+
+    embedder._embed_batch = embedder._batcher.embed_batch = slow_batch
+    monitor = LoopLagMonitor(interval=0.01)
+    with patch("agno_assist_agent.main.knowledge", knowledge):
+        monitor.start()
+        results = await _retrieve_knowledge("How do agents use tools?")
+        monitor.stop()
+
+    assert results
+    assert monitor.stats()["samples"] > 10
+    assert monitor.stats()["max_ms"] < 100
+
+
+def _cosine(a, b):
+    return sum(x * y for x, y in zip(a, b, strict=True))
+
+
+def test_hash_embedder_is_deterministic_and_normalized():
+    """Test that the hash embedder gives stable unit vectors."""
+    embedder = HashEmbedder(dimensions=256)
+    vector = embedder.get_embedding("How do I add tools to an agent?")
+
+    assert vector == _hash_embed("How do I add tools to an agent?", 256)
+    assert abs(sum(x * x for x in vector) - 1.0) < 1e-9
+    assert embedder.get_embedding("") == [0.0] * 256
+
+
+def test_hash_embedder_ranks_related_text_higher():
+    """Test that the hash embedder matches on words, unlike character frequencies."""
+    embedder = HashEmbedder(dimensions=512)
+    query = embedder.get_embedding("Which vector databases are supported?")
+    related = embedder.get_embedding("Agno supports vector databases such as LanceDB, PgVector and Qdrant.")
+    unrelated = embedder.get_embedding("Teams let several agents collaborate on one task.")
+
+    assert _cosine(query, related) > _cosine(query, unrelated)
+
+
+@pytest.mark.asyncio
+async def test_repeated_queries_are_served_from_cache():
+    """Test that a repeated query does not hit the worker pool again."""
+    embedder = HashEmbedder(dimensions=32)
+    calls = []
+
+    def record_batch(texts):
+        calls.append(list(texts))
+        return [[1.0] * 32 for _ in texts]
+
+    embedder._batcher.embed_batch = record_batch
+    await embedder.aget_embedding("What is Agno?")
+    await embedder.aget_embedding("What is Agno?")
+
+    assert calls == [["What is Agno?"]]
+    assert embedder._cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_ingestion_embeds_in_batches_without_filling_query_cache(tmp_path):
+    """Test that Agno ingestion uses batched pool calls and leaves the query cache and its counters alone."""
+    pytest.importorskip("agno")
+    embedder = HashEmbedder(dimensions=32)
+    calls = []
+
+    def record_batch(texts):
+        calls.append(len(texts))
+        return _hash_embed_batch(texts, 32)
+
+    embedder._embed_batch = record_batch
+    knowledge = _create_knowledge(str(tmp_path / "db"), embedder)
+    text = "\n\n".join(f"Section {i}. Agents, tools and knowledge bases, part {i}. " * 40 for i in range(20))
+    await knowledge.add_content_async(name="docs", text_content=text)
+
+    assert sum(calls) > 1
+    assert len(calls) < sum(calls)
+    await embedder.async_get_embedding_and_usage("A single document chunk.")
+    assert len(embedder._cache) == 0
+    assert (embedder._cache.hits, embedder._cache.misses) == (0, 0)
+
+    await embedder.aget_embedding("How do I use tools?")
+    assert len(embedder._cache) == 1
+
+
+def test_create_embedder_from_env():
+    """Test that EMBEDDER selects the backend and rejects unknown names."""
+    with patch.dict(os.environ, {"EMBEDDER": "hash"}):
+        embedder = _create_embedder()
+    assert isinstance(embedder, HashEmbedder)
+    assert _knowledge_table_name(embedder) == "agno_assist_knowledge_hash"
+    assert _knowledge_table_name(LocalEmbedder()) == "agno_assist_knowledge"
+
+    with patch.dict(os.environ, {"EMBEDDER": "nope"}), pytest.raises(ValueError, match="Unknown EMBEDDER"):
+        _create_embedder()
+
+
+def _write_tiny_onnx_model(model_dir):
+    """Write a word-level tokenizer and a token-embedding-lookup ONNX model."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    tokenizers = pytest.importorskip("tokenizers")
+    import numpy as np
+
+    vocab = {"[PAD]": 0, "[UNK]": 1, "agent": 2, "tools": 3, "vector": 4, "database": 5}
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab, unk_token="[UNK]"))  # noqa: S106
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    tokenizer.save(str(model_dir / "tokenizer.json"))
+
+    weights = np.random.default_rng(0).normal(size=(len(vocab), 8)).astype(np.float32)
+    graph = onnx.helper.make_graph(
+        [onnx.helper.make_node("Gather", ["table", "input_ids"], ["last_hidden_state"])],
+        "tiny",
+        [
+            onnx.helper.make_tensor_value_info("input_ids", onnx.TensorProto.INT64, ["batch", "seq"]),
+            onnx.helper.make_tensor_value_info("attention_mask", onnx.TensorProto.INT64, ["batch", "seq"]),
+        ],
+        [onnx.helper.make_tensor_value_info("last_hidden_state", onnx.TensorProto.FLOAT, ["batch", "seq", 8])],
+        [onnx.numpy_helper.from_array(weights, "table")],
+    )
+    model = onnx.helper.make_model(graph, opset_imports=[onnx.helper.make_opsetid("", 13)], ir_version=8)
+    onnx.save(model, model_dir / "model.onnx")
+
+
+@pytest.mark.asyncio
+async def test_onnx_embedder_with_local_model(tmp_path):
+    """Test the ONNX backend end to end with a tiny vendored model."""
+    _write_tiny_onnx_model(tmp_path)
+    embedder = OnnxEmbedder(model_dir=str(tmp_path), threads=1)
+
+    texts = ["agent tools", "vector database", "agent"]
+    vectors = await embedder.aget_embeddings(texts)
+
+    assert embedder.dimensions == 8
+    assert [len(vector) for vector in vectors] == [8, 8, 8]
+    assert all(abs(sum(x * x for x in vector) - 1.0) < 1e-5 for vector in vectors)
+    assert await embedder.aget_embedding("agent tools") == pytest.approx(vectors[0], abs=1e-6)
+
+
+def test_onnx_embedder_missing_model(tmp_path):
+    """Test that a missing local model fails clearly instead of downloading."""
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("tokenizers")
+
+    with pytest.raises(FileNotFoundError, match="EMBEDDER_MODEL_PATH"):
+        OnnxEmbedder(model_dir=str(tmp_path))
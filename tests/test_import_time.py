@@ -0,0 +1,42 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# Cumulative time allowed for `import agno_assist_agent`, in microseconds.
+IMPORT_BUDGET_US = 500_000
+
+# Modules that must only be loaded once the agent is actually initialized.
+HEAVY_MODULES = ("agno", "bindu", "lancedb", "pyarrow", "pandas", "mem0", "openai")
+
+
+def _profile_import(module: str) -> dict[str, int]:
+    """Import a module in a fresh interpreter and return cumulative import times (us) per module."""
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parent.parent,
+        check=True,
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.removeprefix("import time:").split("|"))
+        timings[name] = int(cumulative)
+    return timings
+
+
+def test_package_import_does_not_load_heavy_dependencies():
+    """Test that importing the package defers Agno, LanceDB and Bindu."""
+    timings = _profile_import("agno_assist_agent")
+
+    loaded = sorted(name for name in timings if name.split(".")[0] in HEAVY_MODULES)
+    assert loaded == []
+
+
+def test_package_import_within_startup_budget():
+    """Test that importing the package stays within the startup budget."""
+    timings = _profile_import("agno_assist_agent")
+
+    assert timings["agno_assist_agent"] < IMPORT_BUDGET_US
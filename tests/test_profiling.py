@@ -0,0 +1,213 @@
+import asyncio
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from agno_assist_agent.accounting import UsageAccountant
+from agno_assist_agent.context import ContextBudget, ContextBudgeter
+from agno_assist_agent.deadlines import DeadlineManager
+from agno_assist_agent.main import _attach_profiler
+from agno_assist_agent.profiling import Profiler
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def _post(url, token=None):
+    request = urllib.request.Request(url, method="POST")  # noqa: S310
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    with urllib.request.urlopen(request) as response:  # noqa: S310
+        return json.loads(response.read())
+
+
+def test_cpu_profile_written_as_collapsed_stacks(tmp_path):
+    """Test that sampled stacks are written in the folded format flamegraph viewers load."""
+    profiler = Profiler(tmp_path, sample_interval_ms=1)
+
+    profiler.start()
+    _busy(0.2)
+    paths = profiler.stop()
+
+    folded = paths[0].read_text().splitlines()
+    assert paths[0].suffix == ".folded"
+    busy = [line for line in folded if line.startswith("MainThread;") and "_busy (test_profiling.py" in line]
+    assert busy
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in busy) > 10
+    assert profiler.stop() == []
+
+
+def test_cpu_profile_skips_idle_threads(tmp_path):
+    """Test that threads parked in waits, queue gets or idle executor workers are not sampled."""
+    release = threading.Event()
+    jobs = queue.Queue()
+    waiters = [
+        threading.Thread(target=release.wait, name="idle-event", daemon=True),
+        threading.Thread(target=jobs.get, name="idle-queue", daemon=True),
+    ]
+    for waiter in waiters:
+        waiter.start()
+    executor = ThreadPoolExecutor(1, thread_name_prefix="idle-pool")
+    executor.submit(int).result()
+    profiler = Profiler(tmp_path, sample_interval_ms=1)
+    try:
+        profiler.start()
+        _busy(0.1)
+        stacks = list(profiler.sampler.counts)
+        profiler.stop()
+    finally:
+        release.set()
+        jobs.put(None)
+        executor.shutdown()
+
+    assert any(stack.startswith("MainThread;") for stack in stacks)
+    assert not [stack for stack in stacks if stack.startswith(("idle-", "profiler-"))]
+
+
+@pytest.mark.asyncio
+async def test_slow_callback_captured_with_stack(tmp_path):
+    """Test that a blocked event loop is reported with the stack that blocked it."""
+    profiler = Profiler(tmp_path, slow_callback_ms=50)
+    profiler.attach_loop(asyncio.get_running_loop())
+
+    profiler.start()
+    await asyncio.sleep(0.1)
+    time.sleep(0.3)
+    await asyncio.sleep(0.1)
+    paths = profiler.stop()
+
+    event = max(profiler.slow_callbacks.events, key=lambda event: event["blocked_ms"])
+    assert event["blocked_ms"] >= 250
+    assert any("test_slow_callback_captured_with_stack" in line for line in event["stack"])
+    assert "loop blocked" in paths[1].read_text()
+
+
+@pytest.mark.asyncio
+async def test_runtime_stats_count_tasks_and_gauges(tmp_path):
+    """Test that runtime stats count tasks by coroutine and read the registered gauges."""
+    profiler = Profiler(tmp_path)
+    profiler.attach_loop(asyncio.get_running_loop())
+    profiler.register_gauge("queue", lambda: {"pending": 3})
+    profiler.register_gauge("broken", lambda: 1 / 0)
+    sleepers = [asyncio.create_task(asyncio.sleep(1)) for _ in range(3)]
+
+    stats = profiler.runtime_stats()
+
+    assert stats["tasks"]["sleep"] == 3
+    assert stats["gauges"]["queue"] == {"pending": 3}
+    assert stats["gauges"]["broken"].startswith("error:")
+    for task in sleepers:
+        task.cancel()
+
+
+def test_trace_memory_writes_snapshots_only_when_enabled(tmp_path):
+    """Test that tracemalloc snapshots around a block can be loaded and point at the allocation."""
+    profiler = Profiler(tmp_path)
+    with profiler.trace_memory("ingestion"):
+        pass
+    assert not list(tmp_path.iterdir())
+
+    profiler.start()
+    with profiler.trace_memory("ingestion"):
+        hog = [bytes(1024) for _ in range(2000)]
+    profiler.stop()
+
+    after = next(tmp_path.glob("ingestion-*-after.tracemalloc"))
+    assert tracemalloc.Snapshot.load(str(after)).statistics("lineno")
+    assert "test_profiling.py" in next(tmp_path.glob("ingestion-*-top.txt")).read_text().splitlines()[0]
+    assert not tracemalloc.is_tracing()
+    del hog
+
+
+def test_admin_route_toggles_profiling(tmp_path):
+    """Test starting and stopping through the admin route, including the token check."""
+    profiler = Profiler(tmp_path)
+    server = profiler.serve_admin(port=0, token="secret")  # noqa: S106
+    base = f"http://127.0.0.1:{server.server_address[1]}/profiling"
+    try:
+        with pytest.raises(urllib.error.HTTPError, match="401"):
+            _post(f"{base}/start")
+
+        assert _post(f"{base}/start", "secret") == {"profiling": True}
+        assert profiler.enabled
+        stopped = _post(f"{base}/stop", "secret")
+        assert not profiler.enabled
+        assert len(stopped["files"]) == 3
+        with urllib.request.urlopen(
+            urllib.request.Request(base, headers={"Authorization": "Bearer secret"})
+        ) as response:
+            assert json.loads(response.read())["profiling"] is False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_signal_toggles_profiling(tmp_path):
+    """Test that SIGUSR2 starts and stops profiling."""
+    profiler = Profiler(tmp_path)
+    previous = signal.getsignal(signal.SIGUSR2)
+    profiler.install_signal_handler(signal.SIGUSR2)
+    try:
+        os.kill(os.getpid(), signal.SIGUSR2)
+        assert _wait_for(lambda: profiler.enabled)
+        os.kill(os.getpid(), signal.SIGUSR2)
+        assert _wait_for(lambda: list(tmp_path.glob("runtime-*.json")))
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+    assert not profiler.enabled
+
+
+def test_import_without_sigusr2():
+    """Test that the package imports on platforms without SIGUSR2 (e.g. Windows)."""
+    code = "import signal; del signal.SIGUSR2; import agno_assist_agent.main"
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, cwd=Path(__file__).parent.parent
+    )
+    assert proc.returncode == 0, proc.stderr
+
+
+@pytest.mark.asyncio
+async def test_request_metrics_exposed_as_gauges(tmp_path):
+    """Test that prompt-token, usage, deadline and answer-index stats reach GET /profiling and runtime-*.json."""
+    profiler = Profiler(tmp_path)
+    budgeter = ContextBudgeter(ContextBudget())
+    budgeter.histograms["prompt"].observe(1200)
+    accountant = UsageAccountant()
+    with (
+        patch("agno_assist_agent.main.profiler", profiler),
+        patch("agno_assist_agent.main.context_budgeter", budgeter),
+        patch("agno_assist_agent.main.usage_accountant", accountant),
+        patch("agno_assist_agent.main.deadline_manager", DeadlineManager()),
+        patch("agno_assist_agent.main.answer_index", None),
+    ):
+        _attach_profiler()
+        status, payload = profiler.admin_action("GET", "/profiling")
+
+    assert status == 200
+    gauges = payload["gauges"]
+    assert gauges["prompt_tokens"] == budgeter.stats()
+    assert gauges["usage"] == accountant.stats()
+    assert gauges["deadlines"]["requests"] == 0
+    assert gauges["canonical_answers"] is None
@@ -0,0 +1,167 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from agno_assist_agent.context import ContextBudget, ContextBudgeter, count_message_tokens
+from agno_assist_agent.main import handler
+from agno_assist_agent.sessions import (
+    SessionManager,
+    SessionState,
+    bindu_task_context,
+    current_session,
+    resolve_session_id,
+)
+
+
+def _conversation(turns: int, words: int = 60) -> list[dict[str, str]]:
+    messages = []
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"Question {turn}. " + "agent " * words})
+        messages.append({"role": "assistant", "content": f"Answer {turn}. " + "tools " * words})
+    return messages
+
+
+def test_resolve_session_id_requires_context_id():
+    """Test that only a Bindu context or session ID identifies a session."""
+    assert resolve_session_id({"context_id": "ctx-1", "session_id": "s-1"}) == "ctx-1"
+    assert resolve_session_id({"sessionId": "s-1"}) == "s-1"
+    assert resolve_session_id({"caller_id": "alice"}) is None
+    assert resolve_session_id(None) is None
+
+
+def test_build_prompt_reuses_window_across_turns():
+    """Test that follow-up turns only fold in new messages and stay within budget."""
+    budgeter = ContextBudgeter(ContextBudget(max_tokens=1200, retrieval_tokens=400, keep_recent_messages=4))
+    session = SessionState("s1")
+    history = _conversation(6)
+
+    first = session.build_prompt(history, budgeter)
+    history = [*history, {"role": "user", "content": "Follow-up question?"}]
+    with patch.object(budgeter, "split_history", wraps=budgeter.split_history) as split:
+        second = session.build_prompt(history, budgeter)
+
+    assert first[0]["content"].startswith("Summary of earlier conversation")
+    assert second[-1] == history[-1]
+    assert session.seen == len(history)
+    assert count_message_tokens(second) <= budgeter.budget.history_tokens
+    for call in split.call_args_list:
+        assert len(call.args[0]) <= budgeter.budget.keep_recent_messages + 1
+
+
+def test_build_prompt_resets_on_different_history():
+    """Test that a conversation not extending the seen prefix starts fresh."""
+    budgeter = ContextBudgeter()
+    session = SessionState("s1")
+    session.build_prompt([{"role": "user", "content": "Hello"}], budgeter)
+
+    prompt = session.build_prompt([{"role": "user", "content": "Different"}], budgeter)
+
+    assert prompt == [{"role": "user", "content": "Different"}]
+
+
+def test_session_manager_evicts_lru_idle_and_over_memory():
+    """Test count, idle and memory limits."""
+    manager = SessionManager(max_sessions=2, idle_ttl=60, max_bytes=10_000)
+    manager.get("a")
+    manager.get("b")
+    manager.get("a")
+    manager.get("c")
+    assert set(manager._sessions) == {"a", "c"}
+
+    with patch("agno_assist_agent.sessions.time.monotonic", return_value=10**9):
+        manager.get("d")
+    assert set(manager._sessions) == {"d"}
+
+    big = manager.get("e")
+    big.window = [{"role": "user", "content": "x" * 20_000}]
+    manager.release(big)
+    manager.get("f")
+    assert set(manager._sessions) == {"f"}
+    assert manager.evictions == 5
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_hook_caches_reads_and_invalidates_on_write():
+    """Test that Mem0 lookups are cached per session until a memory write."""
+    manager = SessionManager()
+    session = manager.get("s1")
+    search = MagicMock(return_value="memories")
+    token = current_session.set(session)
+    try:
+        assert await manager.memory_cache_hook("search_memory", search, {"query": "q"}) == "memories"
+        assert await manager.memory_cache_hook("search_memory", search, {"query": "q"}) == "memories"
+        assert search.call_count == 1
+
+        await manager.memory_cache_hook("add_memory", AsyncMock(return_value="ok"), {"content": "c"})
+        await manager.memory_cache_hook("search_memory", search, {"query": "q"})
+        assert search.call_count == 2
+    finally:
+        current_session.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_handler_runs_agent_inside_bindu_context_session(bindu_call):
+    """Test that handler keys the session on the Bindu task's context ID, and keeps none outside a task."""
+    manager = SessionManager()
+    seen = []
+
+    async def fake_run_agent(messages):
+        seen.append(current_session.get())
+        return MagicMock()
+
+    first = [{"role": "user", "content": "What is Agno?"}]
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.session_manager", manager),
+        patch("agno_assist_agent.main.run_agent", side_effect=fake_run_agent),
+    ):
+        await bindu_call(handler, first, "ctx-1")
+        await bindu_call(handler, first, "ctx-2")
+        await bindu_call(handler, [*first, {"role": "assistant", "content": "A framework."}], "ctx-1")
+        await handler(first)
+
+    assert [session.session_id if session else None for session in seen] == ["ctx-1", "ctx-2", "ctx-1", None]
+    assert seen[0] is seen[2]
+    assert current_session.get() is None
+    assert len(manager) == 2
+
+
+def test_bindu_task_context_reads_worker_task():
+    """Test that the context ID and the latest user message's metadata are taken from the awaiting task."""
+    task = {  # noqa: F841
+        "context_id": UUID(int=1),
+        "history": [
+            {"role": "user", "metadata": {"caller_id": "old"}},
+            {"role": "agent", "metadata": {"caller_id": "agent"}},
+            {"role": "user", "metadata": {"caller_id": "alice", "timeout": 5}},
+        ],
+    }
+
+    def handler():
+        return bindu_task_context()
+
+    assert handler() == {"caller_id": "alice", "timeout": 5, "context_id": str(UUID(int=1))}
+    assert bindu_task_context(max_depth=0) == {}
+
+
+@pytest.mark.asyncio
+async def test_bindu_worker_runs_handler_in_context_session(bindu_worker):
+    """Test the real Bindu path: the handler passes validation and its session comes from the task's context."""
+    manager = SessionManager()
+    seen = []
+
+    async def fake_run_agent(messages):
+        seen.append(current_session.get())
+        return "Agno is a framework for building agents."
+
+    context_id = uuid4()
+    with (
+        patch("agno_assist_agent.main._initialized", True),
+        patch("agno_assist_agent.main.session_manager", manager),
+        patch("agno_assist_agent.main.run_agent", side_effect=fake_run_agent),
+    ):
+        task = await bindu_worker("What is Agno?", context_id)
+
+    assert [session.session_id for session in seen] == [str(context_id)]
+    assert task["status"]["state"] == "completed"
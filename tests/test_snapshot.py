@@ -0,0 +1,108 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from agno_assist_agent.main import _setup_knowledge_base
+from agno_assist_agent.snapshot import CURRENT_NAME, SnapshotError, load_snapshot, read_manifest, write_snapshot
+from agno_assist_agent.sources import SourceDocument
+
+EMBEDDER_CONFIG = {"backend": "hash", "dimensions": 64}
+
+
+def _fake_table(db_path, table_name="docs"):
+    table_dir = db_path / f"{table_name}.lance"
+    (table_dir / "_indices" / "fts").mkdir(parents=True)
+    (table_dir / "data.lance").write_bytes(b"vectors" * 100)
+    (table_dir / "_indices" / "fts" / "meta.json").write_text("{}")
+    (table_dir / "_indices" / "fts" / ".tantivy-writer.lock").write_text("")
+    return table_dir
+
+
+def test_write_and_load_snapshot(tmp_path):
+    """Test that a written snapshot validates and points at the bundled table."""
+    _fake_table(tmp_path / "db")
+    contents = [{"name": "Agno Documentation", "url": "https://docs.agno.com/llms-full.txt"}]
+
+    version_dir = write_snapshot(tmp_path / "db", "docs", tmp_path / "snap", EMBEDDER_CONFIG, contents)
+    data_dir = load_snapshot(tmp_path / "snap", "docs", EMBEDDER_CONFIG)
+
+    assert data_dir == version_dir / "data"
+    assert (data_dir / "docs.lance" / "_indices" / "fts" / "meta.json").exists()
+    assert not (data_dir / "docs.lance" / "_indices" / "fts" / ".tantivy-writer.lock").exists()
+    _, manifest = read_manifest(tmp_path / "snap")
+    assert manifest["contents"] == contents
+    assert manifest["embedder"] == EMBEDDER_CONFIG
+
+
+def test_load_snapshot_rejects_corruption_and_mismatches(tmp_path):
+    """Test that changed files, another embedder or another table invalidate the snapshot."""
+    _fake_table(tmp_path / "db")
+    version_dir = write_snapshot(tmp_path / "db", "docs", tmp_path / "snap", EMBEDDER_CONFIG, [])
+
+    with pytest.raises(SnapshotError, match="embedder"):
+        load_snapshot(tmp_path / "snap", "docs", {"backend": "charfreq", "dimensions": 1536})
+    with pytest.raises(SnapshotError, match="table"):
+        load_snapshot(tmp_path / "snap", "other", EMBEDDER_CONFIG)
+
+    (version_dir / "data" / "docs.lance" / "data.lance").write_bytes(b"tampered")
+    with pytest.raises(SnapshotError, match="checksum"):
+        load_snapshot(tmp_path / "snap", "docs", EMBEDDER_CONFIG)
+
+
+def test_load_snapshot_missing(tmp_path):
+    """Test that a missing snapshot raises SnapshotError."""
+    with pytest.raises(SnapshotError, match="No readable snapshot"):
+        load_snapshot(tmp_path / "snap", "docs", EMBEDDER_CONFIG)
+
+
+def test_old_snapshot_versions_are_pruned(tmp_path):
+    """Test that only the newest versions are kept and CURRENT points at the latest."""
+    table_dir = _fake_table(tmp_path / "db")
+    versions = []
+    for i in range(4):
+        (table_dir / "data.lance").write_bytes(f"version {i}".encode())
+        versions.append(write_snapshot(tmp_path / "db", "docs", tmp_path / "snap", EMBEDDER_CONFIG, []).name)
+
+    remaining = sorted(path.name for path in (tmp_path / "snap").iterdir() if path.is_dir())
+    assert (tmp_path / "snap" / CURRENT_NAME).read_text() == versions[-1]
+    assert versions[-1] in remaining
+    assert len(remaining) == 2
+
+
+@pytest.mark.asyncio
+async def test_knowledge_base_restores_from_snapshot(tmp_path):
+    """Test that the second start serves from the snapshot without ingesting."""
+    pytest.importorskip("lancedb")
+    from agno.knowledge.knowledge import Knowledge
+
+    original_add = Knowledge.add_content_async
+    docs = SourceDocument(
+        url="https://docs.agno.com/llms-full.txt",
+        content=b"LanceDB is the vector database used by Agno Assist.\n\nTeams coordinate several agents.",
+        sha256="docs-sha",
+    )
+
+    env = {"VECTOR_DB_PATH": str(tmp_path / "lancedb"), "EMBEDDER": "hash", "ENABLE_VECTOR_DB": "true"}
+    with (
+        patch.dict(os.environ, env),
+        patch("agno_assist_agent.main.SourceFetcher.load", return_value=docs),
+        patch("agno_assist_agent.main.knowledge_digest", None),
+        patch.object(Knowledge, "add_content_async", autospec=True, side_effect=original_add) as mock_add,
+    ):
+        ingested = await _setup_knowledge_base()
+        assert ingested is not None
+        assert mock_add.call_count == 1
+
+        started = time.perf_counter()
+        restored = await _setup_knowledge_base()
+        elapsed = time.perf_counter() - started
+
+    assert mock_add.call_count == 1
+    assert elapsed < 1.0
+    assert "lancedb_snapshot" in str(restored.vector_db.uri)
+    results = await restored.asearch("vector database")
+    assert any("LanceDB" in document.content for document in results)
+    # Serving from the snapshot must not invalidate it
+    load_snapshot(tmp_path / "lancedb_snapshot", "agno_assist_knowledge_hash", {"backend": "hash", "dimensions": 1536})
@@ -0,0 +1,278 @@
+import asyncio
+import gzip
+import hashlib
+import importlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from agno_assist_agent.sources import SourceFetcher, SourceFetchError
+
+DOCS = b"# Agno\n\nAgno is a framework for building agents.\n" * 50
+
+
+class _DocsServer(ThreadingHTTPServer):
+    """Local stand-in for docs.agno.com with ETags, compression and injected failures."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _DocsHandler)
+        self.body = DOCS
+        self.fail_next = 0
+        self.requests: list[dict[str, str]] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/llms-full.txt"
+
+
+class _DocsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if server.fail_next > 0:
+            server.fail_next -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        etag = f'"{hashlib.sha256(server.body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = server.body
+        encoding = None
+        accepted = self.headers.get("Accept-Encoding", "")
+        if "br" in accepted:
+            import brotli
+
+            body, encoding = brotli.compress(body), "br"
+        elif "gzip" in accepted:
+            body, encoding = gzip.compress(body), "gzip"
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Mon, 05 Oct 2026 10:00:00 GMT")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def docs_server():
+    server = _DocsServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_mirrors_and_revalidates(docs_server, tmp_path):
+    """Test that a download is mirrored and a second fetch is a conditional 304."""
+    fetcher = SourceFetcher(docs_server.url, tmp_path)
+
+    first = fetcher.fetch()
+    second = fetcher.fetch()
+
+    assert first.content == DOCS
+    assert first.sha256 == hashlib.sha256(DOCS).hexdigest()
+    assert docs_server.requests[0]["Accept-Encoding"].startswith("gzip")
+    assert docs_server.requests[1]["If-None-Match"] == first.etag
+    assert docs_server.requests[1]["If-Modified-Since"] == first.last_modified
+    assert second.from_mirror
+    assert second.content == DOCS
+
+
+def test_fetch_decodes_compressed_transfer(docs_server, tmp_path):
+    """Test that gzip and (when available) brotli responses are decoded."""
+    with patch("requests.utils.DEFAULT_ACCEPT_ENCODING", "gzip"):
+        assert SourceFetcher(docs_server.url, tmp_path / "gzip").fetch().content == DOCS
+
+    pytest.importorskip("brotli")
+    assert SourceFetcher(docs_server.url, tmp_path / "br").fetch().content == DOCS
+    assert docs_server.requests[-1]["Accept-Encoding"].endswith("br")
+
+
+def test_fetch_retries_then_fails(docs_server, tmp_path):
+    """Test that retryable errors are retried and exhausted retries raise SourceFetchError."""
+    fetcher = SourceFetcher(docs_server.url, tmp_path, retries=2, backoff=0)
+
+    docs_server.fail_next = 2
+    assert fetcher.fetch().content == DOCS
+    assert len(docs_server.requests) == 3
+
+    docs_server.fail_next = 3
+    with pytest.raises(SourceFetchError, match="503"):
+        fetcher.fetch()
+
+
+def test_fetch_times_out_on_unreachable_host(tmp_path):
+    """Test that a dead endpoint fails within the retry budget."""
+    fetcher = SourceFetcher("http://127.0.0.1:9/llms-full.txt", tmp_path, timeout=0.5, retries=1, backoff=0)
+
+    with pytest.raises(SourceFetchError):
+        fetcher.fetch()
+
+
+@pytest.mark.asyncio
+async def test_load_prefers_mirror_and_refresh_picks_up_changes(docs_server, tmp_path):
+    """Test that startup uses the mirror without the network and refresh sees new content."""
+    fetcher = SourceFetcher(docs_server.url, tmp_path, retries=0)
+    fetcher.fetch()
+    docs_server.body = DOCS + b"\nNew section on workflows.\n"
+    docs_server.requests.clear()
+
+    loaded = await fetcher.load()
+    refreshed = await fetcher.refresh()
+
+    assert loaded.from_mirror
+    assert loaded.content == DOCS
+    assert len(docs_server.requests) == 1
+    assert refreshed.content.endswith(b"workflows.\n")
+    assert fetcher.read_mirror().sha256 == refreshed.sha256
+
+    docs_server.fail_next = 1
+    assert await fetcher.refresh() is None
+
+
+def test_damaged_mirror_is_ignored(docs_server, tmp_path):
+    """Test that a mirror whose body does not match its checksum is not used."""
+    fetcher = SourceFetcher(docs_server.url, tmp_path)
+    fetcher.fetch()
+    fetcher.body_path.write_bytes(b"truncated")
+
+    assert fetcher.read_mirror() is None
+
+
+@pytest.mark.asyncio
+async def test_knowledge_boots_from_mirror_and_rebuilds_on_change(docs_server, tmp_path):
+    """Test that the knowledge base starts with the docs site down and refreshes when it changes."""
+    pytest.importorskip("lancedb")
+    agent_main = importlib.import_module("agno_assist_agent.main")
+
+    env = {
+        "VECTOR_DB_PATH": str(tmp_path / "lancedb"),
+        "SOURCE_MIRROR_PATH": str(tmp_path / "mirror"),
+        "KNOWLEDGE_SOURCE_URL": docs_server.url,
+        "SOURCE_RETRIES": "0",
+        "EMBEDDER": "hash",
+        "ENABLE_VECTOR_DB": "true",
+        "ENABLE_CANONICAL_ANSWERS": "false",
+    }
+    with (
+        patch.dict(os.environ, env),
+        patch.object(agent_main, "knowledge", None),
+        patch.object(agent_main, "knowledge_digest", None),
+        patch.object(agent_main, "source_fetcher", None),
+        patch.object(agent_main, "answer_index", None),
+    ):
+        SourceFetcher.from_env(docs_server.url).fetch()
+        docs_server.fail_next = 100
+
+        booted = await agent_main._setup_knowledge_base()
+        assert booted is not None
+        assert agent_main.knowledge_digest == hashlib.sha256(DOCS).hexdigest()
+        assert not await agent_main.refresh_knowledge()
+
+        docs_server.fail_next = 0
+        docs_server.body = b"# Agno\n\nWorkflows chain agents and teams into deterministic pipelines.\n"
+        agent_main.knowledge = booted
+        assert await agent_main.refresh_knowledge()
+
+        results = await agent_main.knowledge.asearch("deterministic pipelines")
+        assert any("Workflows" in document.content for document in results)
+        assert agent_main.knowledge_digest == hashlib.sha256(docs_server.body).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_refresh_without_snapshots_keeps_serving_table(docs_server, tmp_path):
+    """Test that a refresh builds beside the live table instead of dropping it when snapshots are disabled."""
+    pytest.importorskip("lancedb")
+    agent_main = importlib.import_module("agno_assist_agent.main")
+
+    env = {
+        "VECTOR_DB_PATH": str(tmp_path / "lancedb"),
+        "SOURCE_MIRROR_PATH": str(tmp_path / "mirror"),
+        "KNOWLEDGE_SOURCE_URL": docs_server.url,
+        "SOURCE_RETRIES": "0",
+        "EMBEDDER": "hash",
+        "ENABLE_VECTOR_DB": "true",
+        "ENABLE_CANONICAL_ANSWERS": "false",
+        "ENABLE_KNOWLEDGE_SNAPSHOT": "false",
+    }
+    with (
+        patch.dict(os.environ, env),
+        patch.object(agent_main, "knowledge", None),
+        patch.object(agent_main, "knowledge_digest", None),
+        patch.object(agent_main, "source_fetcher", None),
+        patch.object(agent_main, "answer_index", None),
+    ):
+        booted = await agent_main._setup_knowledge_base()
+        agent_main.knowledge = booted
+
+        for version in (b"Workflows chain agents into pipelines.", b"Teams coordinate several agents."):
+            docs_server.body = b"# Agno\n\n" + version + b"\n"
+            live = agent_main.knowledge
+            assert await agent_main.refresh_knowledge()
+            assert any("framework" in d.content or "Workflows" in d.content for d in live.search("agents"))
+        assert any("Teams" in d.content for d in agent_main.knowledge.search("coordinate"))
+
+        # A restart with the same docs serves the last refresh build without re-ingesting
+        served_uri = agent_main.knowledge.vector_db.uri
+        agent_main.knowledge = None
+        with patch.object(agent_main, "_build_knowledge") as build:
+            restarted = await agent_main._setup_knowledge_base()
+        build.assert_not_called()
+        assert restarted.vector_db.uri == served_uri
+        assert len(list((tmp_path / "lancedb_builds").iterdir())) == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_loop_retries_until_knowledge_arrives(docs_server, tmp_path):
+    """Test that a pod booted without docs retries quickly and indexes answers once the docs arrive."""
+    pytest.importorskip("lancedb")
+    agent_main = importlib.import_module("agno_assist_agent.main")
+
+    env = {
+        "VECTOR_DB_PATH": str(tmp_path / "lancedb"),
+        "SOURCE_MIRROR_PATH": str(tmp_path / "mirror"),
+        "CANONICAL_ANSWERS_PATH": str(tmp_path / "answers.json"),
+        "KNOWLEDGE_SOURCE_URL": docs_server.url,
+        "SOURCE_RETRIES": "0",
+        "EMBEDDER": "hash",
+        "ENABLE_VECTOR_DB": "true",
+    }
+    with (
+        patch.dict(os.environ, env),
+        patch.object(agent_main, "knowledge", None),
+        patch.object(agent_main, "knowledge_digest", None),
+        patch.object(agent_main, "source_fetcher", None),
+        patch.object(agent_main, "answer_index", None),
+        patch.object(agent_main, "_start_answer_precompute") as precompute,
+    ):
+        docs_server.fail_next = 100
+        assert await agent_main._setup_knowledge_base() is None
+        agent_main._ensure_answer_index()
+        assert agent_main.answer_index is None
+
+        docs_server.fail_next = 2
+        loop = asyncio.create_task(agent_main._refresh_knowledge_loop(3600, 0.05))
+        try:
+            async with asyncio.timeout(10):
+                while agent_main.knowledge is None:
+                    await asyncio.sleep(0.05)
+        finally:
+            loop.cancel()
+
+        assert agent_main.knowledge_digest == hashlib.sha256(DOCS).hexdigest()
+        assert agent_main.answer_index is not None
+        precompute.assert_called()